@@ -0,0 +1,114 @@
+"""
+Startup benchmark: import time of application main window, as reported by 'python -X importtime'.
+
+Usage (from repository root):
+    python benchmarks/import_time.py [--module functionalities.MainWindow] [--top 15] [--max-ms 1000]
+                                     [--output report.json]
+
+Modules that are imported on first use (plotting stacks, device backends) are listed
+if they show up in the report, and the script fails if import takes longer than '--max-ms'.
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List
+
+SRC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+# those are imported on first use, not on startup
+DEFERRED_MODULES = [
+    "pandas",
+    "matplotlib",
+    "mpl_toolkits",
+    "pyqtgraph",
+    "PIL",
+    "usb",
+    "plot_widgets.Heatmap2DWidget",
+    "plot_widgets.PrinterPathWidget2D",
+    "spectrum_analyzer_device.pocket_vna_device.PocketVNADevice",
+    "spectrum_analyzer_device.hameg3010.HamegHMS3010Device",
+]
+
+IMPORT_TIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def measure_import_time(module: str) -> List[Dict]:
+    """
+    Imports module in fresh interpreter, returns every imported module with its self and cumulative time in us.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SRC_PATH,
+        env={**os.environ, "QT_QPA_PLATFORM": os.environ.get("QT_QPA_PLATFORM", "offscreen")},
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import of '{module}' failed:\n{result.stderr}")
+
+    imports = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match is not None:
+            self_time, cumulative_time, indent, name = match.groups()
+            imports.append(
+                {
+                    "name": name,
+                    "self_us": int(self_time),
+                    "cumulative_us": int(cumulative_time),
+                    "depth": len(indent) // 2,
+                }
+            )
+    return imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="functionalities.MainWindow")
+    parser.add_argument("--top", type=int, default=15, help="number of slowest top level imports to list")
+    parser.add_argument("--max-ms", type=float, default=None, help="fail if total import time is larger")
+    parser.add_argument("--output", default=None, help="save report as json")
+    args = parser.parse_args()
+
+    imports = measure_import_time(args.module)
+    total_ms = next(entry["cumulative_us"] for entry in imports if entry["name"] == args.module) / 1000
+
+    imported_names = {entry["name"] for entry in imports}
+    eagerly_imported = [
+        name
+        for name in DEFERRED_MODULES
+        if name in imported_names or any(imported.startswith(name + ".") for imported in imported_names)
+    ]
+
+    print(f"import of '{args.module}': {total_ms:.1f} ms, {len(imports)} modules")
+    print("slowest imports (cumulative):")
+    for entry in sorted(imports, key=lambda entry: entry["cumulative_us"], reverse=True)[1 : args.top + 1]:
+        print(f"\t{entry['cumulative_us'] / 1000:8.1f} ms  {entry['name']}")
+
+    if len(eagerly_imported) > 0:
+        print(f"modules that should be imported on first use: {', '.join(eagerly_imported)}")
+
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            json.dump(
+                {
+                    "module": args.module,
+                    "total_ms": total_ms,
+                    "eagerly_imported": eagerly_imported,
+                    "imports": imports,
+                },
+                file,
+                indent=4,
+            )
+
+    if args.max_ms is not None and total_ms > args.max_ms:
+        print(f"import time is above limit of {args.max_ms} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Project load benchmark: time of reading measured data of large scan from binary data file.
+
+Usage (from repository root):
+    python benchmarks/mdma_load.py [--size 1000] [--repeat 5] [--max-ms 1000] [--output report.json]
+
+Scan of '--size' x '--size' points is written to temporary data file, the best of '--repeat' loads is reported,
+and the script fails if it takes longer than '--max-ms'.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+SRC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.insert(0, SRC_PATH)
+
+from functionalities.GridDescriptor import GridAxis, GridDescriptor  # noqa: E402
+from functionalities.MdmaFile import read_mdma_file, write_mdma_file  # noqa: E402
+from functionalities.Measurement import Measurement  # noqa: E402
+
+
+def measure_load(path: str, grid: GridDescriptor) -> float:
+    """
+    Loads measurement from data file the way project import does, returns time it took in ms.
+    """
+    begin = time.perf_counter()
+    measurement = Measurement.from_numpy(read_mdma_file(path).values, grid)
+    elapsed_ms = (time.perf_counter() - begin) * 1000
+
+    if measurement.to_numpy().shape != grid.shape:
+        raise RuntimeError(f"loaded values have shape {measurement.to_numpy().shape}, expected {grid.shape}")
+    return elapsed_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=1000, help="number of points on each side of scanned square")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, default=None, help="fail if the best load is slower")
+    parser.add_argument("--output", default=None, help="save report as json")
+    args = parser.parse_args()
+
+    grid = GridDescriptor(GridAxis(0, 0.5, args.size), GridAxis(0, 0.5, args.size))
+    values = np.random.default_rng(0).normal(-60, 10, grid.shape).round(2)
+
+    with tempfile.TemporaryDirectory() as directory_path:
+        path = os.path.join(directory_path, "data.mdma")
+        write_mdma_file(path, values, grid)
+        file_size_mb = os.path.getsize(path) / 1e6
+        runs_ms = [measure_load(path, grid) for _ in range(args.repeat)]
+
+    best_ms = min(runs_ms)
+    print(
+        f"load of {args.size * args.size} points ({file_size_mb:.1f} MB): best {best_ms:.1f} ms of {args.repeat} runs"
+    )
+    for run_ms in runs_ms:
+        print(f"\t{run_ms:8.1f} ms")
+
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            json.dump({"size": args.size, "best_ms": best_ms, "runs_ms": runs_ms}, file, indent=4)
+
+    if args.max_ms is not None and best_ms > args.max_ms:
+        print(f"load is above limit of {args.max_ms} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Path generation benchmark: time of creating printer path of scan with large number of points.
+
+Usage (from repository root):
+    python benchmarks/path_generation.py [--size 1000] [--repeat 5] [--max-ms 2000] [--output report.json]
+
+Path covers square grid of '--size' x '--size' points, the best of '--repeat' runs is reported,
+and the script fails if it takes longer than '--max-ms'.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+SRC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.insert(0, SRC_PATH)
+
+from vector3d.vector import Vector  # noqa: E402
+
+from functionalities.PrinterPath import PrinterPath, Square  # noqa: E402
+
+
+def measure_path_generation(size: int) -> float:
+    """
+    Creates path of 'size' x 'size' points with 1 mm spacing, returns time it took in ms.
+    """
+    begin = time.perf_counter()
+    printer_path = PrinterPath(4, Vector(0, 0, 0), Square(0, 0, size - 1, size - 1), 1, Vector(size, size, 210))
+    elapsed_ms = (time.perf_counter() - begin) * 1000
+
+    if printer_path.get_no_scan_points() != size * size:
+        raise RuntimeError(f"path has {printer_path.get_no_scan_points()} points, expected {size * size}")
+    return elapsed_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=1000, help="number of points on each side of scanned square")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, default=None, help="fail if the best run is slower")
+    parser.add_argument("--output", default=None, help="save report as json")
+    args = parser.parse_args()
+
+    runs_ms = [measure_path_generation(args.size) for _ in range(args.repeat)]
+    best_ms = min(runs_ms)
+
+    print(f"path of {args.size * args.size} points: best {best_ms:.1f} ms of {args.repeat} runs")
+    for run_ms in runs_ms:
+        print(f"\t{run_ms:8.1f} ms")
+
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            json.dump({"size": args.size, "best_ms": best_ms, "runs_ms": runs_ms}, file, indent=4)
+
+    if args.max_ms is not None and best_ms > args.max_ms:
+        print(f"path generation is above limit of {args.max_ms} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+from typing import List
+
+import numpy as np
+
+from functionalities.Measurement import Measurement
+from functionalities.PrinterPath import PrinterPath
+
+# coarse pass measures every n-th point of the grid, in both directions
+DEFAULT_COARSE_STEP = 3
+
+
+def _coarse_lines(no_lines: int, coarse_step: int) -> List[int]:
+    lines = list(range(0, no_lines, coarse_step))
+    if len(lines) > 0 and lines[-1] != no_lines - 1:
+        # last line is always measured, so every cell is bounded by measured points
+        lines.append(no_lines - 1)
+    return lines
+
+
+def coarse_pass_steps(measurement: Measurement, coarse_step: int = DEFAULT_COARSE_STEP) -> List[int]:
+    """
+    Path steps (in order of measurement) lying on the coarse grid.
+    """
+    rows = _coarse_lines(measurement.y_axis_length, coarse_step)
+    cols = _coarse_lines(measurement.x_axis_length, coarse_step)
+
+    step_indices = measurement.step_indices[np.ix_(rows, cols)].flatten()
+    return sorted(int(index) for index in step_indices if index >= 0)
+
+
+def planned_no_points(
+    printer_path: PrinterPath, point_budget_in_percentages: float, coarse_step: int = DEFAULT_COARSE_STEP
+) -> int:
+    """
+    Number of points measured in adaptive scan, coarse pass is always measured completely, even above the budget.
+    """
+    no_coarse_points = len(_coarse_lines(len(printer_path.y_axis), coarse_step)) * len(
+        _coarse_lines(len(printer_path.x_axis), coarse_step)
+    )
+    return max(no_coarse_points, int(round(printer_path.get_no_scan_points() * point_budget_in_percentages / 100)))
+
+
+def refinement_pass_steps(
+    measurement: Measurement,
+    point_budget: int,
+    coarse_step: int = DEFAULT_COARSE_STEP,
+    threshold: float = 0,
+) -> List[int]:
+    """
+    **Picks path steps refining coarse cells with the largest local difference of measured values.**
+
+    Every coarse cell is bounded by four measured points, its score is the largest difference between them.
+    Cells are refined (all of their not yet measured points are added) from the highest score down,
+    until point budget is used, or score falls to the threshold.
+
+    Parameters
+    ----------
+    **measurement : Measurement**
+        Measurement after coarse pass
+
+    **point_budget : int**
+        Maximum number of points added in refinement pass
+
+    **coarse_step : int, optional**
+        Step of coarse grid used in coarse pass, **by default 3**
+
+    **threshold : float, optional**
+        Cells with score not greater than threshold are not refined, **by default 0**
+
+    Returns
+    -------
+    **List[int]**
+        Path steps to measure, in order of measurement
+    """
+    rows = _coarse_lines(measurement.y_axis_length, coarse_step)
+    cols = _coarse_lines(measurement.x_axis_length, coarse_step)
+    data = measurement.to_numpy()
+
+    cells = []
+    for row_begin, row_end in zip(rows[:-1], rows[1:]):
+        for col_begin, col_end in zip(cols[:-1], cols[1:]):
+            corners = np.array(
+                [
+                    data[row_begin, col_begin],
+                    data[row_begin, col_end],
+                    data[row_end, col_begin],
+                    data[row_end, col_end],
+                ]
+            )
+            corners = corners[~np.isnan(corners)]
+            if len(corners) < 2:
+                continue
+
+            score = np.max(np.abs(corners[:, np.newaxis] - corners[np.newaxis, :]))
+            cells.append((score, row_begin, row_end, col_begin, col_end))
+
+    cells.sort(key=lambda cell: cell[0], reverse=True)
+
+    selected_steps = set()
+    for score, row_begin, row_end, col_begin, col_end in cells:
+        if score <= threshold:
+            break
+
+        cell_steps = measurement.step_indices[row_begin : row_end + 1, col_begin : col_end + 1].flatten()
+        cell_steps = [
+            int(index)
+            for index in cell_steps
+            if index >= 0 and index not in selected_steps and not measurement.is_measured(index)
+        ]
+
+        if len(selected_steps) + len(cell_steps) > point_budget:
+            break
+
+        selected_steps.update(cell_steps)
+
+    return sorted(selected_steps)
@@ -0,0 +1,77 @@
+import json
+import os
+from typing import List, Optional
+
+from serial.tools.list_ports_common import ListPortInfo
+
+DEFAULT_CONNECTION_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".mdma", "connections.json")
+
+# kinds of devices, every kind keeps only its last successful connection
+PRINTER_CONNECTION = "printer"
+ANALYZER_CONNECTION = "analyzer"
+
+
+class ConnectionCache:
+    """
+    **Last successful connection of every kind of device, stored on disk.**
+
+    Entry holds port name, USB VID/PID and serial number, baudrate and firmware identity.
+    Device that was re-plugged can show up on different port, so it is looked up by its serial number first.
+    """
+
+    def __init__(self, path: str = DEFAULT_CONNECTION_CACHE_PATH):
+        self.path = path
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, "r") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, content: dict) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "w") as file:
+            json.dump(content, file, indent=4)
+
+    def get(self, kind: str) -> Optional[dict]:
+        return self._read().get(kind)
+
+    def store(self, kind: str, port: ListPortInfo, baudrate: int, firmware: Optional[str] = None) -> None:
+        content = self._read()
+        content[kind] = {
+            "port": port.device,
+            "vid": port.vid,
+            "pid": port.pid,
+            "serial_number": port.serial_number,
+            "baudrate": baudrate,
+            "firmware": firmware,
+        }
+        try:
+            self._write(content)
+        except OSError as ex:
+            print(f"connection cache could not be saved: {ex}")
+
+    def forget(self, kind: str) -> None:
+        content = self._read()
+        if content.pop(kind, None) is not None:
+            self._write(content)
+
+    def find_port(self, kind: str, available_ports: List[ListPortInfo]) -> Optional[ListPortInfo]:
+        """
+        Port of available ports on which device of given kind was connected last time, None if it's not there.
+        """
+        entry = self.get(kind)
+        if entry is None:
+            return None
+
+        if entry.get("serial_number") is not None:
+            for port in available_ports:
+                if (port.vid, port.pid, port.serial_number) == (entry["vid"], entry["pid"], entry["serial_number"]):
+                    return port
+
+        for port in available_ports:
+            if port.device == entry["port"] and (port.vid, port.pid) == (entry["vid"], entry["pid"]):
+                return port
+
+        return None
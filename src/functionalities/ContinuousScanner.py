@@ -0,0 +1,203 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Tuple
+
+import numpy as np
+from vector3d.vector import Vector
+
+from printer_device.MotionModel import MotionModel, row_feedrate
+from printer_device.PrinterDevice import PrinterDevice
+
+
+class ContinuousScanner:
+    """
+    **Measures whole rows of the grid while printer head moves along them, without stopping.**
+
+    Analyzer samples continuously on its own thread, every sample is stamped with monotonic time taken
+    in the middle of its reading. Head position at that time is interpolated from the velocity profile
+    of the row move, predicted by motion model, and samples are binned onto grid points of the row.
+    """
+
+    def __init__(
+        self,
+        printer_handle: PrinterDevice,
+        analyzer_handle,
+        frequency: float,
+        measurement_time,
+        motion_model: MotionModel,
+        pass_height: float,
+        movement_speed: float,
+    ):
+        self.printer_handle = printer_handle
+        self.analyzer_handle = analyzer_handle
+        self.frequency = frequency
+        self.measurement_time = measurement_time
+        self.motion_model = motion_model
+        self.pass_height = pass_height
+        self.movement_speed = movement_speed
+
+    def get_sample_period(self) -> float:
+        """
+        Time of single analyzer reading, measured if analyzer does not know it.
+        """
+        self.analyzer_handle.prepare_measurement(self.frequency, self.measurement_time)
+
+        sample_period = self.analyzer_handle.get_measurement_duration(self.measurement_time)
+        if sample_period is not None:
+            return sample_period
+
+        begin = time.monotonic()
+        self.analyzer_handle.read_level(self.measurement_time)
+        return time.monotonic() - begin
+
+    def scan_row(self, start: Vector, end: Vector, feedrate: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        **Moves extruder from 'start' to 'end' with constant feed rate, sampling the signal on the way.**
+
+        Parameters
+        ----------
+        **start : Vector**
+            Extruder position of first point in row
+
+        **end : Vector**
+            Extruder position of last point in row
+
+        **feedrate : float**
+            Feed rate of the row move, in mm/min
+
+        Returns
+        -------
+        **Tuple[np.ndarray, np.ndarray]**
+            Distance from 'start' in mm, and measured value, of every sample
+        """
+        self.printer_handle.send_and_await(f"G1 X{start.x} Y{start.y} Z{self.pass_height} F{self.movement_speed}")
+        self.analyzer_handle.prepare_measurement(self.frequency, self.measurement_time)
+
+        is_row_finished = threading.Event()
+        timestamps: List[float] = []
+        values = []
+
+        def sample():
+            while not is_row_finished.is_set():
+                begin = time.monotonic()
+                value = self.analyzer_handle.read_level(self.measurement_time)
+                timestamps.append((begin + time.monotonic()) / 2)
+                values.append(value)
+
+        with ThreadPoolExecutor(max_workers=1) as analyzer_executor:
+            sampling = analyzer_executor.submit(sample)
+            # taken after sampling thread is started, samples taken before the move are at its start
+            move_start = time.monotonic()
+
+            try:
+                # returns when printer reports that the move is completed
+                self.printer_handle.send_and_await(f"G1 X{end.x} Y{end.y} Z{self.pass_height} F{feedrate}")
+            finally:
+                is_row_finished.set()
+
+            sampling.result()
+
+        distances = self.motion_model.predict_distance_travelled(
+            (end.x - start.x, end.y - start.y), feedrate, np.array(timestamps) - move_start
+        )
+        return distances, np.array(values)
+
+    @staticmethod
+    def bin_samples(distances: np.ndarray, values: np.ndarray, point_distances: np.ndarray) -> np.ndarray:
+        """
+        **Averages samples closest to every grid point.**
+
+        Points without any sample are linearly interpolated from their neighbours, so the row is complete
+        even if the head moved faster than the analyzer sampled.
+
+        Parameters
+        ----------
+        **distances : np.ndarray**
+            Distance of every sample from start of the row
+
+        **values : np.ndarray**
+            Value of every sample, float or complex
+
+        **point_distances : np.ndarray**
+            Distance of every grid point from start of the row, in ascending order
+
+        Returns
+        -------
+        **np.ndarray**
+            Value for every grid point, NaN if row has no samples at all
+        """
+        values = np.asarray(values)
+        dtype = complex if np.iscomplexobj(values) else float
+        binned = np.full(len(point_distances), np.nan, dtype=dtype)
+
+        if len(values) == 0:
+            return binned
+
+        bins = np.abs(np.asarray(distances)[:, np.newaxis] - np.asarray(point_distances)[np.newaxis, :]).argmin(axis=1)
+        sums = np.zeros(len(point_distances), dtype=dtype)
+        np.add.at(sums, bins, values)
+        counts = np.bincount(bins, minlength=len(point_distances))
+
+        is_sampled = counts > 0
+        binned[is_sampled] = sums[is_sampled] / counts[is_sampled]
+
+        if not np.all(is_sampled):
+            missing = point_distances[~is_sampled]
+            known = point_distances[is_sampled]
+            if dtype is complex:
+                binned[~is_sampled] = np.interp(missing, known, binned[is_sampled].real) + 1j * np.interp(
+                    missing, known, binned[is_sampled].imag
+                )
+            else:
+                binned[~is_sampled] = np.interp(missing, known, binned[is_sampled])
+
+        return binned
+
+    def run(
+        self,
+        rows: List[Tuple[Vector, Vector, np.ndarray]],
+        on_row_measured: Callable[[int, np.ndarray], None],
+        should_stop: Callable[[], bool],
+    ) -> bool:
+        """
+        **Scans all rows one after another.**
+
+        Parameters
+        ----------
+        **rows : List[Tuple[Vector, Vector, np.ndarray]]**
+            Start and end extruder position of every row, and distances of its grid points from start
+
+        **on_row_measured : Callable[[int, np.ndarray], None]**
+            Called with index of row and values of its grid points, as soon as row is scanned
+
+        **should_stop : Callable[[], bool]**
+            Checked before every row, scan is aborted if it returns True
+
+        Returns
+        -------
+        **bool**
+            True if all rows were scanned, False if scan was stopped
+        """
+        if len(rows) == 0:
+            return True
+
+        point_spacing = min(
+            (float(np.min(np.diff(point_distances))) for _, _, point_distances in rows if len(point_distances) > 1),
+            default=0,
+        )
+        sample_period = self.get_sample_period()
+        feedrate = row_feedrate(point_spacing, sample_period, self.movement_speed)
+        logging.info(
+            f"continuous scan, sample period: {round(sample_period, 3)} s, row feed rate: {round(feedrate, 1)}"
+        )
+
+        for index, (start, end, point_distances) in enumerate(rows):
+            if should_stop():
+                return False
+
+            distances, values = self.scan_row(start, end, feedrate)
+            on_row_measured(index, self.bin_samples(distances, values, point_distances))
+
+        return True
@@ -0,0 +1,159 @@
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# coordinates are quantized to 0.1 um, well below resolution of any printer,
+# so they are sent to the printer and saved the way they were entered
+COORDINATE_DECIMALS = 4
+
+
+class GridAxis:
+    """
+    **Evenly spaced coordinates along one axis of the scan grid.**
+
+    Coordinate of point i is computed from its index as origin + i * step, never by accumulating steps,
+    so the same descriptor always gives the same coordinates.
+    """
+
+    def __init__(self, origin: float, step: float, count: int):
+        self.origin = float(origin)
+        self.step = float(step)
+        self.count = int(count)
+
+    @staticmethod
+    def covering(start: float, length: float, step: float) -> "GridAxis":
+        """
+        Axis starting in 'start', that ends with the first point not smaller than start + length.
+        """
+        no_steps = max(int(np.ceil(round(length / step, 9))) - 1, 0) + 1
+        return GridAxis(start, step, no_steps + 1)
+
+    @staticmethod
+    def from_coordinates(coordinates: Sequence[float]) -> "GridAxis":
+        """
+        Axis of evenly spaced, increasing coordinates, like columns of saved measurement.
+        """
+        coordinates = np.asarray(coordinates, dtype=float)
+        if len(coordinates) == 0:
+            return GridAxis(0, 1, 0)
+        if len(coordinates) == 1:
+            return GridAxis(coordinates[0], 1, 1)
+        return GridAxis(coordinates[0], (coordinates[-1] - coordinates[0]) / (len(coordinates) - 1), len(coordinates))
+
+    def coordinates(self, indices: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Coordinates of points of given indices, **by default of all points of the axis**.
+        """
+        if indices is None:
+            indices = np.arange(self.count)
+        return np.round(self.origin + np.asarray(indices) * self.step, COORDINATE_DECIMALS)
+
+    def index_of(self, coordinate):
+        """
+        Index of the point nearest to coordinate, works for single coordinate and for array of them.
+        """
+        return np.rint((np.asarray(coordinate) - self.origin) / self.step).astype(int)
+
+    def index_range(self, low: float, high: float) -> Tuple[int, int]:
+        """
+        Start and stop index of points with coordinates between 'low' and 'high'.
+        """
+        start_id = int(np.ceil(round((low - self.origin) / self.step, 9)))
+        stop_id = int(np.floor(round((high - self.origin) / self.step, 9))) + 1
+        return min(max(start_id, 0), self.count), min(max(stop_id, 0), self.count)
+
+    def subset(self, start_id: int, stop_id: int) -> "GridAxis":
+        """
+        Axis made of points from 'start_id' up to, but excluding 'stop_id'.
+        """
+        start_id, stop_id = max(start_id, 0), min(stop_id, self.count)
+        if stop_id <= start_id:
+            return GridAxis(self.origin, self.step, 0)
+        return GridAxis(self.coordinates(start_id), self.step, stop_id - start_id)
+
+    @property
+    def first(self) -> float:
+        return float(self.coordinates(0))
+
+    @property
+    def last(self) -> float:
+        return float(self.coordinates(self.count - 1))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, GridAxis) and (self.origin, self.step, self.count) == (
+            other.origin,
+            other.step,
+            other.count,
+        )
+
+    def __repr__(self) -> str:
+        return f"GridAxis(origin={self.origin}, step={self.step}, count={self.count})"
+
+    def to_dict(self) -> dict:
+        return {"origin": self.origin, "step": self.step, "count": self.count}
+
+    @staticmethod
+    def from_dict(content: dict) -> "GridAxis":
+        return GridAxis(content["origin"], content["step"], content["count"])
+
+
+class GridDescriptor:
+    """
+    **Rectangular scan grid, described by its x and y axis.**
+
+    Single source of grid coordinates for the scan path, measured data, plots and exported files.
+    Data on the grid is shaped (y_axis, x_axis).
+    """
+
+    def __init__(self, x: GridAxis, y: GridAxis):
+        self.x = x
+        self.y = y
+
+    @staticmethod
+    def empty() -> "GridDescriptor":
+        return GridDescriptor(GridAxis(0, 1, 0), GridAxis(0, 1, 0))
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.y.count, self.x.count
+
+    @property
+    def is_empty(self) -> bool:
+        return self.x.count == 0 or self.y.count == 0
+
+    def positions(self, grid_indices: np.ndarray) -> np.ndarray:
+        """
+        (x, y) coordinates of points given by (row, col) grid indices.
+        """
+        grid_indices = np.asarray(grid_indices, dtype=int).reshape(-1, 2)
+        return np.column_stack([self.x.coordinates(grid_indices[:, 1]), self.y.coordinates(grid_indices[:, 0])])
+
+    def extent(self) -> List[float]:
+        """
+        Left, right, bottom and top edge of the grid, every point is the center of a step x step cell.
+        """
+        if self.is_empty:
+            return [0, 1, 0, 1]
+
+        return [
+            self.x.first - abs(self.x.step) / 2,
+            self.x.last + abs(self.x.step) / 2,
+            self.y.first - abs(self.y.step) / 2,
+            self.y.last + abs(self.y.step) / 2,
+        ]
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, GridDescriptor) and (self.x, self.y) == (other.x, other.y)
+
+    def __repr__(self) -> str:
+        return f"GridDescriptor(x={self.x}, y={self.y})"
+
+    def to_dict(self) -> dict:
+        return {"x": self.x.to_dict(), "y": self.y.to_dict()}
+
+    @staticmethod
+    def from_dict(content: dict) -> "GridDescriptor":
+        return GridDescriptor(GridAxis.from_dict(content["x"]), GridAxis.from_dict(content["y"]))
@@ -0,0 +1,255 @@
+import json
+import logging
+import mmap
+import os
+import struct
+import time
+from typing import Optional
+
+import numpy as np
+
+from functionalities.GridDescriptor import GridDescriptor
+
+DEFAULT_LIVE_RESULT_PATH = os.path.join(os.path.expanduser("~"), ".mdma", "live_result.mdmalive")
+
+LIVE_RESULT_SIGNATURE = b"\x89MDLIVE\n"
+LIVE_RESULT_VERSION = 1
+
+# signature, version, offset of values, sequence number, number of filled points and flags.
+# Sequence number is odd while value is being written, readers copying values retry when it was odd
+# or has changed during the copy (seqlock), so they never see half written value
+_HEADER = struct.Struct("<8sIIQQQ")
+_SEQUENCE_OFFSET = 16
+_NO_FILLED_OFFSET = 24
+_FLAGS_OFFSET = 32
+_COUNTER = struct.Struct("<Q")
+
+FINISHED_FLAG = 1
+
+# values start at page boundary, after header and json description of the grid
+_PAGE_SIZE = mmap.ALLOCATIONGRANULARITY
+
+# values of prepared file are filled with NaN in blocks of this many values
+_NO_VALUES_PER_WRITE = 1 << 16
+
+# reader waiting for writer to finish writing single value
+SNAPSHOT_RETRY_DELAY_IN_S = 0.0005
+
+
+def _move_in_place(temporary_path: str, path: str) -> str:
+    """
+    Moves prepared file to 'path', and returns path under which file is available.
+    When file in 'path' can't be replaced, because other process (on Windows) still has it open,
+    file is moved under the first free name, like 'live_result_1.mdmalive'.
+    """
+    try:
+        os.replace(temporary_path, path)
+        return path
+    except OSError as ex:
+        logging.warning(f"live result file '{path}' can't be replaced: {str(ex)}")
+
+    root, extension = os.path.splitext(path)
+    no_path = 1
+    while os.path.exists(f"{root}_{no_path}{extension}"):
+        no_path += 1
+
+    os.replace(temporary_path, f"{root}_{no_path}{extension}")
+    logging.warning(f"live result is written to: '{root}_{no_path}{extension}'")
+    return f"{root}_{no_path}{extension}"
+
+
+class LiveResultWriter:
+    """
+    **Result file updated with every measured point.**
+
+    Values of whole grid are preallocated in memory-mapped file, filled with NaN, and every measured value is
+    written straight into it. Other processes (like Jupyter notebook) map the same file with LiveResultReader
+    and see values as they are measured, without copying them and without asking application for them.
+
+    File is prepared next to the target and moved in its place, so readers of previous scan keep
+    their (finished) file, until they open the path again. If previous file can't be replaced,
+    because reader still holds it, file is written under fresh name, stored in 'path'.
+    """
+
+    def __init__(self, grid: GridDescriptor, dtype=float, metadata: Optional[dict] = None, path=None):
+        self.path = DEFAULT_LIVE_RESULT_PATH if path is None else path
+        self.grid = grid
+        self.dtype = np.dtype(dtype)
+
+        description = json.dumps(
+            {
+                "grid": grid.to_dict(),
+                "shape": list(grid.shape),
+                "dtype": self.dtype.str,
+                "metadata": {} if metadata is None else metadata,
+            }
+        ).encode("utf-8")
+        data_offset = -(-(_HEADER.size + len(description)) // _PAGE_SIZE) * _PAGE_SIZE
+        no_values = int(np.prod(grid.shape))
+        data_size = no_values * self.dtype.itemsize
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        temporary_path = self.path + ".tmp"
+        with open(temporary_path, "w+b") as temporary_file:
+            temporary_file.write(_HEADER.pack(LIVE_RESULT_SIGNATURE, LIVE_RESULT_VERSION, data_offset, 0, 0, 0))
+            temporary_file.write(description)
+            # file of size 0 can't be mapped
+            temporary_file.truncate(max(data_offset + data_size, 1))
+            temporary_file.seek(data_offset)
+            for no_first_value in range(0, no_values, _NO_VALUES_PER_WRITE):
+                no_written_values = min(_NO_VALUES_PER_WRITE, no_values - no_first_value)
+                temporary_file.write(np.full(no_written_values, np.nan, dtype=self.dtype).tobytes())
+
+        # file is moved in place only after it's closed, open (or mapped) files can't be renamed on Windows
+        self.path = _move_in_place(temporary_path, self.path)
+
+        self._file = open(self.path, "r+b")
+        self._buffer = mmap.mmap(self._file.fileno(), 0)
+        self.values = np.ndarray(grid.shape, dtype=self.dtype, buffer=self._buffer, offset=data_offset)
+
+        self.sequence = 0
+        self.no_filled = 0
+
+    def set_value(self, row: int, col: int, value) -> None:
+        """
+        Writes value measured in given cell of the grid.
+        """
+        was_filled = not np.isnan(self.values[row, col])
+
+        self.sequence += 1
+        _COUNTER.pack_into(self._buffer, _SEQUENCE_OFFSET, self.sequence)
+
+        self.values[row, col] = value
+        if not was_filled and not np.isnan(value):
+            self.no_filled += 1
+            _COUNTER.pack_into(self._buffer, _NO_FILLED_OFFSET, self.no_filled)
+
+        self.sequence += 1
+        _COUNTER.pack_into(self._buffer, _SEQUENCE_OFFSET, self.sequence)
+
+    def finish(self) -> None:
+        """
+        Marks scan as complete and closes the file.
+        """
+        if self._buffer.closed:
+            return
+
+        _COUNTER.pack_into(self._buffer, _FLAGS_OFFSET, FINISHED_FLAG)
+        self.close()
+
+    def close(self) -> None:
+        """
+        Closes the file, file of unfinished scan stays not marked as complete.
+        """
+        if self._buffer.closed:
+            return
+
+        # array has to be released before its buffer is closed
+        self.values = self.values.copy()
+        self._buffer.flush()
+        self._buffer.close()
+        self._file.close()
+
+
+class LiveResultSnapshot:
+    def __init__(self, values: np.ndarray, no_filled: int, sequence: int, is_finished: bool):
+        self.values = values
+        self.no_filled = no_filled
+        self.sequence = sequence
+        self.is_finished = is_finished
+
+
+class LiveResultReader:
+    """
+    **Read-only view of result file of running scan.**
+
+    'values' maps the file without copying, it changes while the scan goes on.
+    'snapshot' copies values consistent with fill counter, when they have to stay unchanged:
+
+        reader = LiveResultReader()
+        while not reader.is_finished:
+            if reader.sequence != last_sequence:
+                snapshot = reader.snapshot()
+                last_sequence = snapshot.sequence
+                ...
+    """
+
+    def __init__(self, path: str = DEFAULT_LIVE_RESULT_PATH):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            signature, version, data_offset, _, _, _ = _HEADER.unpack(self._buffer[: _HEADER.size])
+
+            if signature != LIVE_RESULT_SIGNATURE:
+                raise ValueError(f"'{path}' is not a live result file")
+            if version > LIVE_RESULT_VERSION:
+                raise ValueError(f"live result file version {version} is not supported")
+
+            description = json.loads(self._buffer[_HEADER.size : data_offset].rstrip(b"\0").decode("utf-8"))
+        except Exception:
+            self._file.close()
+            raise
+
+        self.grid = GridDescriptor.from_dict(description["grid"])
+        self.metadata: dict = description["metadata"]
+        self.values = np.ndarray(
+            tuple(description["shape"]), dtype=np.dtype(description["dtype"]), buffer=self._buffer, offset=data_offset
+        )
+
+    def __enter__(self) -> "LiveResultReader":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._buffer.closed:
+            return
+
+        # array has to be released before its buffer is closed, views of values kept by the caller
+        # keep the file mapped until they are released
+        self.values = self.values.copy()
+        try:
+            self._buffer.close()
+        except BufferError:
+            pass
+        self._file.close()
+
+    def _read_counter(self, offset: int) -> int:
+        return _COUNTER.unpack_from(self._buffer, offset)[0]
+
+    @property
+    def sequence(self) -> int:
+        """
+        Changes with every written value, cheap way to check if anything new was measured.
+        """
+        return self._read_counter(_SEQUENCE_OFFSET)
+
+    @property
+    def no_filled(self) -> int:
+        return self._read_counter(_NO_FILLED_OFFSET)
+
+    @property
+    def is_finished(self) -> bool:
+        return bool(self._read_counter(_FLAGS_OFFSET) & FINISHED_FLAG)
+
+    def snapshot(self) -> LiveResultSnapshot:
+        """
+        Copy of values, taken while no value was being written.
+        """
+        while True:
+            sequence = self.sequence
+            if sequence % 2 == 0:
+                values = self.values.copy()
+                no_filled = self.no_filled
+                if self.sequence == sequence:
+                    return LiveResultSnapshot(values, no_filled, sequence, self.is_finished)
+
+            time.sleep(SNAPSHOT_RETRY_DELAY_IN_S)
+
+    def get_extent(self) -> list:
+        """
+        Left, right, bottom and top edge of the grid, for plotting values as image.
+        """
+        return self.grid.extent()
@@ -4,27 +4,55 @@ from typing import Optional, Union
 import numpy as np
 from dotenv import load_dotenv
 from PyQt6 import QtGui
-from PyQt6.QtCore import Qt, QThread
+from PyQt6.QtCore import Qt, QThread, QTimer
 from PyQt6.QtWidgets import QGridLayout, QMainWindow, QScrollArea, QVBoxLayout, QWidget
 from serial import SerialException
 from vector3d.vector import Vector
 
+from functionalities.AdaptiveRefinement import planned_no_points
+from functionalities.ConnectionCache import ConnectionCache
+from functionalities.device_connection import (
+    connect_analyzer,
+    connect_printer,
+    get_analyzer_mode,
+    get_printer_mode,
+)
 from functionalities.export_import_functions import (
+    add_scan_to_queue,
+    apply_config_dict,
+    create_project_snapshot,
     export_project,
     load_config,
     load_project,
     save_config,
 )
 from functionalities.MeasurementWorker import Measurement, MeasurementWorker
-from functionalities.PrinterPath import PrinterPath, Square
+from functionalities.PrinterPath import (
+    DEFAULT_MEASUREMENT_TIME_IN_SECONDS,
+    PrinterPath,
+    Square,
+)
+from functionalities.ProjectExport import ProjectSnapshot
+from functionalities.ProjectExportWorker import ProjectExportWorker
+from functionalities.ScanJournal import ScanJournal
+from functionalities.ScanQueue import FAILED, FINISHED, RUNNING, ScanJob, ScanQueue
 from gui_controls.ConfigurationInformationWidget import ConfigurationInformationWidget
 from gui_controls.custom_input_fiedls.DeviceConnectionStateLabel import (
     CONNECTED,
     CONNECTING,
     DEVICE_NOT_FOUND,
 )
-from gui_controls.custom_input_fiedls.StartStopButton import START_MEASUREMENT
-from gui_controls.GeneralSettings import GeneralSettings
+from gui_controls.custom_input_fiedls.StartStopButton import (
+    START_MEASUREMENT,
+    STOP_MEASUREMENT,
+)
+from gui_controls.GeneralSettings import (
+    ADAPTIVE_REFINEMENT_SCAN,
+    CONTINUOUS_SCAN,
+    MEASUREMENT_MODE,
+    POINT_BUDGET_IN_PERCENTAGES,
+    GeneralSettings,
+)
 from gui_controls.PrinterControllerWidget import (
     CONNECTION_STATE,
     MOVEMENT_SPEED,
@@ -52,26 +80,12 @@ from gui_controls.SpectrumAnalyzerControllerWidget import (
     SCAN_MODE,
     SpectrumAnalyzerControllerWidget,
 )
-from plot_widgets.Heatmap2DWidget import Heatmap2DWidget
-from plot_widgets.PrinterPathWidget2D import PrinterPathWidget2D
-from printer_device.MarlinDevice import MarlinDevice
 from printer_device.PrinterDevice import Direction
-from printer_device.PrinterDeviceMock import PrinterDeviceMock
-from spectrum_analyzer_device.hameg3010.HamegHMS3010DeviceMock import (
-    HamegHMS3010DeviceMock,
-)
-from spectrum_analyzer_device.hameg3010.HamegHMS3010SerialDevice import (
-    HamegHMS3010DeviceSerial,
-)
-from spectrum_analyzer_device.pocket_vna_device.PocketVNADevice import PocketVnaDevice
-from spectrum_analyzer_device.pocket_vna_device.PocketVnaDeviceMock import (
-    PocketVnaDeviceMock,
-)
 
 load_dotenv()
 VERSION = os.environ.get("VERSION")
-PRINTED_MODE = os.environ.get("PRINTED_MODE", "real_device")
-ANALYZER_MODE = os.environ.get("ANALYZER_MODE", "real_device")
+PRINTED_MODE = get_printer_mode()
+ANALYZER_MODE = get_analyzer_mode()
 
 
 class MainWindow(QMainWindow):
@@ -81,7 +95,13 @@ class MainWindow(QMainWindow):
         # this will be set in _init_ui based on default values in settings
         self.plots = []
         self.current_scan_path: Optional[PrinterPath] = None
+        # number of points and time of the scan, predicted from current settings
+        self.planned_no_points = 0
+        self.total_scan_time_in_seconds = 0
         self.analyzer_device = None
+        self.printer_device = None
+        # last successful connection of every device, tried before discovery
+        self.connection_cache = ConnectionCache()
         self.spectrum_analyzer_controller = SpectrumAnalyzerControllerWidget()
         self.printer_controller = PrinterControllerWidget()
         self.scan_path_settings = ScanPathSettingsWidget()
@@ -90,24 +110,59 @@ class MainWindow(QMainWindow):
 
         self.measurement_thread = QThread()
         self.measurement_worker = MeasurementWorker()
+        self.export_thread = QThread()
+        self.export_worker = ProjectExportWorker()
+
+        # scans run one after another, printer is homed only before the first of them
+        self.scan_queue = ScanQueue()
+        self.is_queue_running = False
+        self.queue_job: Optional[ScanJob] = None
+        self.is_printer_homed = False
+        # plots are created after the window is shown, in init_plots_and_devices
+        self.printer_path_plot = None
+        self.measurement_data = None
         self._init_ui()
 
-        self.try_to_set_up_analyzer_device()
-        self.try_to_set_up_printer_device()
-
         self.init_measurement_thread()
+        self.init_export_thread()
         self.connect_functions()
+        self.general_settings.set_no_queued_scans(len(self.scan_queue.pending_jobs()))
+
+        QTimer.singleShot(0, self.init_plots_and_devices)
+
+    def init_plots_and_devices(self):
+        """
+        Heavy part of initialization: plotting stack is imported, plots are created and devices are connected.
+        Called from event loop, so the window is shown before.
+        """
+        from plot_widgets.PrinterPathWidget2D import PrinterPathWidget2D
+
+        self.printer_path_plot = PrinterPathWidget2D.from_printer_path(self.current_scan_path)
+        self.main_layout.addWidget(self.printer_path_plot, *(0, 1), *(2, 1))
+        self.display_plots()
         self.measurement_data = Measurement.empty_measurement()
 
+        self.try_to_set_up_analyzer_device()
+        self.try_to_set_up_printer_device()
+
+        # scan time is predicted with motion model of connected printer
+        self.recalculate_path()
+
     def update_measurement_data(self, new_measurement: np.ndarray):
         self.measurement_data = new_measurement
 
     def closeEvent(self, event):
         print("User has clicked the red x on the main window")
         self.measurement_thread.quit()
+        if self.export_thread.isRunning():
+            # unfinished project is removed before window is closed
+            self.export_worker.stop_thread_execution()
+            self.export_thread.wait()
         event.accept()
 
     def display_plots(self):
+        from plot_widgets.Heatmap2DWidget import Heatmap2DWidget
+
         for plot in self.plots:
             self.main_layout.removeWidget(plot["widget"])
             plot["widget"].deleteLater()
@@ -142,12 +197,24 @@ class MainWindow(QMainWindow):
         for plot in self.plots:
             self.main_layout.addWidget(plot["widget"], *plot["position"], *plot["shape"])
 
-    def update_plot_from_scan(self, measurement):
+    def start_live_view(self, measurement: Measurement):
         if self.spectrum_analyzer_controller.get_state()[SCAN_MODE] == HAMEG_HMS_3010:
-            self.plots[0]["widget"].update_from_scan(measurement)
+            self.plots[0]["widget"].start_live_view(measurement)
         elif self.spectrum_analyzer_controller.get_state()[SCAN_MODE] == POCKET_VNA:
-            self.plots[0]["widget"].update_from_vna_scan(measurement, "real")
-            self.plots[1]["widget"].update_from_vna_scan(measurement, "imag")
+            self.plots[0]["widget"].start_live_view(measurement, "real")
+            self.plots[1]["widget"].start_live_view(measurement, "imag")
+
+    def stop_live_view(self):
+        for plot in self.plots:
+            plot["widget"].stop_live_view()
+
+    def update_plot_from_measurement_delta(self, no_measurement: int, value):
+        row, col = self.measurement_data.grid_indices[no_measurement]
+        for plot in self.plots:
+            plot["widget"].add_value(row, col, value, self.measurement_data.footprints[no_measurement])
+
+        if self.printer_path_plot is not None:
+            self.printer_path_plot.set_head_position(self.measurement_data.printer_path.extruder_path[no_measurement])
 
     def init_measurement_thread(self):
         self.measurement_worker.moveToThread(self.measurement_thread)
@@ -157,14 +224,120 @@ class MainWindow(QMainWindow):
         self.measurement_worker.finished.connect(self.measurement_thread.quit)
 
         # self.measurement_worker.finished.connect(self.measurement_worker.deleteLater)
-        self.measurement_worker.progress.connect(self.configuration_information.set_current_scanned_point)
+        self.measurement_worker.progress.connect(self.update_scan_progress)
         self.measurement_worker.post_last_measurement.connect(self.spectrum_analyzer_controller.set_last_measurement)
-        self.measurement_worker.post_scan_meshgrid.connect(self.update_plot_from_scan)
+        self.measurement_worker.post_measurement_delta.connect(self.update_plot_from_measurement_delta)
 
         # self.measurement_thread.finished.connect(self.measurement_thread.deleteLater)
 
         self.measurement_thread.finished.connect(self.update_ui_after_measurement)
         self.measurement_worker.finished.connect(self.update_measurement_data)
+        # next scan of the queue is started only after thread of previous one has stopped
+        self.measurement_thread.finished.connect(self.finish_queue_job)
+
+    def init_export_thread(self):
+        self.export_worker.moveToThread(self.export_thread)
+        self.export_thread.started.connect(self.export_worker.run)
+
+        self.export_worker.finished.connect(self.export_thread.quit)
+        self.export_worker.finished.connect(self.update_ui_after_export)
+        self.export_worker.progress.connect(self.general_settings.set_export_progress)
+
+    def export_or_cancel_export(self):
+        if self.export_thread.isRunning():
+            self.export_worker.stop_thread_execution()
+        else:
+            export_project(self)
+
+    def start_export(self, snapshot: ProjectSnapshot):
+        """
+        Writes project in background, figures are rendered from snapshot, not from displayed plots.
+        """
+        if self.export_thread.isRunning():
+            return
+
+        self.export_worker.init(snapshot)
+        self.general_settings.set_export_running(True)
+        self.export_thread.start()
+
+    def update_ui_after_export(self, is_written: bool):
+        print("project exported" if is_written else "project was not exported")
+        self.general_settings.set_export_running(False)
+
+        if self.queue_job is not None:
+            # scan of the queue is finished when its project is saved
+            self.scan_queue.set_state(self.queue_job, FINISHED if is_written else FAILED)
+            self.queue_job = None
+            self.start_next_queue_job()
+
+    def run_scan_queue(self):
+        # project of every scan is saved by export worker, so queue waits for running export
+        if self.is_queue_running or self.measurement_thread.isRunning() or self.export_thread.isRunning():
+            return
+
+        self.is_queue_running = True
+        self.is_printer_homed = False
+        self.start_next_queue_job()
+
+    def stop_scan_queue(self):
+        self.is_queue_running = False
+        self.queue_job = None
+        self.general_settings.set_no_queued_scans(len(self.scan_queue.pending_jobs()))
+
+    def start_next_queue_job(self):
+        job = self.scan_queue.next_job()
+        self.general_settings.set_no_queued_scans(len(self.scan_queue.pending_jobs()))
+        if not self.is_queue_running or job is None:
+            print("scan queue finished")
+            self.stop_scan_queue()
+            return
+
+        print(f"starting scan of the queue: {job}")
+        if (
+            job.config["spectrum_analyzer_controller"][SCAN_MODE]
+            != self.spectrum_analyzer_controller.get_state()[SCAN_MODE]
+        ):
+            print(f"scan skipped, it needs analyzer: {job.config['spectrum_analyzer_controller'][SCAN_MODE]}")
+            self.scan_queue.set_state(job, FAILED)
+            QTimer.singleShot(0, self.start_next_queue_job)
+            return
+
+        was_interrupted = job.was_interrupted
+        self.queue_job = job
+        self.scan_queue.set_state(job, RUNNING)
+        apply_config_dict(self, job.config)
+        self.general_settings.start_measurement.set_state(STOP_MEASUREMENT)
+
+        try:
+            if was_interrupted:
+                try:
+                    self.start_measurement(resume_from_journal=True, is_printer_homed=self.is_printer_homed)
+                    return
+                except (OSError, ValueError) as ex:
+                    print(f"scan can not be resumed, it's started from the beginning: {str(ex)}")
+
+            self.start_measurement(is_printer_homed=self.is_printer_homed)
+
+        except Exception as ex:
+            print(f"scan of the queue failed: {str(ex)}")
+            self.update_ui_after_measurement()
+            self.scan_queue.set_state(job, FAILED)
+            self.queue_job = None
+            QTimer.singleShot(0, self.start_next_queue_job)
+
+    def finish_queue_job(self):
+        if self.queue_job is None:
+            return
+
+        if not self.measurement_worker.is_scan_complete:
+            # scan stopped by the user stops the queue, it's resumed with the next run of the queue
+            print("scan queue stopped")
+            self.scan_queue.interrupt(self.queue_job)
+            self.stop_scan_queue()
+            return
+
+        self.is_printer_homed = True
+        self.start_export(create_project_snapshot(self, self.queue_job.output_directory, with_csv=False))
 
     def try_to_set_up_analyzer_device(self) -> None:
         self.spectrum_analyzer_controller.set_connection_label_text(CONNECTING)
@@ -174,21 +347,8 @@ class MainWindow(QMainWindow):
 
         scan_mode = self.spectrum_analyzer_controller.get_state()[SCAN_MODE]
 
-        if "mock_hameg" in ANALYZER_MODE and scan_mode == HAMEG_HMS_3010:
-            self.analyzer_device = HamegHMS3010DeviceMock.automatically_connect()
-            self.spectrum_analyzer_controller.set_connection_label_text(CONNECTED)
-            return
-        elif "mock_pocket_vna" in ANALYZER_MODE and scan_mode == POCKET_VNA:
-            self.analyzer_device = PocketVnaDeviceMock.automatically_connect()
-            self.spectrum_analyzer_controller.set_connection_label_text(CONNECTED)
-            return
         try:
-            if scan_mode == HAMEG_HMS_3010:
-                self.analyzer_device = HamegHMS3010DeviceSerial.automatically_connect()
-
-            elif scan_mode == POCKET_VNA:
-                self.analyzer_device = PocketVnaDevice.automatically_connect()
-
+            self.analyzer_device = connect_analyzer(scan_mode, self.connection_cache, ANALYZER_MODE)
             self.spectrum_analyzer_controller.set_connection_label_text(CONNECTED)
 
         except Exception as ex:
@@ -198,13 +358,9 @@ class MainWindow(QMainWindow):
 
     def try_to_set_up_printer_device(self) -> None:
         self.printer_controller.set_connection_label_text(CONNECTING)
-        if PRINTED_MODE == "mock_printer":
-            self.printer_controller.set_connection_label_text(CONNECTED)
-            self.printer_device = PrinterDeviceMock.connect()
-            return
         try:
             self.printer_controller.set_connection_label_text(CONNECTED)
-            self.printer_device = MarlinDevice.connect()
+            self.printer_device = connect_printer(self.connection_cache, PRINTED_MODE)
 
         except SerialException:
             self.printer_controller.set_connection_label_text(DEVICE_NOT_FOUND)
@@ -237,24 +393,24 @@ class MainWindow(QMainWindow):
         self.scroll_area.setWidget(self.settings_widget)
 
         self.update_current_scan_path_from_scan_path_settings()
-
-        self.printer_path_plot = PrinterPathWidget2D.from_printer_path(self.current_scan_path)
-        self.main_layout.addWidget(self.printer_path_plot, *(0, 1), *(2, 1))
         self.recalculate_path()
 
-        self.display_plots()
-
         widget = QWidget()
         widget.setLayout(self.main_layout)
         self.setCentralWidget(widget)
 
+    def update_extruder_position(self):
+        self.printer_controller.update_extruder_position(self.printer_device.current_position)
+        if self.printer_path_plot is not None:
+            self.printer_path_plot.set_head_position(self.printer_device.current_position)
+
     def home_all_axis(self):
         self.printer_device.home_all_axis()
-        self.printer_controller.update_extruder_position(self.printer_device.current_position)
+        self.update_extruder_position()
 
     def center_extruder(self):
         self.printer_device.center_extruder(self.printer_controller.get_state()[MOVEMENT_SPEED])
-        self.printer_controller.update_extruder_position(self.printer_device.current_position)
+        self.update_extruder_position()
 
     def step(self, direction: Direction):
         self.printer_device.step(
@@ -262,12 +418,18 @@ class MainWindow(QMainWindow):
             self.printer_controller.get_state()[STEP_SIZE_IN_MM],
             self.printer_controller.get_state()[MOVEMENT_SPEED],
         )
-        self.printer_controller.update_extruder_position(self.printer_device.current_position)
+        self.update_extruder_position()
 
     def connect_functions(self):
         self.scan_path_settings.on_recalculate_path_button_press(self.recalculate_path)
         self.general_settings.on_start_measurement_button_press(self.start_measurement)
         self.general_settings.on_stop_measurement_button_press(self.measurement_worker.stop_thread_execution)
+        self.general_settings.on_resume_scan_button_press(self.resume_measurement)
+        self.general_settings.on_dry_run_button_press(self.dry_run)
+        self.general_settings.on_add_to_queue_button_press(lambda x: add_scan_to_queue(self))
+        self.general_settings.on_run_queue_button_press(lambda x: self.run_scan_queue())
+        self.general_settings.on_scan_mode_box_change(self.recalculate_path)
+        self.general_settings.on_point_budget_change(self.recalculate_path)
         self.spectrum_analyzer_controller.on_refresh_connection_button_press(self.try_to_set_up_analyzer_device)
         self.spectrum_analyzer_controller.on_scan_mode_box_change(self.try_to_set_up_analyzer_device)
         self.spectrum_analyzer_controller.on_scan_mode_box_change(self.display_plots)
@@ -288,7 +450,7 @@ class MainWindow(QMainWindow):
         self.printer_controller.on_nx_button_press(lambda x: self.step(Direction.NX))
 
         self.spectrum_analyzer_controller.on_update_last_measurement_button_press(self.update_last_measurement)
-        self.general_settings.on_export_scan_button_press(lambda x: export_project(self))
+        self.general_settings.on_export_scan_button_press(lambda x: self.export_or_cancel_export())
         self.general_settings.on_export_settings_button_press(lambda x: save_config(self))
         self.general_settings.on_import_scan_button_press(lambda x: load_project(self))
         self.general_settings.on_import_settings_button_press(lambda x: load_config(self))
@@ -325,18 +487,93 @@ class MainWindow(QMainWindow):
                 printer_settings[PRINTER_LENGTH_IN_MM],
                 210,
             ),
+            movement_speed=printer_settings[MOVEMENT_SPEED],
+            motion_model=None if self.printer_device is None else self.printer_device.motion_model,
         )
 
     def recalculate_path(self):
         self.update_current_scan_path_from_scan_path_settings()
 
+        no_points = self.current_scan_path.get_no_scan_points()
+        total_scan_time_in_seconds = self.current_scan_path.total_scan_time_in_seconds(
+            self.get_measurement_time_estimate()
+        )
+
+        general_settings = self.general_settings.get_state()
+        if general_settings[MEASUREMENT_MODE] == ADAPTIVE_REFINEMENT_SCAN and no_points > 0:
+            planned_points = planned_no_points(self.current_scan_path, general_settings[POINT_BUDGET_IN_PERCENTAGES])
+            total_scan_time_in_seconds = total_scan_time_in_seconds * planned_points / no_points
+            no_points = planned_points
+
+        elif general_settings[MEASUREMENT_MODE] == CONTINUOUS_SCAN:
+            total_scan_time_in_seconds = int(
+                self.current_scan_path.predict_continuous_scan_time(self.get_measurement_time_estimate())
+            )
+
+        self.planned_no_points = no_points
+        self.total_scan_time_in_seconds = total_scan_time_in_seconds
+
         self.configuration_information.update_widget(
-            no_points=self.current_scan_path.get_no_scan_points(),
+            no_points=no_points,
             no_current_measurement=0,
-            total_scan_time_in_seconds=self.current_scan_path.total_scan_time_in_seconds(),
+            total_scan_time_in_seconds=total_scan_time_in_seconds,
+            path_ordering=self.current_scan_path.ordering,
         )
-        self.printer_path_plot.update_from_printer_path(self.current_scan_path)
-        self.printer_path_plot.show()
+        if self.printer_path_plot is not None:
+            self.printer_path_plot.update_from_printer_path(self.current_scan_path)
+            self.printer_path_plot.show()
+
+    def get_measurement_time_estimate(self) -> float:
+        """
+        Analyzer dwell in every point, as reported by connected device,
+        or derived from analyzer settings when device is not connected (or does not report it).
+        """
+        analyzer_settings = self.spectrum_analyzer_controller.get_state()
+
+        if self.analyzer_device is not None:
+            measurement_duration = self.analyzer_device.get_measurement_duration(analyzer_settings[MEASUREMENT_TIME])
+            if measurement_duration is not None:
+                return measurement_duration
+
+        if analyzer_settings[SCAN_MODE] == HAMEG_HMS_3010:
+            return analyzer_settings[MEASUREMENT_TIME]
+
+        return DEFAULT_MEASUREMENT_TIME_IN_SECONDS
+
+    def update_scan_progress(self, no_measured_points: int):
+        self.configuration_information.set_current_scanned_point(no_measured_points)
+
+        no_measured_points = int(no_measured_points)
+
+        if self.general_settings.get_state()[MEASUREMENT_MODE] in (ADAPTIVE_REFINEMENT_SCAN, CONTINUOUS_SCAN):
+            # points of adaptive and continuous scan are not measured in path order
+            scan_time_left_in_seconds = self.total_scan_time_in_seconds * (
+                1 - no_measured_points / max(self.planned_no_points, 1)
+            )
+        else:
+            scan_time_left_in_seconds = self.current_scan_path.predict_scan_time(
+                self.get_measurement_time_estimate(), no_measured_points
+            )
+
+        self.configuration_information.set_scan_time_left(scan_time_left_in_seconds)
+
+    def dry_run(self):
+        """
+        Predicts scan time from current settings, without moving the printer. No device has to be connected.
+        """
+        self.recalculate_path()
+
+        if self.current_scan_path.get_no_scan_points() == 0:
+            print("dry run: scan path is of length 0")
+            return
+
+        breakdown = self.current_scan_path.get_scan_time_breakdown(self.get_measurement_time_estimate())
+        print(f"dry run: {self.planned_no_points} points, path ordering: {self.current_scan_path.ordering}")
+        for name, time_in_seconds in breakdown.items():
+            print(f"\t{name}: {ConfigurationInformationWidget.convert_time(time_in_seconds)}")
+
+        if self.general_settings.get_state()[MEASUREMENT_MODE] == CONTINUOUS_SCAN:
+            print(f"\tcontinuous scan: {ConfigurationInformationWidget.convert_time(self.total_scan_time_in_seconds)}")
 
     def scan_can_be_performed(self) -> Union[bool, str]:
         if self.current_scan_path.get_no_scan_points() <= 0:
@@ -363,6 +600,7 @@ class MainWindow(QMainWindow):
         self.configuration_information.start_elapsed_timer()
 
     def update_ui_after_measurement(self):
+        self.stop_live_view()
         self.spectrum_analyzer_controller.set_disabled(False)
         self.printer_controller.set_disabled(False)
         self.scan_path_settings.set_disabled(False)
@@ -371,7 +609,7 @@ class MainWindow(QMainWindow):
         self.configuration_information.stop_elapsed_timer()
         self.general_settings.activate_export_buttons()
 
-    def start_measurement(self):
+    def start_measurement(self, resume_from_journal: bool = False, is_printer_homed: bool = False):
         if self.printer_device is None:
             raise ValueError("printer_handle is None")
 
@@ -385,7 +623,47 @@ class MainWindow(QMainWindow):
             printer_controller_state=self.printer_controller.get_state(),
             scan_path_settings_state=self.scan_path_settings.get_state(),
             scan_configuration_state=self.configuration_information.get_state(),
+            general_settings_state=self.general_settings.get_state(),
             printer_handle=self.printer_device,
             analyzer_handle=self.analyzer_device,
+            resume_from_journal=resume_from_journal,
+            is_printer_homed=is_printer_homed,
         )
+        self.measurement_data = self.measurement_worker.measurement_data
+        self.start_live_view(self.measurement_data)
         self.measurement_thread.start()
+
+    def resume_measurement(self):
+        """
+        Restores settings of last, unfinished scan from scan journal,
+        and continues it from the first point that was not measured.
+        """
+        try:
+            journal_content = ScanJournal.read(self.measurement_worker.journal.path)
+        except (OSError, ValueError) as ex:
+            print(f"scan can not be resumed: {str(ex)}")
+            return
+
+        if journal_content.is_finished:
+            print("last scan was finished, there is nothing to resume")
+            return
+
+        config = journal_content.config
+        if (
+            config["spectrum_analyzer_controller"][SCAN_MODE]
+            != self.spectrum_analyzer_controller.get_state()[SCAN_MODE]
+        ):
+            print(f"scan can not be resumed, switch analyzer to: {config['spectrum_analyzer_controller'][SCAN_MODE]}")
+            return
+
+        self.spectrum_analyzer_controller.set_state(config["spectrum_analyzer_controller"])
+        self.printer_controller.set_state(config["printer_controller"])
+        self.scan_path_settings.set_state(config["scan_path_settings"])
+        self.general_settings.set_state(config["general_settings"])
+
+        self.general_settings.start_measurement.set_state(STOP_MEASUREMENT)
+        try:
+            self.start_measurement(resume_from_journal=True)
+        except Exception as ex:
+            print(f"scan can not be resumed: {str(ex)}")
+            self.update_ui_after_measurement()
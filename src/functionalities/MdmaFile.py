@@ -0,0 +1,305 @@
+import itertools
+import json
+import mmap
+import operator
+import os
+import struct
+import zlib
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from functionalities.GridDescriptor import GridDescriptor
+
+# first bytes of binary data file, files starting differently are csv files written by older versions
+MDMA_FILE_SIGNATURE = b"\x89MDMA\r\n\x1a"
+MDMA_FILE_VERSION = 1
+
+# signature, version, offset and length of json index stored after the last chunk
+_HEADER = struct.Struct("<8sIQQ")
+
+# values are split into chunks along rows and columns of the grid, every chunk is compressed separately,
+# so part of the grid can be read without decompressing whole file
+DEFAULT_CHUNK_SHAPE = (64, 64)
+DEFAULT_COMPRESSION_LEVEL = 6
+# decompressed chunks kept by reader, 64 x 64 chunk of complex64 values takes 32 kB
+DEFAULT_NO_CACHED_CHUNKS = 512
+
+# relative error of values stored in single precision, accepted for measured values. Single precision keeps
+# about 7 significant digits, more than analyzers deliver, so only values out of its range exceed it
+SINGLE_PRECISION_TOLERANCE = 1e-6
+
+
+class MdmaFileContent:
+    def __init__(self, values: np.ndarray, grid: GridDescriptor, metadata: dict):
+        self.values = values
+        self.grid = grid
+        self.metadata = metadata
+
+
+def compact_dtype(values: np.ndarray) -> np.dtype:
+    """
+    float32 or complex64 if values are stored in them without loss larger than SINGLE_PRECISION_TOLERANCE,
+    otherwise dtype of values.
+    """
+    single_precision = {np.dtype(float): np.dtype(np.float32), np.dtype(complex): np.dtype(np.complex64)}
+    if values.dtype not in single_precision:
+        return values.dtype
+
+    with np.errstate(over="ignore"):
+        converted = values.astype(single_precision[values.dtype])
+
+    if np.allclose(converted, values, rtol=SINGLE_PRECISION_TOLERANCE, atol=0, equal_nan=True):
+        return converted.dtype
+    return values.dtype
+
+
+def full_chunk_shape(shape: Tuple[int, ...], chunk_shape: Sequence[int]) -> Tuple[int, ...]:
+    """
+    Chunk shape for every dimension of values, dimensions not given in 'chunk_shape' are not split.
+    """
+    return tuple(chunk_shape) + tuple(shape[len(chunk_shape) :])
+
+
+def chunk_slices(shape: Tuple[int, ...], chunk_shape: Sequence[int]) -> List[Tuple[slice, ...]]:
+    """
+    Slices of values covered by every chunk, chunks are in row-major order.
+    """
+    chunk_shape = full_chunk_shape(shape, chunk_shape)
+    return [
+        tuple(slice(start, min(start + size, length)) for start, size, length in zip(starts, chunk_shape, shape))
+        for starts in itertools.product(*(range(0, length, max(size, 1)) for length, size in zip(shape, chunk_shape)))
+    ]
+
+
+def write_mdma_file(
+    path: str,
+    values: np.ndarray,
+    grid: GridDescriptor,
+    metadata: Optional[dict] = None,
+    chunk_shape: Sequence[int] = DEFAULT_CHUNK_SHAPE,
+    compression_level: int = DEFAULT_COMPRESSION_LEVEL,
+    dtype: Optional[np.dtype] = None,
+) -> None:
+    """
+    **Saves values measured on the grid in binary file.**
+
+    File starts with header pointing to json index, which holds grid, dtype, shape, metadata
+    and position of every zlib compressed chunk. Values may have more dimensions than the grid
+    (like values measured on many frequencies), first two dimensions are rows and columns of the grid.
+    Every value of other dimensions (like every frequency) is stored in separate chunks, so it can be read alone.
+    File is written next to the target first, then moved in its place, so existing file is never left half written.
+
+    Parameters
+    ----------
+    **path : str**
+        Path of the file
+
+    **values : np.ndarray**
+        Values of shape (y_axis, x_axis, ...), not measured values are NaN
+
+    **grid : GridDescriptor**
+        Grid on which values were measured
+
+    **metadata : Optional[dict], optional**
+        Any json serializable information, like scan configuration, **by default none**
+
+    **chunk_shape : Sequence[int], optional**
+        Number of rows and columns of grid in every chunk, and optionally size of chunk in other dimensions,
+        **by default DEFAULT_CHUNK_SHAPE, with size 1 in other dimensions**
+
+    **compression_level : int, optional**
+        zlib compression level, **by default DEFAULT_COMPRESSION_LEVEL**
+
+    **dtype : Optional[np.dtype], optional**
+        Type of stored values, **by default the most compact one that keeps values, see compact_dtype**
+    """
+    values = np.asarray(values)
+    if values.ndim < 2 or values.shape[:2] != grid.shape:
+        raise ValueError(f"values of shape {values.shape} do not match grid of shape {grid.shape}")
+
+    dtype = compact_dtype(values) if dtype is None else np.dtype(dtype)
+    chunk_shape = tuple(chunk_shape) + (1,) * (values.ndim - len(chunk_shape))
+
+    temporary_path = path + ".tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(bytes(_HEADER.size))
+
+        chunks = []
+        for chunk_slice in chunk_slices(values.shape, chunk_shape):
+            chunk = zlib.compress(np.ascontiguousarray(values[chunk_slice], dtype=dtype).tobytes(), compression_level)
+            chunks.append([file.tell(), len(chunk)])
+            file.write(chunk)
+
+        index = json.dumps(
+            {
+                "grid": grid.to_dict(),
+                "shape": list(values.shape),
+                "dtype": dtype.str,
+                "chunk_shape": list(chunk_shape),
+                "compression": "zlib",
+                "chunks": chunks,
+                "metadata": {} if metadata is None else metadata,
+            }
+        ).encode("utf-8")
+        index_offset = file.tell()
+        file.write(index)
+
+        file.seek(0)
+        file.write(_HEADER.pack(MDMA_FILE_SIGNATURE, MDMA_FILE_VERSION, index_offset, len(index)))
+
+    os.replace(temporary_path, path)
+
+
+def is_mdma_file(path: str) -> bool:
+    with open(path, "rb") as file:
+        return file.read(len(MDMA_FILE_SIGNATURE)) == MDMA_FILE_SIGNATURE
+
+
+def read_mdma_index(buffer) -> dict:
+    """
+    Json index of binary file, read from bytes-like buffer holding whole file.
+    """
+    signature, version, index_offset, index_length = _HEADER.unpack(buffer[: _HEADER.size])
+
+    if signature != MDMA_FILE_SIGNATURE:
+        raise ValueError("file is not a binary MDMA data file")
+    if version > MDMA_FILE_VERSION:
+        raise ValueError(f"MDMA data file version {version} is not supported, last supported: {MDMA_FILE_VERSION}")
+
+    return json.loads(bytes(buffer[index_offset : index_offset + index_length]).decode("utf-8"))
+
+
+class MdmaReader:
+    """
+    **Lazy reader of binary data file.**
+
+    File is memory-mapped and only chunks overlapping requested part of values are decompressed,
+    so window of the grid, or single frequency of multi-frequency scan, is read without reading whole file.
+    Recently read chunks are cached, so moving the window around reads only new chunks.
+
+    Values are indexed like numpy array, with integers and slices:
+
+        with MdmaReader(path) as reader:
+            first_frequency = reader[:, :, 0]
+            corner = reader[:100, :100]
+    """
+
+    def __init__(self, path: str, no_cached_chunks: int = DEFAULT_NO_CACHED_CHUNKS):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            index = read_mdma_index(self._buffer)
+        except Exception:
+            self._file.close()
+            raise
+
+        self.shape: Tuple[int, ...] = tuple(index["shape"])
+        self.dtype = np.dtype(index["dtype"])
+        self.grid = GridDescriptor.from_dict(index["grid"])
+        self.metadata: dict = index["metadata"]
+        self.chunk_shape = full_chunk_shape(self.shape, index["chunk_shape"])
+
+        self._chunks = index["chunks"]
+        self._no_chunks = tuple(-(-length // max(size, 1)) for length, size in zip(self.shape, self.chunk_shape))
+        self._read_chunk = lru_cache(maxsize=no_cached_chunks)(self._decompress_chunk)
+
+    def __enter__(self) -> "MdmaReader":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._read_chunk.cache_clear()
+        self._buffer.close()
+        self._file.close()
+
+    @property
+    def ndim(self) -> int:
+        return len(self.shape)
+
+    def _decompress_chunk(self, chunk_id: Tuple[int, ...]) -> np.ndarray:
+        offset, length = self._chunks[int(np.ravel_multi_index(chunk_id, self._no_chunks))]
+        shape = tuple(
+            min(size, total - chunk * size) for chunk, size, total in zip(chunk_id, self.chunk_shape, self.shape)
+        )
+        return np.frombuffer(zlib.decompress(self._buffer[offset : offset + length]), dtype=self.dtype).reshape(shape)
+
+    def __getitem__(self, key) -> np.ndarray:
+        key = key if isinstance(key, tuple) else (key,)
+        if len(key) > self.ndim:
+            raise IndexError(f"too many indices for values of {self.ndim} dimensions")
+        key = key + (slice(None),) * (self.ndim - len(key))
+
+        # selected indices, and range of indices that is read for every dimension
+        selections = []
+        for axis, (axis_key, length) in enumerate(zip(key, self.shape)):
+            if isinstance(axis_key, slice):
+                selections.append(np.arange(length)[axis_key])
+            else:
+                axis_key = operator.index(axis_key)
+                if not -length <= axis_key < length:
+                    raise IndexError(f"index {axis_key} is out of bounds for axis {axis} with size {length}")
+                selections.append(np.array([axis_key % length]))
+
+        squeezed = tuple(0 if not isinstance(axis_key, slice) else slice(None) for axis_key in key)
+        if any(len(selection) == 0 for selection in selections):
+            return np.empty(tuple(len(selection) for selection in selections), dtype=self.dtype)[squeezed]
+
+        first = [int(selection.min()) for selection in selections]
+        stop = [int(selection.max()) + 1 for selection in selections]
+        block = np.empty(tuple(b - a for a, b in zip(first, stop)), dtype=self.dtype)
+
+        for chunk_id in itertools.product(
+            *(range(a // size, (b - 1) // size + 1) for a, b, size in zip(first, stop, self.chunk_shape))
+        ):
+            chunk = self._read_chunk(chunk_id)
+            chunk_first = [chunk_index * size for chunk_index, size in zip(chunk_id, self.chunk_shape)]
+
+            overlap = [
+                (max(a, c), min(b, c + length)) for a, b, c, length in zip(first, stop, chunk_first, chunk.shape)
+            ]
+            block[tuple(slice(low - a, high - a) for (low, high), a in zip(overlap, first))] = chunk[
+                tuple(slice(low - c, high - c) for (low, high), c in zip(overlap, chunk_first))
+            ]
+
+        return block[np.ix_(*(selection - a for selection, a in zip(selections, first)))][squeezed]
+
+    def window(
+        self, x_range: Tuple[float, float], y_range: Tuple[float, float], *plane
+    ) -> Tuple[np.ndarray, GridDescriptor]:
+        """
+        **Reads values of grid points within x and y range.**
+
+        Parameters
+        ----------
+        **x_range : Tuple[float, float]**
+            Lowest and highest x coordinate in mm
+
+        **y_range : Tuple[float, float]**
+            Lowest and highest y coordinate in mm
+
+        **plane : int or slice**
+            Indices of other dimensions (like frequency), **by default all of them are read**
+
+        Returns
+        -------
+        **Tuple[np.ndarray, GridDescriptor]**
+            Values of points in window, and grid of the window
+        """
+        first_col, last_col = self.grid.x.index_range(*x_range)
+        first_row, last_row = self.grid.y.index_range(*y_range)
+
+        values = self[(slice(first_row, last_row), slice(first_col, last_col)) + plane]
+        return values, GridDescriptor(self.grid.x.subset(first_col, last_col), self.grid.y.subset(first_row, last_row))
+
+
+def read_mdma_file(path: str) -> MdmaFileContent:
+    """
+    Reads whole binary data file, values are returned in stored dtype.
+    """
+    with MdmaReader(path) as reader:
+        return MdmaFileContent(reader[:], reader.grid, reader.metadata)
@@ -1,13 +1,26 @@
-from typing import Any, Callable
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Optional, Tuple
 
 import numpy as np
-import pandas as pd
 from vector3d.vector import Vector
 
-from functionalities.PrinterPath import PrinterPath, Square
+from functionalities.GridDescriptor import GridAxis, GridDescriptor
+from functionalities.PrinterPath import DEFAULT_MOVEMENT_SPEED, PrinterPath, Square
+from printer_device.MotionModel import MotionModel
+
+if TYPE_CHECKING:
+    # pandas is imported on first use, it's needed only to import and export data
+    import pandas as pd
 
 
 class Measurement:
+    """
+    **Measured values arranged on the scan grid.**
+
+    Values are stored in preallocated array (float for Hameg, complex for PocketVNA), shaped (y_axis, x_axis).
+    Unmeasured points are NaN. Position in the array of every path step is precomputed by PrinterPath,
+    so adding measurement never has to look up coordinates.
+    """
+
     def __init__(
         self,
         pass_height: float = None,
@@ -15,63 +28,123 @@ class Measurement:
         scanned_area: Square = None,
         measurement_radius: float = None,
         printer_bed_size: Vector = None,
-        data: pd.DataFrame = None,
+        movement_speed: float = DEFAULT_MOVEMENT_SPEED,
+        motion_model: Optional[MotionModel] = None,
+        data: "pd.DataFrame" = None,
+        dtype: type = float,
+        values: np.ndarray = None,
+        grid: GridDescriptor = None,
     ):
-        if data is None:
-            self.printer_path = PrinterPath(
-                pass_height, antenna_offset, scanned_area, measurement_radius, printer_bed_size
+        if data is not None:
+            values = data.to_numpy()
+            if values.dtype == object:
+                # complex values are stored as strings in csv file
+                values = values.astype(complex)
+
+            grid = GridDescriptor(
+                GridAxis.from_coordinates(np.array(data.columns, dtype=float)),
+                GridAxis.from_coordinates(np.array(data.index, dtype=float)),
             )
-            x_labels = np.unique([pos.x for pos in self.printer_path.get_antenna_path()])
-            y_labels = np.unique([pos.y for pos in self.printer_path.get_antenna_path()])
 
-            self.x_axis_length = len(x_labels)
-            self.y_axis_length = len(y_labels)
-
-            self.x_min = min(x_labels)
-            self.x_max = max(x_labels)
-
-            self.y_min = min(y_labels)
-            self.y_max = max(y_labels)
+        if values is None:
+            self.printer_path = PrinterPath(
+                pass_height,
+                antenna_offset,
+                scanned_area,
+                measurement_radius,
+                printer_bed_size,
+                movement_speed,
+                motion_model,
+            )
+            self.grid = self.printer_path.grid
+            self.grid_indices = np.array(self.printer_path.get_grid_indices(), dtype=int).reshape(-1, 2)
 
-            scan_data = np.empty((self.y_axis_length, self.x_axis_length), float)
-            scan_data.fill(None)
-            self.data = pd.DataFrame(scan_data)
+            self.data = np.full(self.grid.shape, np.nan, dtype=dtype)
 
-            self.data.columns = x_labels
-            self.data.index = y_labels
+            self.step_indices = np.full(self.data.shape, -1, dtype=int)
+            self.step_indices[self.grid_indices[:, 0], self.grid_indices[:, 1]] = np.arange(len(self.grid_indices))
 
         else:
             self.printer_path = None
-            self.data = data
-
-        self._current_index = 0
+            self.grid = grid
+            self.grid_indices = np.empty((0, 2), dtype=int)
+            self.data = np.array(values, copy=True)
+            self.step_indices = np.full(self.grid.shape, -1, dtype=int)
+
+        # width (in grid points) of square represented by point measured in given step,
+        # larger than 1 only for points measured in coarse pass of adaptive scan
+        self.footprints = np.ones(len(self.grid_indices), dtype=int)
+
+        self.x_axis = self.grid.x.coordinates()
+        self.y_axis = self.grid.y.coordinates()
+        self.x_axis_length = self.grid.x.count
+        self.y_axis_length = self.grid.y.count
+
+        if not self.grid.is_empty:
+            self.x_min = self.grid.x.first
+            self.x_max = self.grid.x.last
+
+            self.y_min = self.grid.y.first
+            self.y_max = self.grid.y.last
+        else:
+            self.x_min = self.x_max = self.y_min = self.y_max = None
 
     @staticmethod
-    def from_pd_dataframe(data: pd.DataFrame):
+    def from_pd_dataframe(data: "pd.DataFrame"):
         return Measurement(data=data)
 
+    @staticmethod
+    def from_numpy(values: np.ndarray, grid: GridDescriptor):
+        """
+        Measurement of values of shape (y_axis, x_axis) measured on given grid, without scan path.
+        """
+        return Measurement(values=values, grid=grid)
+
     @staticmethod
     def empty_measurement():
+        import pandas as pd
+
         return Measurement(data=pd.DataFrame())
 
-    def to_pd_dataframe(self) -> pd.DataFrame:
+    def to_pd_dataframe(self) -> "pd.DataFrame":
+        import pandas as pd
+
+        return pd.DataFrame(self.data, index=self.y_axis, columns=self.x_axis)
+
+    def to_numpy(self) -> np.ndarray:
         return self.data
 
     def add_measurement(self, x, y, value):
-        self.data[x][y] = value
-
-    def __iter__(self):
-        return self
-
-    def __next__(self) -> tuple[Vector, Vector, Callable[[Any], None]]:
-        if self._current_index < len(self.printer_path.extruder_path):
-            curr_index = self._current_index
-            self._current_index += 1
-            return (
-                self.printer_path.extruder_path[curr_index],
-                self.printer_path.antenna_path[curr_index],
-                lambda val: self.add_measurement(
-                    self.printer_path.antenna_path[curr_index].x, self.printer_path.antenna_path[curr_index].y, val
-                ),
+        self.data[self.grid.y.index_of(y), self.grid.x.index_of(x)] = value
+
+    def get_extent(self) -> list:
+        """
+        Left, right, bottom and top edge of measured area, for plotting data as image.
+        """
+        return self.grid.extent()
+
+    def add_measurement_by_index(self, index: int, value):
+        """
+        Stores value measured in path step of given index.
+        """
+        row, col = self.grid_indices[index]
+        self.data[row, col] = value
+
+    def __iter__(self) -> Iterator[Tuple[Vector, Vector, Callable[[Any], None]]]:
+        return self.iter_steps()
+
+    def iter_steps(self, start_index: int = 0) -> Iterator[Tuple[Vector, Vector, Callable[[Any], None]]]:
+        """
+        Yields extruder position, antenna position and function storing value measured there,
+        for every path step starting from 'start_index'. Every call starts new, independent iteration.
+        """
+        for index in range(start_index, len(self.printer_path.extruder_path)):
+            yield (
+                self.printer_path.extruder_path[index],
+                self.printer_path.antenna_path[index],
+                lambda val, index=index: self.add_measurement_by_index(index, val),
             )
-        raise StopIteration
+
+    def is_measured(self, index: int) -> bool:
+        row, col = self.grid_indices[index]
+        return not np.isnan(self.data[row, col])
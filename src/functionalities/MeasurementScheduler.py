@@ -0,0 +1,113 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, List, Optional
+
+from printer_device.PrinterDevice import PrinterDevice
+
+
+class MeasurementScheduler:
+    """
+    **Pipelined move/measure scheduler.**
+
+    Printer and analyzer are driven from separate threads, so their work overlaps:
+
+    - analyzer setup (frequency and measurement time) is send while printer moves to measurement point,
+    - if analyzer knows how long it integrates the signal, next move is queued in printer right after the dwell
+      that covers the measurement, so printer starts moving as soon as measurement ends. Dwell is sent only
+      after analyzer has sent the trigger, so delay of the trigger never lets printer move during measurement,
+    - measured value is posted while printer is already moving towards next point.
+    """
+
+    def __init__(
+        self,
+        printer_handle: PrinterDevice,
+        analyzer_handle,
+        frequency: float,
+        measurement_time,
+        dwell_margin: float = 0.1,
+    ):
+        self.printer_handle = printer_handle
+        self.analyzer_handle = analyzer_handle
+        self.frequency = frequency
+        self.measurement_time = measurement_time
+        self.dwell_margin = dwell_margin
+
+    def _dwell_command(self) -> Optional[str]:
+        # dwell has to start after the trigger, analyzer that cannot be triggered on its own is awaited instead
+        if not hasattr(self.analyzer_handle, "trigger_measurement"):
+            return None
+
+        measurement_duration = self.analyzer_handle.get_measurement_duration(self.measurement_time)
+        if measurement_duration is None:
+            return None
+
+        return f"G4 P{int((measurement_duration + self.dwell_margin) * 1000)}"
+
+    def run(
+        self,
+        move_commands: List[str],
+        on_measurement: Callable[[int, Any], None],
+        should_stop: Callable[[], bool],
+    ) -> bool:
+        """
+        **Moves printer through all positions and performs measurement in each one of them.**
+
+        Parameters
+        ----------
+        **move_commands : List[str]**
+            'G1' commands, one for every measurement point, in order of execution
+
+        **on_measurement : Callable[[int, Any], None]**
+            Called with index of move command and measured value, as soon as measurement is done
+
+        **should_stop : Callable[[], bool]**
+            Checked before every measurement, scan is aborted if it returns True
+
+        Returns
+        -------
+        **bool**
+            True if all points were measured, False if scan was stopped
+        """
+        if len(move_commands) == 0:
+            return True
+
+        dwell_command = self._dwell_command()
+
+        with ThreadPoolExecutor(max_workers=1) as printer_executor, ThreadPoolExecutor(
+            max_workers=1
+        ) as analyzer_executor:
+            move: Future = printer_executor.submit(self.printer_handle.send_and_await, move_commands[0])
+
+            for index in range(len(move_commands)):
+                setup = analyzer_executor.submit(
+                    self.analyzer_handle.prepare_measurement, self.frequency, self.measurement_time
+                )
+                move.result()
+                setup.result()
+
+                if should_stop():
+                    return False
+
+                is_last_point = index + 1 == len(move_commands)
+                next_move: Optional[Future] = None
+
+                if dwell_command is not None:
+                    analyzer_executor.submit(self.analyzer_handle.trigger_measurement, self.measurement_time).result()
+                    level = analyzer_executor.submit(self.analyzer_handle.fetch_level, self.measurement_time)
+
+                    if not is_last_point:
+                        # printer waits in place until measurement ends, then immediately moves to next point
+                        next_move = printer_executor.submit(
+                            self.printer_handle.send_batch_and_await, [dwell_command, move_commands[index + 1]]
+                        )
+                else:
+                    level = analyzer_executor.submit(self.analyzer_handle.read_level, self.measurement_time)
+
+                measurement = level.result()
+
+                if not is_last_point and next_move is None:
+                    next_move = printer_executor.submit(self.printer_handle.send_and_await, move_commands[index + 1])
+
+                on_measurement(index, measurement)
+                move = next_move
+
+        return True
@@ -1,9 +1,28 @@
-from copy import copy
-from typing import List, Optional, Tuple
+from collections.abc import Sequence
+from typing import Dict, Iterator, List, Optional, Tuple
 
 import numpy as np
 from vector3d.vector import Vector
 
+from functionalities.GridDescriptor import GridAxis, GridDescriptor
+from printer_device.MotionModel import MotionModel, row_feedrate
+
+# orderings of measurement points, compared by predicted travel time
+Y_MAJOR_SERPENTINE = "Y-major serpentine"
+X_MAJOR_SERPENTINE = "X-major serpentine"
+Y_MAJOR_ROW_SKIPPING = "Y-major row skipping"
+X_MAJOR_ROW_SKIPPING = "X-major row skipping"
+SCAN_PATH_ORDER = "Scan path order"
+NEAREST_NEIGHBOUR_2_OPT = "Nearest neighbour + 2-opt"
+
+# feed rate of G1 commands in mm/min
+DEFAULT_MOVEMENT_SPEED = 1000
+
+# analyzer dwell in every point, used when it can not be read from the device
+DEFAULT_MEASUREMENT_TIME_IN_SECONDS = 0.5
+
+MAX_NO_2_OPT_PASSES = 20
+
 
 class Square:
     def __init__(self, x: float, y: float, width: float, length: float):
@@ -20,6 +39,7 @@ def f_range(
     include_start=True,
     include_end=False,
 ):
+    # steps are accumulated, so values drift, scan grid is built from GridAxis instead
     range = []
 
     assert start <= end
@@ -41,6 +61,172 @@ def f_range(
     return range
 
 
+def _lines_ordering(line_order: np.ndarray, no_points_in_line: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns line and point id of every step of serpentine going along lines in 'line_order'.
+    """
+    point_ids = np.tile(np.arange(no_points_in_line), (len(line_order), 1))
+    point_ids[1::2] = point_ids[1::2, ::-1]
+    return np.repeat(line_order, no_points_in_line), point_ids.flatten()
+
+
+def _grid_line_orderings(no_x_points: int, no_y_points: int) -> Iterator[Tuple[str, bool, np.ndarray, bool]]:
+    """
+    Yields name of the ordering, True if its lines are parallel to Y axis, order of lines,
+    and True if first line is traversed from its last point. Every next line is traversed in opposite direction.
+    """
+    for name, major_length, skip_rows in (
+        (Y_MAJOR_SERPENTINE, no_x_points, False),
+        (X_MAJOR_SERPENTINE, no_y_points, False),
+        (Y_MAJOR_ROW_SKIPPING, no_x_points, True),
+        (X_MAJOR_ROW_SKIPPING, no_y_points, True),
+    ):
+        if skip_rows:
+            if major_length < 3:
+                continue
+            line_order = np.concatenate([np.arange(0, major_length, 2), np.arange(1, major_length, 2)[::-1]])
+        else:
+            line_order = np.arange(major_length)
+
+        is_along_y = name in (Y_MAJOR_SERPENTINE, Y_MAJOR_ROW_SKIPPING)
+        for flip_x in (False, True):
+            for flip_y in (False, True):
+                flip_lines, flip_points = (flip_x, flip_y) if is_along_y else (flip_y, flip_x)
+                yield name, is_along_y, major_length - 1 - line_order if flip_lines else line_order, flip_points
+
+
+def grid_orderings(no_x_points: int, no_y_points: int) -> Iterator[Tuple[str, np.ndarray, np.ndarray]]:
+    """
+    **Yields candidate orderings of rectangular grid.**
+
+    Serpentines along Y (column by column) and along X (row by row), and their row skipping variants,
+    visiting every other line on the way forward and the skipped lines on the way back,
+    each of them starting from every corner of the grid.
+
+    Yields
+    -------
+    **Tuple[str, np.ndarray, np.ndarray]**
+        Name of the ordering, x id and y id of every step
+    """
+    for name, is_along_y, line_order, flip_points in _grid_line_orderings(no_x_points, no_y_points):
+        minor_length = no_y_points if is_along_y else no_x_points
+        line_ids, point_ids = _lines_ordering(line_order, minor_length)
+        if flip_points:
+            point_ids = minor_length - 1 - point_ids
+
+        if is_along_y:
+            yield name, line_ids, point_ids
+        else:
+            yield name, point_ids, line_ids
+
+
+def nearest_neighbour_ordering(
+    points: np.ndarray,
+    start_position: Optional[np.ndarray] = None,
+    movement_speed: float = DEFAULT_MOVEMENT_SPEED,
+    motion_model: Optional[MotionModel] = None,
+) -> np.ndarray:
+    """
+    **Orders irregular set of points, greedy nearest neighbour tour improved with 2-opt.**
+
+    Parameters
+    ----------
+    **points : np.ndarray**
+        Points to visit, array of shape (n, 2)
+
+    **start_position : np.ndarray, optional**
+        Position of head before first move, if not given tour starts in the first point
+
+    Returns
+    -------
+    **np.ndarray**
+        Indices of 'points' in order of visiting
+    """
+    no_points = len(points)
+    if no_points == 0:
+        return np.empty(0, dtype=int)
+
+    not_visited = np.ones(no_points, dtype=bool)
+    order = []
+    current_position = points[0] if start_position is None else start_position
+
+    for _ in range(no_points):
+        distances = np.linalg.norm(points - current_position, axis=1)
+        distances[~not_visited] = np.inf
+        closest = int(np.argmin(distances))
+
+        order.append(closest)
+        not_visited[closest] = False
+        current_position = points[closest]
+
+    order = np.array(order, dtype=int)
+    if start_position is None:
+        route = points[order]
+        first_step = 1
+    else:
+        route = np.vstack([start_position, points[order]])
+        first_step = 0
+
+    motion_model = MotionModel() if motion_model is None else motion_model
+
+    def move_time(begin: np.ndarray, end: np.ndarray) -> np.ndarray:
+        return motion_model.predict_moves_time(end - begin, movement_speed)
+
+    # route[0] stays in place, reversing route[i:j + 1] replaces moves (i - 1, i) and (j, j + 1)
+    # with (i - 1, j) and (i, j + 1), last point of route is not followed by any move
+    for _ in range(MAX_NO_2_OPT_PASSES):
+        improved = False
+
+        for i in range(1, len(route) - 1):
+            j = np.arange(i + 1, len(route))
+            has_next = j + 1 < len(route)
+            next_points = route[np.minimum(j + 1, len(route) - 1)]
+
+            old_time = move_time(route[i - 1], route[i]) + np.where(has_next, move_time(route[j], next_points), 0)
+            new_time = move_time(route[i - 1], route[j]) + np.where(has_next, move_time(route[i], next_points), 0)
+
+            gain = old_time - new_time
+            best = int(np.argmax(gain))
+            if gain[best] > 1e-9:
+                route[i : j[best] + 1] = route[i : j[best] + 1][::-1].copy()
+                order[i - 1 + first_step : j[best] + first_step] = order[i - 1 + first_step : j[best] + first_step][
+                    ::-1
+                ].copy()
+                improved = True
+
+        if not improved:
+            break
+
+    return order
+
+
+class VectorSequence(Sequence):
+    """
+    **Read-only sequence of Vectors, backed by array of shape (n, 3).**
+
+    Positions are created on access, so callers indexing and iterating path as list of Vectors keep working,
+    while path itself is stored in contiguous array.
+    """
+
+    def __init__(self, positions: np.ndarray):
+        self.positions = positions
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [Vector(x, y, z) for x, y, z in self.positions[index].tolist()]
+        return Vector(*self.positions[index].tolist())
+
+    def __iter__(self) -> Iterator[Vector]:
+        for x, y, z in self.positions.tolist():
+            yield Vector(x, y, z)
+
+    def to_numpy(self) -> np.ndarray:
+        return self.positions
+
+
 class PrinterPath:
     def __init__(
         self,
@@ -49,6 +235,8 @@ class PrinterPath:
         scanned_area: Square,
         measurement_radius: float,
         printer_bed_size: Vector,
+        movement_speed: float = DEFAULT_MOVEMENT_SPEED,
+        motion_model: Optional[MotionModel] = None,
         **kwargs
     ):
         self.pass_height = pass_height
@@ -56,128 +244,380 @@ class PrinterPath:
         self.scanned_area = scanned_area
         self.measurement_radius = measurement_radius
         self.printer_bed_size = printer_bed_size
-
-        self.antenna_path: Optional[List[Vector]] = None
-        self.extruder_path: Optional[List[Vector]] = None
+        self.movement_speed = movement_speed
+        self.motion_model = MotionModel() if motion_model is None else motion_model
+
+        # antenna and extruder position of every path step, arrays of shape (n, 3),
+        # and the same positions as sequences of Vectors, for callers expecting them
+        self.antenna_positions: np.ndarray = np.empty((0, 3))
+        self.extruder_positions: np.ndarray = np.empty((0, 3))
+        self.antenna_path: VectorSequence = VectorSequence(self.antenna_positions)
+        self.extruder_path: VectorSequence = VectorSequence(self.extruder_positions)
+
+        # measurement grid, its coordinates, and (row, col) position in that grid for every path step
+        self.grid: GridDescriptor = GridDescriptor.empty()
+        self.x_axis: List[float] = []
+        self.y_axis: List[float] = []
+        self.grid_indices: np.ndarray = np.empty((0, 2), dtype=int)
+
+        # min x, max x, min y and max y of antenna and extruder path
+        self.antenna_bounds: Optional[Tuple[float, float, float, float]] = None
+        self.extruder_bounds: Optional[Tuple[float, float, float, float]] = None
+
+        # ordering picked by planner, and predicted time of all moves of the scan
+        self.ordering: Optional[str] = None
+        self.predicted_travel_time_in_seconds: float = 0
+
+        # predicted time of move to every path step, of moves before first step, and of return to origin
+        self.step_move_times: np.ndarray = np.empty(0)
+        self.approach_time_in_seconds: float = 0
+        self.return_time_in_seconds: float = 0
         self.generate_path()
 
-    def generate_path(self):
-        x_measurements_coords = [
-            round(x, 4)
-            for x in f_range(
-                start=self.scanned_area.position_x,
-                end=self.scanned_area.position_x + self.scanned_area.width,
-                step=self.measurement_radius,
-                include_end=True,
-            )
-        ]
-        y_measurements_coords = [
-            round(y, 4)
-            for y in f_range(
-                start=self.scanned_area.position_y,
-                end=self.scanned_area.position_y + self.scanned_area.length,
-                step=self.measurement_radius,
-                include_end=True,
+    @staticmethod
+    def _is_on_printer_bed(antenna_coord, offset: float, bed_size: float):
+        """
+        Works for single coordinate and for array of them.
+        """
+        return (
+            (0 <= antenna_coord)
+            & (antenna_coord <= bed_size)
+            & (0 <= antenna_coord + offset)
+            & (antenna_coord + offset <= bed_size)
+        )
+
+    def _score_orderings(
+        self, extruder_x: np.ndarray, extruder_y: np.ndarray, bounding_box: np.ndarray
+    ) -> Iterator[Tuple[Tuple[float, int], str, bool, np.ndarray, bool, tuple]]:
+        """
+        Predicts travel time of every candidate ordering without building it. Steps within a line are
+        the same move, so only line changes, approach and return are predicted separately.
+        Yields score, the ordering, and times of its approach moves, first step, line changes and return.
+        """
+        origin = np.zeros(2)
+
+        for name, is_along_y, line_order, flip_points in _grid_line_orderings(len(extruder_x), len(extruder_y)):
+            major, minor = (extruder_x, extruder_y) if is_along_y else (extruder_y, extruder_x)
+            no_lines = len(line_order)
+
+            def point(line_id: int, point_id: int) -> np.ndarray:
+                return np.array([major[line_id], minor[point_id]] if is_along_y else [minor[point_id], major[line_id]])
+
+            first_point = point(line_order[0], len(minor) - 1 if flip_points else 0)
+            last_line_is_flipped = flip_points != (no_lines % 2 == 0)
+            last_point = point(line_order[-1], 0 if last_line_is_flipped else len(minor) - 1)
+
+            first_corner = int(np.argmin(np.linalg.norm(bounding_box - first_point, axis=1)))
+            traversal = np.roll(bounding_box, -first_corner, axis=0)
+
+            line_changes = np.zeros((no_lines - 1, 2))
+            line_changes[:, 0 if is_along_y else 1] = np.diff(major[line_order])
+            point_step = np.zeros((1, 2))
+            if len(minor) > 1:
+                point_step[0, 1 if is_along_y else 0] = minor[1] - minor[0]
+
+            move_times = self.motion_model.predict_moves_time(
+                np.vstack(
+                    [
+                        np.diff(np.vstack([origin, traversal, traversal[:1], first_point]), axis=0),
+                        point_step,
+                        line_changes,
+                        (origin - last_point)[np.newaxis, :],
+                    ]
+                ),
+                self.movement_speed,
             )
-        ]
-
-        path = []
-        flip = False
-        for x in x_measurements_coords:
-            flip = not flip
-            if flip:
-                for id in range(0, len(y_measurements_coords), 1):
-                    path.append((x, y_measurements_coords[id]))
-            else:
-                for id in range(len(y_measurements_coords) - 1, -1, -1):
-                    path.append((x, y_measurements_coords[id]))
-
-        self.antenna_path = [
-            Vector(
-                x,
-                y,
-                self.pass_height + self.antenna_offset.z,
+            no_approach_moves = len(bounding_box) + 2
+            point_step_time = move_times[no_approach_moves] if len(minor) > 1 else 0.0
+            line_change_times = move_times[no_approach_moves + 1 : -1]
+
+            travel_time = (
+                float(np.sum(move_times[:no_approach_moves]))
+                + no_lines * (len(minor) - 1) * point_step_time
+                + float(np.sum(line_change_times))
+                + move_times[-1]
             )
-            for x, y in path
-        ]
-
-        self.extruder_path: List[Vector] = [
-            Vector(
-                position.x + self.antenna_offset.x,
-                position.y + self.antenna_offset.y,
-                position.z,
+
+            # head stops in every point, so serpentines along both axes often take the same time,
+            # then the one with fewer turnarounds is picked
+            score = (round(travel_time, 6), no_lines)
+            yield score, name, is_along_y, line_order, flip_points, (
+                move_times[:no_approach_moves],
+                point_step_time,
+                line_change_times,
+                move_times[-1],
             )
-            for position in self.antenna_path
-        ]
-
-        extruder_path_copy = copy(self.extruder_path)
-        antenna_path_copy = copy(self.antenna_path)
-
-        self.extruder_path = []
-        self.antenna_path = []
-
-        for extruder_position, antenna_position in zip(extruder_path_copy, antenna_path_copy):
-            if not (
-                extruder_position.x < 0
-                or extruder_position.x > self.printer_bed_size.x
-                or extruder_position.y < 0
-                or extruder_position.y > self.printer_bed_size.y
-                or antenna_position.x < 0
-                or antenna_position.x > self.printer_bed_size.x
-                or antenna_position.y < 0
-                or antenna_position.y > self.printer_bed_size.y
-            ):
-                self.extruder_path.append(extruder_position)
-                self.antenna_path.append(antenna_position)
-
-    def get_extruder_path(self) -> List[Vector]:
+
+    def _trim_to_printer_bed(self, axis: GridAxis, offset: float, bed_size: float) -> GridAxis:
+        # printer bed is an interval, so points that are left form continuous part of the axis
+        on_printer_bed = np.flatnonzero(self._is_on_printer_bed(axis.coordinates(), offset, bed_size))
+        if len(on_printer_bed) == 0:
+            return axis.subset(0, 0)
+        return axis.subset(on_printer_bed[0], on_printer_bed[-1] + 1)
+
+    def generate_path(self):
+        x_axis = GridAxis.covering(self.scanned_area.position_x, self.scanned_area.width, self.measurement_radius)
+        y_axis = GridAxis.covering(self.scanned_area.position_y, self.scanned_area.length, self.measurement_radius)
+
+        self.grid = GridDescriptor(
+            self._trim_to_printer_bed(x_axis, self.antenna_offset.x, self.printer_bed_size.x),
+            self._trim_to_printer_bed(y_axis, self.antenna_offset.y, self.printer_bed_size.y),
+        )
+
+        self.antenna_positions = np.empty((0, 3))
+        self.extruder_positions = np.empty((0, 3))
+        self.grid_indices = np.empty((0, 2), dtype=int)
+        self.antenna_bounds = self.extruder_bounds = None
+        self.ordering = None
+        self.predicted_travel_time_in_seconds = 0
+        self.step_move_times = np.empty(0)
+        self.approach_time_in_seconds = self.return_time_in_seconds = 0
+
+        if self.grid.is_empty:
+            self.grid = GridDescriptor.empty()
+
+        x_axis = self.grid.x.coordinates()
+        y_axis = self.grid.y.coordinates()
+        self.x_axis = x_axis.tolist()
+        self.y_axis = y_axis.tolist()
+
+        if self.grid.is_empty:
+            self.antenna_path = VectorSequence(self.antenna_positions)
+            self.extruder_path = VectorSequence(self.extruder_positions)
+            return
+
+        extruder_x = x_axis + self.antenna_offset.x
+        extruder_y = y_axis + self.antenna_offset.y
+        self.antenna_bounds = (float(x_axis[0]), float(x_axis[-1]), float(y_axis[0]), float(y_axis[-1]))
+        self.extruder_bounds = (
+            float(extruder_x[0]),
+            float(extruder_x[-1]),
+            float(extruder_y[0]),
+            float(extruder_y[-1]),
+        )
+
+        # scan starts and ends in printer origin, extruder bounding box is traversed
+        # from the corner where path begins
+        bounding_box = np.array(
+            [
+                (extruder_x[0], extruder_y[0]),
+                (extruder_x[0], extruder_y[-1]),
+                (extruder_x[-1], extruder_y[-1]),
+                (extruder_x[-1], extruder_y[0]),
+            ]
+        )
+
+        best = None
+        for candidate in self._score_orderings(extruder_x, extruder_y, bounding_box):
+            if best is None or candidate[0] < best[0]:
+                best = candidate
+
+        _, self.ordering, is_along_y, line_order, flip_points, move_times = best
+        approach_move_times, point_step_time, line_change_times, return_time = move_times
+
+        minor_length = len(y_axis) if is_along_y else len(x_axis)
+        line_ids, point_ids = _lines_ordering(line_order, minor_length)
+        if flip_points:
+            point_ids = minor_length - 1 - point_ids
+        x_ids, y_ids = (line_ids, point_ids) if is_along_y else (point_ids, line_ids)
+
+        # origin -> bounding box corners -> back to first corner, then moves to path steps and return
+        self.approach_time_in_seconds = float(np.sum(approach_move_times[:-1]))
+        self.step_move_times = np.full(len(x_ids), point_step_time)
+        self.step_move_times[0] = approach_move_times[-1]
+        self.step_move_times[minor_length::minor_length] = line_change_times
+        self.return_time_in_seconds = float(return_time)
+        self.predicted_travel_time_in_seconds = (
+            self.approach_time_in_seconds + float(np.sum(self.step_move_times)) + self.return_time_in_seconds
+        )
+
+        self.antenna_positions = np.column_stack(
+            [x_axis[x_ids], y_axis[y_ids], np.full(len(x_ids), self.pass_height + self.antenna_offset.z, dtype=float)]
+        )
+        self.extruder_positions = self.antenna_positions + np.array(
+            [self.antenna_offset.x, self.antenna_offset.y, 0], dtype=float
+        )
+        self.grid_indices = np.column_stack([y_ids, x_ids])
+
+        self.antenna_path = VectorSequence(self.antenna_positions)
+        self.extruder_path = VectorSequence(self.extruder_positions)
+
+    def order_steps(self, steps: List[int], start_position: Optional[Vector] = None) -> Tuple[List[int], str]:
+        """
+        **Orders subset of path steps, measured in a single pass.**
+
+        Steps are visited either in order of the scan path, or in nearest neighbour + 2-opt order,
+        whichever is predicted to be faster. The latter pays off for irregular subsets of the grid.
+
+        Parameters
+        ----------
+        **steps : List[int]**
+            Path steps to measure
+
+        **start_position : Vector, optional**
+            Position of extruder before first move
+
+        Returns
+        -------
+        **Tuple[List[int], str]**
+            Steps in order of measurement, and name of picked ordering
+        """
+        steps = sorted(steps)
+        if len(steps) < 3:
+            return steps, SCAN_PATH_ORDER
+
+        points = self.extruder_positions[steps, :2]
+        start = None if start_position is None else np.array([start_position.x, start_position.y], dtype=float)
+
+        def travel_time(ordered_points: np.ndarray) -> float:
+            return self.motion_model.predict_travel_time(ordered_points, self.movement_speed, start)
+
+        order = nearest_neighbour_ordering(points, start, self.movement_speed, self.motion_model)
+
+        if travel_time(points[order]) < travel_time(points):
+            return [steps[i] for i in order], NEAREST_NEIGHBOUR_2_OPT
+        return steps, SCAN_PATH_ORDER
+
+    def get_extruder_path(self) -> VectorSequence:
         return self.extruder_path
 
-    def get_antenna_path(self) -> List[Vector]:
+    def get_antenna_path(self) -> VectorSequence:
         return self.antenna_path
 
     @property
     def no_measurements(self) -> int:
-        return len(self.antenna_path)
+        return len(self.antenna_positions)
 
     def get_antenna_bounding_box(self) -> List[Tuple[float, float]]:
-        max_x = np.max([point.x for point in self.antenna_path])
-        max_y = np.max([point.y for point in self.antenna_path])
-
-        min_x = np.min([point.x for point in self.antenna_path])
-        min_y = np.min([point.y for point in self.antenna_path])
+        min_x, max_x, min_y, max_y = self.antenna_bounds
 
         x_antenna_bounding_box = (min_x, min_x, max_x, max_x, min_x)
         y_antenna_bounding_box = (min_y, max_y, max_y, min_y, min_y)
         return [(x, y) for x, y in zip(x_antenna_bounding_box, y_antenna_bounding_box)]
 
     def get_antenna_min_x_val(self):
-        return np.min([point.x for point in self.antenna_path])
+        return self.antenna_bounds[0]
 
     def get_antenna_max_x_val(self):
-        return np.max([point.x for point in self.antenna_path])
+        return self.antenna_bounds[1]
 
     def get_antenna_min_y_val(self):
-        return np.min([point.y for point in self.antenna_path])
+        return self.antenna_bounds[2]
 
     def get_antenna_max_y_val(self):
-        return np.max([point.y for point in self.antenna_path])
+        return self.antenna_bounds[3]
 
     def get_extruder_bounding_box(self) -> List[Tuple[float, float]]:
-        max_x = np.max([point.x for point in self.extruder_path])
-        max_y = np.max([point.y for point in self.extruder_path])
+        """
+        Closed loop around extruder path, starting in the corner where path begins.
+        """
+        min_x, max_x, min_y, max_y = self.extruder_bounds
 
-        min_x = np.min([point.x for point in self.extruder_path])
-        min_y = np.min([point.y for point in self.extruder_path])
+        corners = [(min_x, min_y), (min_x, max_y), (max_x, max_y), (max_x, min_y)]
+        first_x, first_y = self.extruder_positions[0, :2]
+        first_corner = int(np.argmin([abs(x - first_x) + abs(y - first_y) for x, y in corners]))
 
-        x_extruder_bounding_box = (min_x, min_x, max_x, max_x, min_x)
-        y_extruder_bounding_box = (min_y, max_y, max_y, min_y, min_y)
-        return [(x, y) for x, y in zip(x_extruder_bounding_box, y_extruder_bounding_box)]
+        corners = corners[first_corner:] + corners[:first_corner]
+        return corners + corners[:1]
 
-    def get_no_scan_points(self) -> int:
-        return len(self.extruder_path)
+    def get_grid_indices(self) -> np.ndarray:
+        return self.grid_indices
 
-    def total_scan_time_in_seconds(self) -> int:
-        # TODO this one should be calculated by printer handle,
-        #   and Spectrum analyzer device
-        return len(self.extruder_path) * 4 + 60
+    def get_no_scan_points(self) -> int:
+        return len(self.extruder_positions)
+
+    def predict_scan_time(
+        self, measurement_time_in_seconds: float = DEFAULT_MEASUREMENT_TIME_IN_SECONDS, no_measured_points: int = 0
+    ) -> float:
+        """
+        **Predicts time of the scan, left after 'no_measured_points' first path steps are measured.**
+
+        Scan consists of homing, travel around bounding box, move to and measurement in every point,
+        and return to origin. Measurement time is the analyzer dwell, during which head stands still.
+
+        Parameters
+        ----------
+        **measurement_time_in_seconds : float, optional**
+            Analyzer dwell in every point, **by default DEFAULT_MEASUREMENT_TIME_IN_SECONDS**
+
+        **no_measured_points : int, optional**
+            Number of path steps already measured, **by default 0**
+
+        Returns
+        -------
+        **float**
+            Time in seconds
+        """
+        steps_left = self.step_move_times[no_measured_points:]
+        scan_time = np.sum(steps_left) + len(steps_left) * measurement_time_in_seconds + self.return_time_in_seconds
+
+        if no_measured_points == 0:
+            scan_time += self.motion_model.homing_time_in_seconds + self.approach_time_in_seconds
+
+        return float(scan_time)
+
+    def predict_continuous_scan_time(
+        self, sample_period_in_seconds: float = DEFAULT_MEASUREMENT_TIME_IN_SECONDS
+    ) -> float:
+        """
+        **Predicts time of continuous scan, in which head sweeps every row of the grid without stopping.**
+
+        Rows are parallel to X axis and scanned in serpentine. Row moves are as fast as possible,
+        while analyzer still takes at least one sample per grid point.
+
+        Parameters
+        ----------
+        **sample_period_in_seconds : float, optional**
+            Time of single analyzer reading, **by default DEFAULT_MEASUREMENT_TIME_IN_SECONDS**
+
+        Returns
+        -------
+        **float**
+            Time in seconds
+        """
+        if len(self.x_axis) == 0 or len(self.y_axis) == 0:
+            return 0.0
+
+        x = np.array(self.x_axis) + self.antenna_offset.x
+        y = np.array(self.y_axis) + self.antenna_offset.y
+        is_reversed = np.arange(len(y)) % 2 == 1
+
+        starts = np.column_stack([np.where(is_reversed, x[-1], x[0]), y])
+        ends = np.column_stack([np.where(is_reversed, x[0], x[-1]), y])
+
+        point_spacing = float(np.min(np.diff(x))) if len(x) > 1 else 0
+        feedrate = row_feedrate(point_spacing, sample_period_in_seconds, self.movement_speed)
+
+        row_time = np.sum(self.motion_model.predict_moves_time(ends - starts, feedrate))
+        travel_time = np.sum(self.motion_model.predict_moves_time(starts[1:] - ends[:-1], self.movement_speed))
+
+        return float(
+            self.motion_model.homing_time_in_seconds
+            + self.approach_time_in_seconds
+            + travel_time
+            + row_time
+            + len(y) * sample_period_in_seconds
+            + self.motion_model.predict_move_time(ends[-1], (0, 0), self.movement_speed)
+        )
+
+    def get_scan_time_breakdown(
+        self, measurement_time_in_seconds: float = DEFAULT_MEASUREMENT_TIME_IN_SECONDS
+    ) -> Dict[str, float]:
+        """
+        Predicted time of homing, travel and measurements, used in dry run.
+        """
+        homing = self.motion_model.homing_time_in_seconds
+        travel = self.predicted_travel_time_in_seconds
+        measurement = self.get_no_scan_points() * measurement_time_in_seconds
+
+        return {
+            "homing": homing,
+            "travel": travel,
+            "measurement": measurement,
+            "total": homing + travel + measurement,
+        }
+
+    def total_scan_time_in_seconds(
+        self, measurement_time_in_seconds: float = DEFAULT_MEASUREMENT_TIME_IN_SECONDS
+    ) -> int:
+        return int(self.predict_scan_time(measurement_time_in_seconds))
@@ -0,0 +1,148 @@
+# writing of project directory, without Qt, so projects can be written by scans run from command line
+import concurrent.futures
+import json
+import multiprocessing
+import os
+import shutil
+from typing import Callable, List
+
+import numpy as np
+
+from functionalities.GridDescriptor import GridDescriptor
+from functionalities.MdmaFile import write_mdma_file
+from functionalities.Measurement import Measurement
+from plot_widgets.figure_rendering import FigureJob
+
+# figures are saved in parallel, every one in separate process. Processes are started from scratch,
+# so they don't inherit Qt state of the application, and render with Agg backend only
+MAX_NO_RENDERING_PROCESSES = 4
+# how often running export checks if it was cancelled, while waiting for figures
+CANCEL_CHECK_INTERVAL_IN_S = 0.1
+
+
+class ProjectSnapshot:
+    """
+    Everything that is written to the project directory, copied from the application when export starts,
+    so the scan and plots can change while project is written.
+    """
+
+    def __init__(
+        self,
+        directory_path: str,
+        values: np.ndarray,
+        grid: GridDescriptor,
+        config: dict,
+        figure_jobs: List[FigureJob],
+        with_csv: bool = False,
+    ):
+        self.directory_path = directory_path
+        self.values = values
+        self.grid = grid
+        self.config = config
+        self.figure_jobs = figure_jobs
+        self.with_csv = with_csv
+
+    @property
+    def no_steps(self) -> int:
+        # data file, config file and every figure
+        return 2 + len(self.figure_jobs)
+
+
+def write_project(
+    snapshot: ProjectSnapshot,
+    on_progress: Callable[[int, int], None],
+    is_cancelled: Callable[[], bool],
+    max_no_processes: int = MAX_NO_RENDERING_PROCESSES,
+) -> bool:
+    """
+    **Writes project directory: data file, config file and figures.**
+
+    Figures are rendered in process pool while data is written.
+    When export is cancelled or fails, project directory is removed.
+
+    Parameters
+    ----------
+    **snapshot : ProjectSnapshot**
+        Content of the project
+
+    **on_progress : Callable[[int, int], None]**
+        Called with number of finished steps and number of all steps, after every step
+
+    **is_cancelled : Callable[[], bool]**
+        Checked between steps, export is stopped when it returns True
+
+    **max_no_processes : int, optional**
+        Maximal number of figures rendered at once, **by default MAX_NO_RENDERING_PROCESSES**
+
+    Returns
+    -------
+    **bool**
+        True if whole project was written, False if export was cancelled
+    """
+    os.mkdir(snapshot.directory_path)
+
+    executor = None
+    try:
+        figures = []
+        if len(snapshot.figure_jobs) > 0:
+            executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=min(max_no_processes, len(snapshot.figure_jobs)),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            figures = [executor.submit(job.run) for job in snapshot.figure_jobs]
+
+        no_finished_steps = 0
+
+        def finish_step() -> bool:
+            nonlocal no_finished_steps
+            no_finished_steps += 1
+            on_progress(no_finished_steps, snapshot.no_steps)
+            return not is_cancelled()
+
+        write_mdma_file(
+            os.path.join(snapshot.directory_path, "data.mdma"),
+            snapshot.values,
+            snapshot.grid,
+            {"config": snapshot.config},
+        )
+        if snapshot.with_csv:
+            Measurement.from_numpy(snapshot.values, snapshot.grid).to_pd_dataframe().to_csv(
+                os.path.join(snapshot.directory_path, "data.csv")
+            )
+        if not finish_step():
+            return _cancel_export(snapshot, executor)
+
+        with open(os.path.join(snapshot.directory_path, "config.json"), "w") as outfile:
+            json.dump(snapshot.config, outfile)
+        if not finish_step():
+            return _cancel_export(snapshot, executor)
+
+        while len(figures) > 0:
+            done, figures = concurrent.futures.wait(
+                figures, timeout=CANCEL_CHECK_INTERVAL_IN_S, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for figure in done:
+                # rendering error is raised here
+                figure.result()
+                if not finish_step():
+                    return _cancel_export(snapshot, executor)
+
+            if is_cancelled():
+                return _cancel_export(snapshot, executor)
+
+    except BaseException:
+        _cancel_export(snapshot, executor)
+        raise
+
+    if executor is not None:
+        executor.shutdown()
+    return True
+
+
+def _cancel_export(snapshot: ProjectSnapshot, executor) -> bool:
+    if executor is not None:
+        # figures that are already rendered are finished, so nothing is written to the directory after it's removed
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    shutil.rmtree(snapshot.directory_path, ignore_errors=True)
+    return False
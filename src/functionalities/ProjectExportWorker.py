@@ -0,0 +1,33 @@
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from functionalities.ProjectExport import ProjectSnapshot, write_project
+
+
+class ProjectExportWorker(QObject):
+    # True if project was written, False if export was cancelled or failed
+    finished: pyqtSignal = pyqtSignal(bool)
+    # number of finished steps and number of all steps
+    progress: pyqtSignal = pyqtSignal(int, int)
+    stop_thread: bool = True
+
+    def __init__(self):
+        super().__init__()
+        self.snapshot = None
+
+    def init(self, snapshot: ProjectSnapshot):
+        self.snapshot = snapshot
+        self.stop_thread = False
+
+    def stop_thread_execution(self):
+        self.stop_thread = True
+        print("cancelling export")
+
+    def run(self):
+        try:
+            is_written = write_project(self.snapshot, self.progress.emit, lambda: self.stop_thread)
+        except Exception as ex:
+            print(f"export failed: {str(ex)}")
+            is_written = False
+
+        self.snapshot = None
+        self.finished.emit(is_written)
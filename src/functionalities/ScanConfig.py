@@ -0,0 +1,222 @@
+import copy
+import json
+from typing import Optional
+
+from vector3d.vector import Vector
+
+from functionalities.config_keys import (
+    ADAPTIVE_REFINEMENT_SCAN,
+    ANTENNA_X_OFFSET_IN_MM,
+    ANTENNA_Y_OFFSET_IN_MM,
+    CONTINUOUS_SCAN,
+    FREQUENCY_IN_HZ,
+    GENERAL_SETTINGS,
+    HAMEG_HMS_3010,
+    MAX_LEVEL_IN_DBM,
+    MAX_LEVEL_RETRIES,
+    MEASUREMENT_MODE,
+    MEASUREMENT_RADIUS_IN_MM,
+    MEASUREMENT_TIME,
+    MIN_LEVEL_IN_DBM,
+    MOVEMENT_SPEED,
+    POCKET_VNA,
+    POINT_BUDGET_IN_PERCENTAGES,
+    PRINTER_CONTROLLER,
+    PRINTER_LENGTH_IN_MM,
+    PRINTER_WIDTH_IN_MM,
+    REFINEMENT_THRESHOLD,
+    SAMPLE_LENGTH_IN_MM,
+    SAMPLE_WIDTH_IN_MM,
+    SAMPLE_X_POSITION_IN_MM,
+    SAMPLE_Y_POSITION_IN_MM,
+    SCAN_HEIGHT_IN_MM,
+    SCAN_MODE,
+    SCAN_PATH_SETTINGS,
+    SINGLE_PASS_SCAN,
+    SPECTRUM_ANALYZER_CONTROLLER,
+)
+from functionalities.Measurement import Measurement
+from functionalities.PrinterPath import Square
+from printer_device.MotionModel import MotionModel
+from spectrum_analyzer_device.hameg3010.LevelRetryPolicy import (
+    DEFAULT_MAX_RETRIES,
+    LevelRetryPolicy,
+)
+
+# height of printer bed space, the same for every supported printer
+PRINTER_HEIGHT_IN_MM = 210
+
+
+class ScanConfig:
+    """
+    **Everything scan engine needs to know about the scan.**
+
+    Read from config dict in format of exported config.json (and of scan journal),
+    settings that only GUI uses are kept, so config written back is complete.
+    """
+
+    def __init__(
+        self,
+        scan_mode: str = HAMEG_HMS_3010,
+        frequency_in_hz: int = 1_000_000_000,
+        measurement_time: float = 1,
+        min_level_in_dbm: Optional[float] = None,
+        max_level_in_dbm: Optional[float] = None,
+        max_level_retries: int = DEFAULT_MAX_RETRIES,
+        movement_speed: float = 1000,
+        printer_width_in_mm: float = 200,
+        printer_length_in_mm: float = 200,
+        sample_x_position_in_mm: float = 0,
+        sample_y_position_in_mm: float = 0,
+        sample_width_in_mm: float = 0,
+        sample_length_in_mm: float = 0,
+        antenna_x_offset_in_mm: float = 0,
+        antenna_y_offset_in_mm: float = 0,
+        scan_height_in_mm: float = 4,
+        measurement_radius_in_mm: float = 3,
+        measurement_mode: str = SINGLE_PASS_SCAN,
+        point_budget_in_percentages: int = 100,
+        refinement_threshold: float = 0,
+        config_dict: Optional[dict] = None,
+    ):
+        if scan_mode not in (HAMEG_HMS_3010, POCKET_VNA):
+            raise ValueError(f"scan mode should be one of: [{HAMEG_HMS_3010}, {POCKET_VNA}], not:'{scan_mode}'")
+        if measurement_mode not in (SINGLE_PASS_SCAN, ADAPTIVE_REFINEMENT_SCAN, CONTINUOUS_SCAN):
+            raise ValueError(f"measurement mode '{measurement_mode}' is not supported")
+
+        self.scan_mode = scan_mode
+        self.frequency_in_hz = frequency_in_hz
+        self.measurement_time = measurement_time
+        self.min_level_in_dbm = min_level_in_dbm
+        self.max_level_in_dbm = max_level_in_dbm
+        self.max_level_retries = max_level_retries
+        self.movement_speed = movement_speed
+        self.printer_width_in_mm = printer_width_in_mm
+        self.printer_length_in_mm = printer_length_in_mm
+        self.sample_x_position_in_mm = sample_x_position_in_mm
+        self.sample_y_position_in_mm = sample_y_position_in_mm
+        self.sample_width_in_mm = sample_width_in_mm
+        self.sample_length_in_mm = sample_length_in_mm
+        self.antenna_x_offset_in_mm = antenna_x_offset_in_mm
+        self.antenna_y_offset_in_mm = antenna_y_offset_in_mm
+        self.scan_height_in_mm = scan_height_in_mm
+        self.measurement_radius_in_mm = measurement_radius_in_mm
+        self.measurement_mode = measurement_mode
+        self.point_budget_in_percentages = point_budget_in_percentages
+        # adaptive scan does not refine cells whose measured values differ by less than this
+        self.refinement_threshold = refinement_threshold
+
+        # settings not used by the engine, like connection state displayed by GUI
+        self._config_dict = {} if config_dict is None else copy.deepcopy(config_dict)
+
+    @staticmethod
+    def from_config_dict(config_dict: dict) -> "ScanConfig":
+        """
+        Config from dict in format of exported config.json, missing settings raise ValueError.
+        """
+        try:
+            analyzer = config_dict[SPECTRUM_ANALYZER_CONTROLLER]
+            printer = config_dict[PRINTER_CONTROLLER]
+            scan_path = config_dict[SCAN_PATH_SETTINGS]
+            general = config_dict.get(GENERAL_SETTINGS, {})
+
+            return ScanConfig(
+                scan_mode=analyzer[SCAN_MODE],
+                frequency_in_hz=analyzer[FREQUENCY_IN_HZ],
+                measurement_time=analyzer[MEASUREMENT_TIME],
+                min_level_in_dbm=analyzer.get(MIN_LEVEL_IN_DBM),
+                max_level_in_dbm=analyzer.get(MAX_LEVEL_IN_DBM),
+                max_level_retries=analyzer.get(MAX_LEVEL_RETRIES, DEFAULT_MAX_RETRIES),
+                movement_speed=printer[MOVEMENT_SPEED],
+                printer_width_in_mm=printer[PRINTER_WIDTH_IN_MM],
+                printer_length_in_mm=printer[PRINTER_LENGTH_IN_MM],
+                sample_x_position_in_mm=scan_path[SAMPLE_X_POSITION_IN_MM],
+                sample_y_position_in_mm=scan_path[SAMPLE_Y_POSITION_IN_MM],
+                sample_width_in_mm=scan_path[SAMPLE_WIDTH_IN_MM],
+                sample_length_in_mm=scan_path[SAMPLE_LENGTH_IN_MM],
+                antenna_x_offset_in_mm=scan_path[ANTENNA_X_OFFSET_IN_MM],
+                antenna_y_offset_in_mm=scan_path[ANTENNA_Y_OFFSET_IN_MM],
+                scan_height_in_mm=scan_path[SCAN_HEIGHT_IN_MM],
+                measurement_radius_in_mm=scan_path[MEASUREMENT_RADIUS_IN_MM],
+                measurement_mode=general.get(MEASUREMENT_MODE, SINGLE_PASS_SCAN),
+                point_budget_in_percentages=general.get(POINT_BUDGET_IN_PERCENTAGES, 100),
+                refinement_threshold=general.get(REFINEMENT_THRESHOLD, 0),
+                config_dict=config_dict,
+            )
+        except KeyError as ex:
+            raise ValueError(f"scan config is missing setting: {str(ex)}")
+
+    @staticmethod
+    def from_file(path: str) -> "ScanConfig":
+        with open(path, "r") as config_file:
+            return ScanConfig.from_config_dict(json.load(config_file))
+
+    def to_config_dict(self) -> dict:
+        """
+        Config in format of exported config.json, it can be loaded by GUI.
+        """
+        config_dict = copy.deepcopy(self._config_dict)
+        config_dict.setdefault(SPECTRUM_ANALYZER_CONTROLLER, {}).update(
+            {
+                SCAN_MODE: self.scan_mode,
+                FREQUENCY_IN_HZ: self.frequency_in_hz,
+                MEASUREMENT_TIME: self.measurement_time,
+                MIN_LEVEL_IN_DBM: self.min_level_in_dbm,
+                MAX_LEVEL_IN_DBM: self.max_level_in_dbm,
+                MAX_LEVEL_RETRIES: self.max_level_retries,
+            }
+        )
+        config_dict.setdefault(PRINTER_CONTROLLER, {}).update(
+            {
+                MOVEMENT_SPEED: self.movement_speed,
+                PRINTER_WIDTH_IN_MM: self.printer_width_in_mm,
+                PRINTER_LENGTH_IN_MM: self.printer_length_in_mm,
+            }
+        )
+        config_dict.setdefault(SCAN_PATH_SETTINGS, {}).update(
+            {
+                SAMPLE_X_POSITION_IN_MM: self.sample_x_position_in_mm,
+                SAMPLE_Y_POSITION_IN_MM: self.sample_y_position_in_mm,
+                SAMPLE_WIDTH_IN_MM: self.sample_width_in_mm,
+                SAMPLE_LENGTH_IN_MM: self.sample_length_in_mm,
+                ANTENNA_X_OFFSET_IN_MM: self.antenna_x_offset_in_mm,
+                ANTENNA_Y_OFFSET_IN_MM: self.antenna_y_offset_in_mm,
+                SCAN_HEIGHT_IN_MM: self.scan_height_in_mm,
+                MEASUREMENT_RADIUS_IN_MM: self.measurement_radius_in_mm,
+            }
+        )
+        config_dict.setdefault(GENERAL_SETTINGS, {}).update(
+            {
+                MEASUREMENT_MODE: self.measurement_mode,
+                POINT_BUDGET_IN_PERCENTAGES: self.point_budget_in_percentages,
+                REFINEMENT_THRESHOLD: self.refinement_threshold,
+            }
+        )
+        return config_dict
+
+    def create_level_retry_policy(self) -> LevelRetryPolicy:
+        """
+        Retry of hameg level readouts, levels outside of the window set in config are measured again.
+        """
+        return LevelRetryPolicy(self.min_level_in_dbm, self.max_level_in_dbm, self.max_level_retries)
+
+    def create_measurement(self, motion_model: Optional[MotionModel] = None) -> Measurement:
+        """
+        Empty measurement on the scan path of this config.
+        """
+        return Measurement(
+            pass_height=self.scan_height_in_mm,
+            antenna_offset=Vector(self.antenna_x_offset_in_mm, self.antenna_y_offset_in_mm, 0),
+            scanned_area=Square(
+                self.sample_x_position_in_mm,
+                self.sample_y_position_in_mm,
+                self.sample_width_in_mm,
+                self.sample_length_in_mm,
+            ),
+            measurement_radius=self.measurement_radius_in_mm,
+            printer_bed_size=Vector(self.printer_width_in_mm, self.printer_length_in_mm, PRINTER_HEIGHT_IN_MM),
+            movement_speed=self.movement_speed,
+            motion_model=motion_model,
+            # pocket vna measures complex S parameters, hameg measures signal level
+            dtype=complex if self.scan_mode == POCKET_VNA else float,
+        )
@@ -0,0 +1,326 @@
+import logging
+from typing import Callable, Iterator, List, Optional
+
+import numpy as np
+
+from functionalities.AdaptiveRefinement import (
+    DEFAULT_COARSE_STEP,
+    coarse_pass_steps,
+    planned_no_points,
+    refinement_pass_steps,
+)
+from functionalities.config_keys import ADAPTIVE_REFINEMENT_SCAN, CONTINUOUS_SCAN
+from functionalities.ContinuousScanner import ContinuousScanner
+from functionalities.LiveResultFile import LiveResultWriter
+from functionalities.MeasurementScheduler import MeasurementScheduler
+from functionalities.ScanConfig import ScanConfig
+from functionalities.ScanJournal import ScanJournal, compute_path_hash
+from printer_device.PrinterDevice import PrinterDevice
+
+
+class ScanEngine:
+    """
+    **Runs scan on connected devices, without Qt.**
+
+    Scan is configured by ScanConfig, results are reported by callbacks, called from the thread that runs the scan.
+    The same engine is driven by the GUI measurement worker and by the command line scan.
+
+    Parameters
+    ----------
+    **config : ScanConfig**
+        Settings of the scan
+
+    **printer_handle : PrinterDevice**
+        Connected printer
+
+    **analyzer_handle**
+        Connected spectrum analyzer or vna
+
+    **journal : ScanJournal, optional**
+        Journal of the scan, used to resume it, **by default journal in DEFAULT_JOURNAL_PATH**
+
+    **live_result_path : str, optional**
+        File with values of running scan, readable by other processes, **by default DEFAULT_LIVE_RESULT_PATH**
+
+    **on_progress : Callable[[int], None], optional**
+        Called with number of measured points, after every measurement
+
+    **on_measurement : Callable[[int, Any], None], optional**
+        Called with index of path step and value measured in it
+    """
+
+    def __init__(
+        self,
+        config: ScanConfig,
+        printer_handle: PrinterDevice,
+        analyzer_handle,
+        journal: Optional[ScanJournal] = None,
+        live_result_path: Optional[str] = None,
+        on_progress: Optional[Callable[[int], None]] = None,
+        on_measurement: Optional[Callable[[int, object], None]] = None,
+    ):
+        self.config = config
+        self.printer_handle = printer_handle
+        self.analyzer_handle = analyzer_handle
+        self.journal = ScanJournal() if journal is None else journal
+        self.live_result_path = live_result_path
+        self.live_result: Optional[LiveResultWriter] = None
+        self.on_progress = on_progress
+        self.on_measurement = on_measurement
+
+        self.measurement_data = config.create_measurement(printer_handle.motion_model)
+        self.no_measured_points = 0
+        self.is_resumed_scan = False
+        # printer was homed by previous scan, and was not disconnected since
+        self.is_printer_homed = False
+        self.is_scan_complete = False
+        self.is_stop_requested = False
+
+    def prepare(self, resume_from_journal: bool = False, is_printer_homed: bool = False) -> None:
+        """
+        Starts scan journal and live result file, resumed scan is filled with points read from the journal.
+        """
+        logging.debug(
+            f"scan area: {self.measurement_data.x_axis_length} x {self.measurement_data.y_axis_length} points"
+        )
+
+        if self.measurement_data.printer_path.no_measurements == 0:
+            raise ValueError("Scan path has no measurement points")
+
+        if self.config.measurement_mode == ADAPTIVE_REFINEMENT_SCAN:
+            # until refined, points of coarse pass represent whole area around them
+            for index in coarse_pass_steps(self.measurement_data):
+                self.measurement_data.footprints[index] = DEFAULT_COARSE_STEP
+
+        path_hash = compute_path_hash(self.measurement_data.printer_path)
+        self.is_resumed_scan = resume_from_journal
+        self.is_printer_homed = is_printer_homed
+        self.is_scan_complete = False
+
+        if resume_from_journal:
+            journal_content = ScanJournal.read(self.journal.path)
+
+            if journal_content.path_hash != path_hash:
+                raise ValueError("Scan path is different from the one saved in scan journal")
+
+            for index, value in journal_content.points.items():
+                self.measurement_data.add_measurement_by_index(index, value)
+
+            self.journal.reopen()
+        else:
+            self.journal.start(self.config.to_config_dict(), path_hash)
+
+        self.live_result = LiveResultWriter(
+            self.measurement_data.grid,
+            self.measurement_data.to_numpy().dtype,
+            {"config": self.config.to_config_dict(), "path_hash": path_hash},
+            self.live_result_path,
+        )
+        for row, col in zip(*np.nonzero(~np.isnan(self.measurement_data.to_numpy()))):
+            self.live_result.set_value(row, col, self.measurement_data.to_numpy()[row, col])
+
+        self.is_stop_requested = False
+
+    def stop(self) -> None:
+        """
+        Stops running scan after current measurement, can be called from any thread.
+        """
+        self.is_stop_requested = True
+
+    def run(self) -> bool:
+        """
+        **Main measurement loop.**
+
+        Returns
+        -------
+        **bool**
+            True if every point was measured, False if scan was stopped or lost connection with printer
+        """
+        if self.is_stop_requested:
+            return self.finish(is_scan_complete=False)
+
+        self.no_measured_points = int(np.count_nonzero(~np.isnan(self.measurement_data.to_numpy())))
+        self._report_progress()
+
+        # printer that was not restarted since scan was stopped (or since previous scan of the queue)
+        # keeps its position, otherwise it has to be homed to know where extruder is
+        current_position = self.printer_handle.get_current_position()
+        is_position_known = None not in (current_position.x, current_position.y, current_position.z)
+        if not self.is_resumed_scan or not is_position_known:
+            if not self.move_to_start_position(is_homing_needed=not (self.is_printer_homed and is_position_known)):
+                return self.finish(is_scan_complete=False)
+
+        if self.config.measurement_mode == CONTINUOUS_SCAN:
+            if not self.run_continuous_scan():
+                return self.finish(is_scan_complete=False)
+        else:
+            for pass_steps in self.measurement_passes():
+                if len(pass_steps) > 0:
+                    logging.debug(f"first missing path index: {pass_steps[0]}")
+
+                if not self.run_measurement_loop(pass_steps):
+                    return self.finish(is_scan_complete=False)
+
+        self.printer_handle.send_and_await(f"G1 X0 Y0 Z{self.config.scan_height_in_mm} F{self.config.movement_speed}")
+
+        return self.finish(is_scan_complete=True)
+
+    def move_to_start_position(self, is_homing_needed: bool = True) -> bool:
+        if is_homing_needed:
+            self.printer_handle.send_and_await("G28")
+
+        if self.is_stop_requested:
+            return False
+
+        # travel moves are sent in a single batch, so printers able to queue them move without stopping
+        self.printer_handle.send_batch_and_await(
+            [
+                f"G1 X{x} Y{y} Z{self.config.scan_height_in_mm + 5} F{self.config.movement_speed}"
+                for x, y in [(0, 0)] + self.measurement_data.printer_path.get_extruder_bounding_box()
+            ]
+        )
+        return True
+
+    def measurement_passes(self) -> Iterator[List[int]]:
+        """
+        Yields path steps measured in consecutive passes, steps measured before (in resumed scan) are skipped.
+        Next pass is planned only after previous one is measured.
+        """
+        if self.config.measurement_mode == ADAPTIVE_REFINEMENT_SCAN:
+            yield self.order_pass_steps(
+                [
+                    index
+                    for index in coarse_pass_steps(self.measurement_data)
+                    if not self.measurement_data.is_measured(index)
+                ]
+            )
+
+            point_budget = planned_no_points(
+                self.measurement_data.printer_path, self.config.point_budget_in_percentages
+            )
+            yield self.order_pass_steps(
+                refinement_pass_steps(
+                    self.measurement_data,
+                    point_budget - self.no_measured_points,
+                    threshold=self.config.refinement_threshold,
+                )
+            )
+
+        else:
+            yield [
+                index
+                for index in range(self.measurement_data.printer_path.no_measurements)
+                if not self.measurement_data.is_measured(index)
+            ]
+
+    def order_pass_steps(self, pass_steps: List[int]) -> List[int]:
+        """
+        Orders irregular subset of path steps, starting from current extruder position.
+        """
+        current_position = self.printer_handle.get_current_position()
+        if None in (current_position.x, current_position.y):
+            current_position = None
+
+        ordered_steps, ordering = self.measurement_data.printer_path.order_steps(pass_steps, current_position)
+        logging.info(f"pass of {len(ordered_steps)} points ordered by: {ordering}")
+        return ordered_steps
+
+    def run_measurement_loop(self, pass_steps: List[int]) -> bool:
+        extruder_path = self.measurement_data.printer_path.get_extruder_path()
+
+        move_commands = [
+            f"G1 X{extruder_path[index].x} "
+            f"Y{extruder_path[index].y} "
+            f"Z{self.config.scan_height_in_mm} "
+            f"F{self.config.movement_speed}"
+            for index in pass_steps
+        ]
+
+        def post_measurement(no_pass_step: int, measurement):
+            self.post_measurement(pass_steps[no_pass_step], measurement)
+
+        scheduler = MeasurementScheduler(
+            printer_handle=self.printer_handle,
+            analyzer_handle=self.analyzer_handle,
+            frequency=self.config.frequency_in_hz,
+            measurement_time=self.config.measurement_time,
+        )
+
+        return scheduler.run(move_commands, post_measurement, lambda: self.is_stop_requested)
+
+    def row_steps(self) -> List[np.ndarray]:
+        """
+        Path steps of every grid row that is not measured completely, in order of increasing x.
+        Every second scanned row is reversed, so the head sweeps the area in serpentine,
+        also when rows measured before (or without any points) are skipped.
+        """
+        extruder_positions = self.measurement_data.printer_path.extruder_positions
+        rows = []
+
+        for steps in self.measurement_data.step_indices:
+            steps = steps[steps >= 0]
+            steps = steps[np.argsort(extruder_positions[steps, 0])]
+
+            if len(steps) == 0 or all(self.measurement_data.is_measured(index) for index in steps):
+                continue
+
+            rows.append(steps[::-1] if len(rows) % 2 else steps)
+
+        return rows
+
+    def run_continuous_scan(self) -> bool:
+        extruder_path = self.measurement_data.printer_path.get_extruder_path()
+        rows = self.row_steps()
+
+        scanned_rows = []
+        for steps in rows:
+            start = extruder_path[steps[0]]
+            point_distances = np.abs(extruder_path.to_numpy()[steps, 0] - start.x)
+            scanned_rows.append((start, extruder_path[steps[-1]], point_distances))
+
+        def post_row(no_row: int, values: np.ndarray):
+            # row is measured again completely, even if some of its points were measured before
+            for index, value in zip(rows[no_row], values):
+                if not np.isnan(value):
+                    self.post_measurement(int(index), value.item())
+
+        scanner = ContinuousScanner(
+            printer_handle=self.printer_handle,
+            analyzer_handle=self.analyzer_handle,
+            frequency=self.config.frequency_in_hz,
+            measurement_time=self.config.measurement_time,
+            motion_model=self.printer_handle.motion_model,
+            pass_height=self.config.scan_height_in_mm,
+            movement_speed=self.config.movement_speed,
+        )
+
+        return scanner.run(scanned_rows, post_row, lambda: self.is_stop_requested)
+
+    def post_measurement(self, no_current_measurement: int, measurement):
+        was_measured = self.measurement_data.is_measured(no_current_measurement)
+        self.measurement_data.add_measurement_by_index(no_current_measurement, measurement)
+        self.journal.add_point(no_current_measurement, measurement)
+        self.live_result.set_value(*self.measurement_data.grid_indices[no_current_measurement], measurement)
+
+        if not was_measured:
+            self.no_measured_points += 1
+        self._report_progress()
+
+        if self.on_measurement is not None:
+            self.on_measurement(no_current_measurement, measurement)
+
+    def _report_progress(self) -> None:
+        if self.on_progress is not None:
+            self.on_progress(self.no_measured_points)
+
+    def finish(self, is_scan_complete: bool) -> bool:
+        self.is_scan_complete = is_scan_complete
+        if is_scan_complete:
+            self.journal.finish()
+            self.live_result.finish()
+        else:
+            # journal is left unfinished, so scan can be resumed
+            self.journal.close()
+            self.live_result.close()
+
+        return is_scan_complete
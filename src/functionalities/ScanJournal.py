@@ -0,0 +1,121 @@
+import hashlib
+import json
+import os
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from functionalities.PrinterPath import PrinterPath
+
+DEFAULT_JOURNAL_PATH = os.path.join(os.path.expanduser("~"), ".mdma", "scan_journal.jsonl")
+
+CONFIG_ENTRY = "config"
+POINT_ENTRY = "point"
+FINISHED_ENTRY = "finished"
+
+
+def compute_path_hash(printer_path: PrinterPath) -> str:
+    """
+    Hash of every extruder and antenna position in order of measurement,
+    used to check if journal was written for the same scan path.
+    Positions are already rounded by grid of the path, so their binary form is hashed directly.
+    """
+    positions = np.hstack([printer_path.extruder_positions, printer_path.antenna_positions])
+    return hashlib.sha256(np.ascontiguousarray(positions, dtype="<f8").tobytes()).hexdigest()
+
+
+def _encode_value(value) -> Any:
+    if isinstance(value, complex):
+        return [value.real, value.imag]
+    return float(value)
+
+
+def _decode_value(value) -> Any:
+    if isinstance(value, list):
+        return complex(value[0], value[1])
+    return value
+
+
+class ScanJournal:
+    """
+    **Append-only record of running scan.**
+
+    Every line is a separate json object: scan configuration with path hash goes first,
+    then one line for every measured point. Each line is flushed to disk as soon as it's written,
+    so after crash of application (or lost connection with device) scan can be resumed from the journal.
+    """
+
+    def __init__(self, path: str = DEFAULT_JOURNAL_PATH):
+        self.path = path
+        self._file = None
+
+    def start(self, config: dict, path_hash: str) -> None:
+        """
+        Starts new journal, previous one is overwritten.
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.close()
+        self._file = open(self.path, "w")
+        self._append({"type": CONFIG_ENTRY, "config": config, "path_hash": path_hash})
+
+    def reopen(self) -> None:
+        """
+        Continues writing to existing journal, used when scan is resumed.
+        """
+        self.close()
+        self._file = open(self.path, "a")
+
+    def add_point(self, index: int, value) -> None:
+        self._append({"type": POINT_ENTRY, "index": index, "value": _encode_value(value)})
+
+    def finish(self) -> None:
+        self._append({"type": FINISHED_ENTRY})
+        self.close()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _append(self, entry: dict) -> None:
+        if self._file is None:
+            return
+
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    @staticmethod
+    def read(path: str = DEFAULT_JOURNAL_PATH) -> "ScanJournalContent":
+        """
+        Reads journal, last line is skipped if it was only partially written.
+        """
+        content = ScanJournalContent()
+
+        with open(path, "r") as journal_file:
+            for line in journal_file:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+                if entry["type"] == CONFIG_ENTRY:
+                    content.config = entry["config"]
+                    content.path_hash = entry["path_hash"]
+                elif entry["type"] == POINT_ENTRY:
+                    content.points[entry["index"]] = _decode_value(entry["value"])
+                elif entry["type"] == FINISHED_ENTRY:
+                    content.is_finished = True
+
+        if content.config is None:
+            raise ValueError(f"journal '{path}' does not contain scan configuration")
+
+        return content
+
+
+class ScanJournalContent:
+    def __init__(self):
+        self.config: Optional[dict] = None
+        self.path_hash: Optional[str] = None
+        self.points: Dict[int, Any] = {}
+        self.is_finished: bool = False
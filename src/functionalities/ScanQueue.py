@@ -0,0 +1,140 @@
+import json
+import os
+from typing import List, Optional
+
+DEFAULT_SCAN_QUEUE_PATH = os.path.join(os.path.expanduser("~"), ".mdma", "scan_queue.json")
+
+PENDING = "pending"
+RUNNING = "running"
+FINISHED = "finished"
+FAILED = "failed"
+
+JOB_STATES = [PENDING, RUNNING, FINISHED, FAILED]
+
+
+class ScanJob:
+    """
+    Single scan of the queue: configuration (in format of exported config.json),
+    directory in which project is saved, and priority. Jobs of higher priority are scanned first.
+    """
+
+    def __init__(
+        self,
+        job_id: int,
+        config: dict,
+        output_directory: str,
+        priority: int = 0,
+        state: str = PENDING,
+        was_interrupted: bool = False,
+    ):
+        assert state in JOB_STATES
+        self.job_id = job_id
+        self.config = config
+        self.output_directory = output_directory
+        self.priority = priority
+        self.state = state
+        # job was running when application was closed, it's resumed from scan journal if possible
+        self.was_interrupted = was_interrupted
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.job_id,
+            "config": self.config,
+            "output_directory": self.output_directory,
+            "priority": self.priority,
+            "state": self.state,
+            "was_interrupted": self.was_interrupted,
+        }
+
+    @staticmethod
+    def from_dict(content: dict) -> "ScanJob":
+        return ScanJob(
+            content["job_id"],
+            content["config"],
+            content["output_directory"],
+            content.get("priority", 0),
+            content.get("state", PENDING),
+            content.get("was_interrupted", False),
+        )
+
+    def __repr__(self) -> str:
+        return f"ScanJob(job_id={self.job_id}, priority={self.priority}, state={self.state}, '{self.output_directory}')"
+
+
+class ScanQueue:
+    """
+    **Queue of scans, run one after another on the same devices.**
+
+    Queue is saved to file after every change, so it survives restart of the application.
+    Job that was running when application was closed is pending again, and marked as interrupted.
+    """
+
+    def __init__(self, path: str = DEFAULT_SCAN_QUEUE_PATH):
+        self.path = path
+        self.jobs: List[ScanJob] = []
+
+        if os.path.exists(path):
+            try:
+                with open(path, "r") as queue_file:
+                    self.jobs = [ScanJob.from_dict(job) for job in json.load(queue_file)["jobs"]]
+            except (OSError, ValueError, KeyError) as ex:
+                print(f"failed to load scan queue: {str(ex)}")
+
+        for job in self.jobs:
+            if job.state == RUNNING:
+                job.state = PENDING
+                job.was_interrupted = True
+
+    def add(self, config: dict, output_directory: str, priority: int = 0) -> ScanJob:
+        job_id = max((job.job_id for job in self.jobs), default=-1) + 1
+        job = ScanJob(job_id, config, output_directory, priority)
+        self.jobs.append(job)
+        self.save()
+        return job
+
+    def remove(self, job_id: int) -> None:
+        self.jobs = [job for job in self.jobs if job.job_id != job_id]
+        self.save()
+
+    def clear_done_jobs(self) -> None:
+        self.jobs = [job for job in self.jobs if job.state in (PENDING, RUNNING)]
+        self.save()
+
+    def pending_jobs(self) -> List[ScanJob]:
+        """
+        Jobs waiting for scan, in order of scanning: by priority, then in order of adding.
+        Interrupted job goes first among jobs of its priority, so its journal is not overwritten before resuming.
+        """
+        return sorted(
+            (job for job in self.jobs if job.state == PENDING),
+            key=lambda job: (-job.priority, not job.was_interrupted, job.job_id),
+        )
+
+    def next_job(self) -> Optional[ScanJob]:
+        pending_jobs = self.pending_jobs()
+        return pending_jobs[0] if len(pending_jobs) > 0 else None
+
+    def set_state(self, job: ScanJob, state: str) -> None:
+        assert state in JOB_STATES
+        job.state = state
+        if state in (FINISHED, FAILED):
+            job.was_interrupted = False
+        self.save()
+
+    def interrupt(self, job: ScanJob) -> None:
+        """
+        Job that was stopped before it was finished is pending again, to be resumed from scan journal.
+        """
+        job.state = PENDING
+        job.was_interrupted = True
+        self.save()
+
+    def save(self) -> None:
+        """
+        Writes queue next to its file first, then moves it in place, so queue file is never half written.
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        temporary_path = self.path + ".tmp"
+        with open(temporary_path, "w") as queue_file:
+            json.dump({"jobs": [job.to_dict() for job in self.jobs]}, queue_file)
+        os.replace(temporary_path, self.path)
@@ -0,0 +1,46 @@
+# keys of scan configuration, the same in settings widgets state, exported config.json and scan journal.
+# They're kept here, not in widgets, so scan can be configured without importing Qt
+
+# sections of config.json
+SPECTRUM_ANALYZER_CONTROLLER = "spectrum_analyzer_controller"
+PRINTER_CONTROLLER = "printer_controller"
+SCAN_PATH_SETTINGS = "scan_path_settings"
+CONFIGURATION_INFORMATION = "configuration_information"
+GENERAL_SETTINGS = "general_settings"
+
+# spectrum analyzer
+SCAN_MODE = "scan_mode_box"
+FREQUENCY_IN_HZ = "frequency_in_hz"
+MEASUREMENT_TIME = "measurement_time"
+# optional, readouts of hameg outside of level window are measured again, at most given number of times
+MIN_LEVEL_IN_DBM = "min_level_in_dbm"
+MAX_LEVEL_IN_DBM = "max_level_in_dbm"
+MAX_LEVEL_RETRIES = "max_level_retries"
+
+HAMEG_HMS_3010 = "HamegHMS3010"
+POCKET_VNA = "Pocket VNA"
+
+# printer
+MOVEMENT_SPEED = "movement_speed"
+PRINTER_WIDTH_IN_MM = "printer_bed_width"
+PRINTER_LENGTH_IN_MM = "printer_bed_length"
+
+# scan path
+SAMPLE_X_POSITION_IN_MM = "sample_x_position_in_mm"
+SAMPLE_Y_POSITION_IN_MM = "sample_y_position_in_mm"
+ANTENNA_X_OFFSET_IN_MM = "antenna_x_offset_in_mm"
+ANTENNA_Y_OFFSET_IN_MM = "antenna_y_offset_in_mm"
+SAMPLE_LENGTH_IN_MM = "sample_length_in_mm"
+SAMPLE_WIDTH_IN_MM = "sample_width_in_mm"
+SCAN_HEIGHT_IN_MM = "scan_height_in_mm"
+MEASUREMENT_RADIUS_IN_MM = "measurement_radius_in_mm"
+
+# general settings
+MEASUREMENT_MODE = "measurement_mode"
+POINT_BUDGET_IN_PERCENTAGES = "point_budget_in_percentages"
+REFINEMENT_THRESHOLD = "refinement_threshold"
+
+SINGLE_PASS_SCAN = "Single Pass Scan"
+BACKGROUND_FILTERING = "Background Filter"
+ADAPTIVE_REFINEMENT_SCAN = "Adaptive Refinement Scan"
+CONTINUOUS_SCAN = "Continuous Scan"
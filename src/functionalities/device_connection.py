@@ -0,0 +1,84 @@
+import os
+from typing import Optional
+
+from functionalities.config_keys import HAMEG_HMS_3010, POCKET_VNA
+from functionalities.ConnectionCache import ConnectionCache
+from printer_device.PrinterDevice import PrinterDevice
+from spectrum_analyzer_device.hameg3010.LevelRetryPolicy import LevelRetryPolicy
+
+# mock devices are used instead of real ones, when environment (or '.env' file) says so
+MOCK_PRINTER = "mock_printer"
+MOCK_HAMEG = "mock_hameg"
+MOCK_POCKET_VNA = "mock_pocket_vna"
+
+
+def get_printer_mode() -> str:
+    return os.environ.get("PRINTED_MODE", "real_device")
+
+
+def get_analyzer_mode() -> str:
+    return os.environ.get("ANALYZER_MODE", "real_device")
+
+
+def connect_printer(connection_cache: ConnectionCache, printer_mode: str = None) -> PrinterDevice:
+    """
+    Connects to printer, or to mock printer if 'printer_mode' is MOCK_PRINTER.
+    Raises SerialException when printer is not found.
+    """
+    if printer_mode is None:
+        printer_mode = get_printer_mode()
+
+    if printer_mode == MOCK_PRINTER:
+        from printer_device.PrinterDeviceMock import PrinterDeviceMock
+
+        return PrinterDeviceMock.connect()
+
+    from printer_device.MarlinDevice import MarlinDevice
+
+    return MarlinDevice.connect(connection_cache)
+
+
+def connect_analyzer(
+    scan_mode: str,
+    connection_cache: ConnectionCache,
+    analyzer_mode: str = None,
+    retry_policy: Optional[LevelRetryPolicy] = None,
+):
+    """
+    Connects to analyzer used in 'scan_mode', or to its mock if 'analyzer_mode' contains name of the mock.
+    Hameg reads levels with 'retry_policy', by default without level window.
+    Raises exception of device backend when analyzer is not found.
+    """
+    if analyzer_mode is None:
+        analyzer_mode = get_analyzer_mode()
+
+    # device backends are imported on first use, pocket vna needs native library and hameg needs pyusb
+    if MOCK_HAMEG in analyzer_mode and scan_mode == HAMEG_HMS_3010:
+        from spectrum_analyzer_device.hameg3010.HamegHMS3010DeviceMock import (
+            HamegHMS3010DeviceMock,
+        )
+
+        return HamegHMS3010DeviceMock.automatically_connect()
+
+    if MOCK_POCKET_VNA in analyzer_mode and scan_mode == POCKET_VNA:
+        from spectrum_analyzer_device.pocket_vna_device.PocketVnaDeviceMock import (
+            PocketVnaDeviceMock,
+        )
+
+        return PocketVnaDeviceMock.automatically_connect()
+
+    if scan_mode == HAMEG_HMS_3010:
+        from spectrum_analyzer_device.hameg3010.HamegHMS3010SerialDevice import (
+            HamegHMS3010DeviceSerial,
+        )
+
+        return HamegHMS3010DeviceSerial.automatically_connect(connection_cache, retry_policy)
+
+    if scan_mode == POCKET_VNA:
+        from spectrum_analyzer_device.pocket_vna_device.PocketVNADevice import (
+            PocketVnaDevice,
+        )
+
+        return PocketVnaDevice.automatically_connect()
+
+    raise ValueError(f"scan mode should be one of: [{HAMEG_HMS_3010}, {POCKET_VNA}], not:'{scan_mode}'")
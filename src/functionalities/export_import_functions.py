@@ -1,58 +1,133 @@
 import json
 import os
+from typing import Optional, Tuple
 
-import pandas as pd
-from PyQt6.QtWidgets import QFileDialog
+import numpy as np
+from PyQt6.QtWidgets import QFileDialog, QInputDialog
 
+from functionalities.MdmaFile import MdmaReader, is_mdma_file
 from functionalities.Measurement import Measurement
+from functionalities.ProjectExport import ProjectSnapshot
 
+MDMA_PROJECT_FILTER = "MDMA project(*.mdma)"
+# data is saved in binary file anyway, csv copy can be opened in any spreadsheet
+MDMA_PROJECT_WITH_CSV_FILTER = "MDMA project, data also as CSV(*.mdma)"
 
-def export_project(main_window_object):
+
+def ask_for_project_directory(main_window_object, caption: str) -> Tuple[Optional[str], bool]:
+    """
+    Path of project directory chosen by the user (None if dialog was cancelled), and whether data is saved as csv too.
+    """
     file_name = QFileDialog.getSaveFileName(
         main_window_object,
-        "Export Project",
+        caption,
         os.getcwd(),
-        "MDMA project(*.mdma)",
+        ";;".join([MDMA_PROJECT_FILTER, MDMA_PROJECT_WITH_CSV_FILTER]),
     )
 
-    if file_name != "":
-        directory_path, extention = file_name
-        root_directory_path = directory_path.split(".")
-        root_directory_path = ".".join(root_directory_path[:-1])
+    if file_name[0] == "":
+        return None, False
 
-        os.mkdir(root_directory_path)
+    directory_path, selected_filter = file_name
+    root_directory_path = directory_path.split(".")
+    root_directory_path = ".".join(root_directory_path[:-1])
+    return root_directory_path, selected_filter == MDMA_PROJECT_WITH_CSV_FILTER
 
-        data_path = os.path.join(root_directory_path, "data.mdma")
-        main_window_object.measurement_data.to_pd_dataframe().to_csv(data_path)
 
-        fig_path = os.path.join(root_directory_path, main_window_object.printer_path_plot.get_title() + ".png")
-        main_window_object.printer_path_plot.save_fig(fig_path)
+def export_project(main_window_object):
+    """
+    Asks for project path, then project is written by export worker, from snapshot of current data and plots.
+    """
+    root_directory_path, with_csv = ask_for_project_directory(main_window_object, "Export Project")
 
-        title_list = [plot["widget"].get_title() for plot in main_window_object.plots]
-        seen = set()
-        for i, e in enumerate(title_list):
-            if e in seen:
-                title_list[i] = f"{title_list[i]}_{i}"
-            else:
-                seen.add(e)
+    if root_directory_path is not None:
+        main_window_object.start_export(create_project_snapshot(main_window_object, root_directory_path, with_csv))
 
-        for plot, title in zip(main_window_object.plots, title_list):
-            fig_path = os.path.join(root_directory_path, title + ".png")
-            plot["widget"].save_fig(fig_path)
 
-        config_path = os.path.join(root_directory_path, "config.json")
-        export_config_to_file(main_window_object, config_path)
+def add_scan_to_queue(main_window_object):
+    """
+    Adds scan with current settings to the queue, project of the scan is saved in chosen directory.
+    """
+    root_directory_path, _ = ask_for_project_directory(main_window_object, "Save Queued Scan As")
+    if root_directory_path is None:
+        return
 
+    priority, is_accepted = QInputDialog.getInt(
+        main_window_object, "Scan Priority", "Priority (scans of higher priority are run first):", 0
+    )
+    if not is_accepted:
+        return
 
-def export_config_to_file(main_window_object, config_path):
+    job = main_window_object.scan_queue.add(get_config_dict(main_window_object), root_directory_path, priority)
+    print(f"added to queue: {job}")
+    main_window_object.general_settings.set_no_queued_scans(len(main_window_object.scan_queue.pending_jobs()))
+
+
+def create_project_snapshot(main_window_object, root_directory_path: str, with_csv: bool) -> ProjectSnapshot:
+    measurement = main_window_object.measurement_data
+
+    figure_jobs = [
+        main_window_object.printer_path_plot.figure_job(
+            os.path.join(root_directory_path, main_window_object.printer_path_plot.get_title() + ".png")
+        )
+    ]
+
+    title_list = [plot["widget"].get_title() for plot in main_window_object.plots]
+    seen = set()
+    for i, e in enumerate(title_list):
+        if e in seen:
+            title_list[i] = f"{title_list[i]}_{i}"
+        else:
+            seen.add(e)
+
+    for plot, title in zip(main_window_object.plots, title_list):
+        figure_jobs.append(plot["widget"].figure_job(os.path.join(root_directory_path, title + ".png")))
+
+    return ProjectSnapshot(
+        root_directory_path,
+        np.array(measurement.to_numpy(), copy=True),
+        measurement.grid,
+        get_config_dict(main_window_object),
+        figure_jobs,
+        with_csv,
+    )
+
+
+def get_config_dict(main_window_object) -> dict:
     config_dict = {}
     config_dict.update({"spectrum_analyzer_controller": main_window_object.spectrum_analyzer_controller.get_state()})
     config_dict.update({"printer_controller": main_window_object.printer_controller.get_state()})
     config_dict.update({"scan_path_settings": main_window_object.scan_path_settings.get_state()})
     config_dict.update({"configuration_information": main_window_object.configuration_information.get_state()})
+    config_dict.update({"general_settings": main_window_object.general_settings.get_state()})
+    return config_dict
+
+
+def apply_config_dict(main_window_object, config_dict: dict) -> None:
+    main_window_object.spectrum_analyzer_controller.set_state(config_dict["spectrum_analyzer_controller"])
+    main_window_object.printer_controller.set_state(config_dict["printer_controller"])
+    main_window_object.scan_path_settings.set_state(config_dict["scan_path_settings"])
+    main_window_object.general_settings.set_state(config_dict.get("general_settings", {}))
 
+
+def export_config_to_file(main_window_object, config_path):
     with open(config_path, "w") as outfile:
-        json.dump(config_dict, outfile)
+        json.dump(get_config_dict(main_window_object), outfile)
+
+
+def read_project_data(data_path: str) -> Measurement:
+    """
+    Reads binary data file, or csv data file written by older versions.
+    Of values measured on many frequencies only the first frequency is read.
+    """
+    if is_mdma_file(data_path):
+        with MdmaReader(data_path) as reader:
+            first_plane = (slice(None), slice(None)) + (0,) * (reader.ndim - 2)
+            return Measurement.from_numpy(reader[first_plane], reader.grid)
+
+    import pandas as pd
+
+    return Measurement.from_pd_dataframe(pd.read_csv(data_path, index_col=0))
 
 
 def save_config(main_window_object):
@@ -76,9 +151,7 @@ def load_project(main_window_object):
         data_path = os.path.join(directory_path, "data.mdma")
         config_path = os.path.join(directory_path, "config.json")
         try:
-            data = pd.read_csv(data_path, index_col=0)
-
-            main_window_object.measurement_data = Measurement.from_pd_dataframe(data)
+            main_window_object.measurement_data = read_project_data(data_path)
 
             main_window_object.plots[0]["widget"].update_from_scan(main_window_object.measurement_data)
             main_window_object.plots[0]["widget"].show()
@@ -88,11 +161,7 @@ def load_project(main_window_object):
 
         try:
             with open(config_path, "r") as outfile:
-                config_dict = json.load(outfile)
-
-                main_window_object.spectrum_analyzer_controller.set_state(config_dict["spectrum_analyzer_controller"])
-                main_window_object.printer_controller.set_state(config_dict["printer_controller"])
-                main_window_object.scan_path_settings.set_state(config_dict["scan_path_settings"])
+                apply_config_dict(main_window_object, json.load(outfile))
 
         except Exception as ex:
             print(str(ex))
@@ -112,10 +181,7 @@ def load_config(main_window_object):
 
     try:
         with open(file_name[0], "r") as outfile:
-            config_dict = json.load(outfile)
-            main_window_object.spectrum_analyzer_controller.set_state(config_dict["spectrum_analyzer_controller"])
-            main_window_object.printer_controller.set_state(config_dict["printer_controller"])
-            main_window_object.scan_path_settings.set_state(config_dict["scan_path_settings"])
+            apply_config_dict(main_window_object, json.load(outfile))
             main_window_object.recalculate_path()
     except Exception as ex:
         print(str(ex))
@@ -0,0 +1,150 @@
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, List, Optional, Sequence, Tuple, TypeVar
+
+import serial.tools.list_ports
+from serial import SerialException
+from serial.tools.list_ports_common import ListPortInfo
+
+Device = TypeVar("Device")
+
+# (VID, PID) of USB serial bridges
+PRUSA_USB_IDS = [(0x2C99, 0x0001), (0x2C99, 0x0002)]
+HAMEG_HO720_USB_IDS = [(0x0403, 0xED72)]
+# boards commonly running Marlin: Prusa, Arduino Mega, CH340, FTDI, CP210x and STM32 virtual COM port,
+# printers on other bridges are found by probing the remaining ports
+MARLIN_USB_IDS = PRUSA_USB_IDS + [
+    (0x2341, 0x0010),
+    (0x2341, 0x0042),
+    (0x1A86, 0x7523),
+    (0x0403, 0x6001),
+    (0x10C4, 0xEA60),
+    (0x0483, 0x5740),
+]
+MARLIN_DESCRIPTIONS = ["Marlin", "Prusa"]
+
+
+def port_matches(port: ListPortInfo, usb_ids: Sequence[Tuple[int, int]] = (), descriptions: Sequence[str] = ()) -> bool:
+    """
+    True if port belongs to USB device with one of 'usb_ids', or its description contains one of 'descriptions'.
+    """
+    if port.vid is not None and (port.vid, port.pid) in usb_ids:
+        return True
+
+    return any(description in (port.description or "") for description in descriptions)
+
+
+def find_serial_device(
+    probe: Callable[[str], Optional[Device]],
+    port_filter: Callable[[ListPortInfo], bool] = lambda port: True,
+    available_ports: Optional[List[ListPortInfo]] = None,
+    preferred_ports: Sequence[ListPortInfo] = (),
+    probe_unmatched_ports: bool = False,
+) -> Tuple[Device, ListPortInfo]:
+    """
+    **Probes all candidate ports at the same time, returns device from the first port that answers.**
+
+    Ports are filtered by USB ids and description before any of them is opened. Probes still running when
+    device is found are not awaited, devices they open later are closed.
+    Preferred ports (like the one from connection cache) are probed first, on their own.
+    When none of matching ports answers, ports rejected by filter can be probed as well.
+
+    Parameters
+    ----------
+    **probe : Callable[[str], Optional[Device]]**
+        Opens port of given name and checks if expected device answers,
+        returns connected device, or None (or raises SerialException) if it does not
+
+    **port_filter : Callable[[ListPortInfo], bool], optional**
+        Ports for which it returns False are not probed, **by default all ports are probed**
+
+    **available_ports : Optional[List[ListPortInfo]], optional**
+        Ports to choose from, **by default all serial ports of the system**
+
+    **preferred_ports : Sequence[ListPortInfo], optional**
+        Ports probed before discovery, not filtered, **by default none**
+
+    **probe_unmatched_ports : bool, optional**
+        Probe ports rejected by 'port_filter' when no matching port answers,
+        for devices on USB bridges not known to the filter, **by default False**
+
+    Raises
+    ------
+    **SerialException**
+        If none of the ports answered
+
+    Returns
+    -------
+    **Tuple[Device, ListPortInfo]**
+        Device returned by the fastest successful probe, and its port
+    """
+    if available_ports is None:
+        available_ports = serial.tools.list_ports.comports()
+
+    print("List all available ports:")
+    for port in sorted(available_ports):
+        print(f"\t port: '{port.device}', desc: '{port.description}', hwid: '{port.hwid}")
+
+    def safe_probe(port: ListPortInfo) -> Optional[Device]:
+        print(f"Scanning port: '{port.device}', desc: '{port.description}', hwid: '{port.hwid}")
+        try:
+            return probe(str(port.device))
+        except (SerialException, OSError, ValueError):
+            return None
+
+    for port in preferred_ports:
+        device = safe_probe(port)
+        if device is not None:
+            print(f"Connected on preferred port: '{port.device}', desc: '{port.description}', hwid: '{port.hwid}")
+            return device, port
+
+    preferred_port_names = [port.device for port in preferred_ports]
+    ports = [port for port in sorted(available_ports) if port.device not in preferred_port_names]
+    candidates = [port for port in ports if port_filter(port)]
+    unmatched_ports = [port for port in ports if not port_filter(port)] if probe_unmatched_ports else []
+
+    for ports_to_probe in (candidates, unmatched_ports):
+        if len(ports_to_probe) == 0:
+            continue
+
+        found_device, found_port = _probe_in_parallel(safe_probe, ports_to_probe)
+        if found_device is not None:
+            return found_device, found_port
+
+    raise SerialException("Device not found")
+
+
+def _probe_in_parallel(
+    safe_probe: Callable[[ListPortInfo], Optional[Device]], candidates: List[ListPortInfo]
+) -> Tuple[Optional[Device], Optional[ListPortInfo]]:
+    def close_late_device(future: Future):
+        device = future.result()
+        if device is not None and hasattr(device, "close"):
+            device.close()
+
+    executor = ThreadPoolExecutor(max_workers=len(candidates))
+    pending = {executor.submit(safe_probe, port): port for port in candidates}
+    found_device = None
+    found_port = None
+
+    try:
+        while len(pending) > 0 and found_device is None:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                port = pending.pop(future)
+                device = future.result()
+
+                if device is None:
+                    continue
+
+                if found_device is None:
+                    print(f"Connected on port: '{port.device}', desc: '{port.description}', hwid: '{port.hwid}")
+                    found_device, found_port = device, port
+                else:
+                    close_late_device(future)
+    finally:
+        for future in pending:
+            future.add_done_callback(close_late_device)
+        executor.shutdown(wait=False)
+
+    return found_device, found_port
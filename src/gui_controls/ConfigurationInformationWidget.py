@@ -1,3 +1,5 @@
+from typing import Optional
+
 from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtWidgets import (
     QFrame,
@@ -30,6 +32,7 @@ class ConfigurationInformationWidget(QWidget):
 
         self.no_measurements = QLabel("-")
         self.no_current_measurement = QLabel("-")
+        self.path_ordering = QLabel("-")
         self.total_scan_time = QLabel("-")
         self.scan_time_left = QLabel("-")
         self.elapsed_scan_time = QLabel("-")
@@ -71,13 +74,19 @@ class ConfigurationInformationWidget(QWidget):
         self.update_progress_bar(100 * no_current_measurement / int(self.no_measurements.text()))
         self.no_current_measurement.setText(str(no_current_measurement))
 
+    def set_scan_time_left(self, scan_time_left_in_seconds: float):
+        self.scan_time_left.setText(ConfigurationInformationWidget.convert_time(max(scan_time_left_in_seconds, 0)))
+
     def update_widget(
         self,
         no_points: int,
         no_current_measurement: int,
         total_scan_time_in_seconds: int,
+        path_ordering: Optional[str] = None,
     ):
         self.no_measurements.setText(str(int(no_points)))
+        if path_ordering is not None:
+            self.path_ordering.setText(path_ordering)
         self.total_scan_time.setText(ConfigurationInformationWidget.convert_time(total_scan_time_in_seconds))
         self.no_current_measurement.setText(str(int(no_current_measurement)))
 
@@ -157,14 +166,15 @@ class ConfigurationInformationWidget(QWidget):
             self.no_current_measurement,
         )
 
-        add_element("Estimated Total scan time:", 2, settings_layout, self.total_scan_time)
-        add_element("Estimated Scan time left:", 3, settings_layout, self.scan_time_left)
-        add_element("Elapsed Scan time:", 4, settings_layout, self.elapsed_scan_time)
+        add_element("Path ordering:", 2, settings_layout, self.path_ordering)
+        add_element("Estimated Total scan time:", 3, settings_layout, self.total_scan_time)
+        add_element("Estimated Scan time left:", 4, settings_layout, self.scan_time_left)
+        add_element("Elapsed Scan time:", 5, settings_layout, self.elapsed_scan_time)
 
         scan_progress_label = QLabel("Current scan progress")
         scan_progress_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        settings_layout.addWidget(scan_progress_label, *(5, 0), *(1, 2))
-        settings_layout.addWidget(self.progress, *(6, 0), *(1, 2))
+        settings_layout.addWidget(scan_progress_label, *(6, 0), *(1, 2))
+        settings_layout.addWidget(self.progress, *(7, 0), *(1, 2))
 
     def lock_ui(self):
         raise NotImplementedError()
@@ -1,12 +1,38 @@
 from typing import Callable
 
-from PyQt6.QtCore import Qt
-from PyQt6.QtWidgets import QComboBox, QFrame, QLabel, QPushButton, QVBoxLayout, QWidget
-
+from PyQt6.QtCore import QRegularExpression, Qt
+from PyQt6.QtGui import QRegularExpressionValidator
+from PyQt6.QtWidgets import (
+    QComboBox,
+    QFrame,
+    QGridLayout,
+    QLabel,
+    QLineEdit,
+    QProgressBar,
+    QPushButton,
+    QVBoxLayout,
+    QWidget,
+)
+
+from functionalities.config_keys import (
+    ADAPTIVE_REFINEMENT_SCAN,
+    BACKGROUND_FILTERING,
+    CONTINUOUS_SCAN,
+    MEASUREMENT_MODE,
+    POINT_BUDGET_IN_PERCENTAGES,
+    REFINEMENT_THRESHOLD,
+    SINGLE_PASS_SCAN,
+)
 from gui_controls.custom_input_fiedls.StartStopButton import StartButton
 
-SINGLE_PASS_SCAN = "Single Pass Scan"
-BACKGROUND_FILTERING = "Background Filter"
+EXPORT_SCAN = "Export Scan"
+CANCEL_EXPORT = "Cancel Export"
+
+GENERAL_SETTINGS_STATE_PARAMS = [
+    MEASUREMENT_MODE,
+    POINT_BUDGET_IN_PERCENTAGES,
+    REFINEMENT_THRESHOLD,
+]
 
 
 class GeneralSettings(QWidget):
@@ -16,10 +42,32 @@ class GeneralSettings(QWidget):
         self.scan_mode_box.addItem(SINGLE_PASS_SCAN)
         self.scan_mode_box.addItem(BACKGROUND_FILTERING)
         self.scan_mode_box.model().item(1).setEnabled(False)
-        self.export_scan = QPushButton("Export Scan")
+        self.scan_mode_box.addItem(ADAPTIVE_REFINEMENT_SCAN)
+        self.scan_mode_box.addItem(CONTINUOUS_SCAN)
+
+        # part of full resolution grid measured in adaptive refinement scan
+        self.point_budget = QLineEdit("30")
+        self.point_budget.setValidator(QRegularExpressionValidator(QRegularExpression(r"^(100|[1-9]?[0-9])$")))
+        self.point_budget.setAlignment(Qt.AlignmentFlag.AlignRight)
+        # cells of coarse grid with smaller difference of measured values are not refined
+        self.refinement_threshold = QLineEdit("0")
+        self.refinement_threshold.setValidator(QRegularExpressionValidator(QRegularExpression(r"^[0-9]*\.?[0-9]*$")))
+        self.refinement_threshold.setAlignment(Qt.AlignmentFlag.AlignRight)
+        self.export_scan = QPushButton(EXPORT_SCAN)
+        # export runs in background, meanwhile export button cancels it
+        self.is_exporting = False
+        self.export_progress = QProgressBar()
+        self.export_progress.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.export_progress.hide()
         self.import_scan = QPushButton("Import Scan")
         self.export_settings = QPushButton("Export Settings")
         self.import_settings = QPushButton("Import Settings")
+        self.resume_scan = QPushButton("Resume Scan")
+        # scans with current settings are added to the queue, and run one after another
+        self.add_to_queue = QPushButton("Add Scan To Queue")
+        self.run_queue = QPushButton()
+        self.set_no_queued_scans(0)
+        self.dry_run = QPushButton("Dry Run")
         self.start_measurement = StartButton()
 
         self._init_ui()
@@ -46,12 +94,60 @@ class GeneralSettings(QWidget):
 
     def _init_frame(self, frame_layout: QVBoxLayout):
         frame_layout.addWidget(self.scan_mode_box)
+
+        point_budget_layout = QGridLayout()
+        point_budget_label = QLabel("Point Budget [%]:")
+        point_budget_label.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
+        point_budget_layout.addWidget(point_budget_label, *(0, 0))
+        point_budget_layout.addWidget(self.point_budget, *(0, 1))
+        refinement_threshold_label = QLabel("Refinement Threshold:")
+        refinement_threshold_label.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
+        point_budget_layout.addWidget(refinement_threshold_label, *(1, 0))
+        point_budget_layout.addWidget(self.refinement_threshold, *(1, 1))
+        frame_layout.addLayout(point_budget_layout)
+
         frame_layout.addWidget(self.export_scan)
+        frame_layout.addWidget(self.export_progress)
         frame_layout.addWidget(self.import_scan)
         frame_layout.addWidget(self.export_settings)
         frame_layout.addWidget(self.import_settings)
+        frame_layout.addWidget(self.resume_scan)
+        frame_layout.addWidget(self.add_to_queue)
+        frame_layout.addWidget(self.run_queue)
+        frame_layout.addWidget(self.dry_run)
         frame_layout.addWidget(self.start_measurement)
 
+    def get_state(self) -> dict:
+        return {
+            MEASUREMENT_MODE: self.scan_mode_box.currentText(),
+            POINT_BUDGET_IN_PERCENTAGES: int(self.point_budget.text()) if self.point_budget.text() != "" else 100,
+            REFINEMENT_THRESHOLD: (
+                float(self.refinement_threshold.text()) if self.refinement_threshold.text().strip(".") != "" else 0
+            ),
+        }
+
+    def set_state(self, data: dict) -> None:
+        try:
+            self.scan_mode_box.setCurrentText(data[MEASUREMENT_MODE])
+        except KeyError:
+            pass
+
+        try:
+            self.point_budget.setText(str(int(data[POINT_BUDGET_IN_PERCENTAGES])))
+        except KeyError:
+            pass
+
+        try:
+            self.refinement_threshold.setText(str(float(data[REFINEMENT_THRESHOLD])))
+        except KeyError:
+            pass
+
+    def on_scan_mode_box_change(self, function: Callable) -> None:
+        self.scan_mode_box.currentTextChanged.connect(function)
+
+    def on_point_budget_change(self, function: Callable) -> None:
+        self.point_budget.editingFinished.connect(function)
+
     def on_export_scan_button_press(self, function: Callable) -> None:
         self.export_scan.clicked.connect(function)
 
@@ -64,18 +160,51 @@ class GeneralSettings(QWidget):
     def on_import_settings_button_press(self, function: Callable) -> None:
         self.import_settings.clicked.connect(function)
 
+    def on_resume_scan_button_press(self, function: Callable) -> None:
+        self.resume_scan.clicked.connect(function)
+
+    def on_add_to_queue_button_press(self, function: Callable) -> None:
+        self.add_to_queue.clicked.connect(function)
+
+    def on_run_queue_button_press(self, function: Callable) -> None:
+        self.run_queue.clicked.connect(function)
+
+    def set_no_queued_scans(self, no_queued_scans: int) -> None:
+        self.run_queue.setText(f"Run Queue ({no_queued_scans})")
+
+    def on_dry_run_button_press(self, function: Callable) -> None:
+        self.dry_run.clicked.connect(function)
+
     def on_start_measurement_button_press(self, function: Callable):
         self.start_measurement.clicked.connect(lambda: self.start_measurement.on_start(function))
 
     def on_stop_measurement_button_press(self, function: Callable):
         self.start_measurement.clicked.connect(lambda: self.start_measurement.on_stop(function))
 
+    def set_export_running(self, is_exporting: bool):
+        self.is_exporting = is_exporting
+        self.export_scan.setText(CANCEL_EXPORT if is_exporting else EXPORT_SCAN)
+        self.export_scan.setDisabled(False)
+        self.export_progress.setValue(0)
+        self.export_progress.setVisible(is_exporting)
+
+    def set_export_progress(self, no_finished_steps: int, no_steps: int):
+        self.export_progress.setMaximum(no_steps)
+        self.export_progress.setValue(no_finished_steps)
+
     def activate_export_buttons(self):
         self.export_settings.setDisabled(False)
 
     def set_disabled(self, is_disabled: bool = False):
         self.scan_mode_box.setDisabled(is_disabled)
-        self.export_scan.setDisabled(is_disabled)
+        self.point_budget.setDisabled(is_disabled)
+        self.refinement_threshold.setDisabled(is_disabled)
+        # running export can be cancelled at any time
+        self.export_scan.setDisabled(is_disabled and not self.is_exporting)
         self.import_scan.setDisabled(is_disabled)
         self.export_settings.setDisabled(is_disabled)
         self.import_settings.setDisabled(is_disabled)
+        self.resume_scan.setDisabled(is_disabled)
+        self.add_to_queue.setDisabled(is_disabled)
+        self.run_queue.setDisabled(is_disabled)
+        self.dry_run.setDisabled(is_disabled)
@@ -11,6 +11,11 @@ from PyQt6.QtWidgets import (
 )
 from vector3d.vector import Vector
 
+from functionalities.config_keys import (
+    MOVEMENT_SPEED,
+    PRINTER_LENGTH_IN_MM,
+    PRINTER_WIDTH_IN_MM,
+)
 from gui_controls.custom_input_fiedls.DeviceConnectionStateLabel import (
     CONNECTED,
     CONNECTING,
@@ -22,9 +27,6 @@ from gui_controls.custom_input_fiedls.PositionLineEdit import PositionLineEdit
 from gui_controls.custom_input_fiedls.PrinterPositionWidget import PrinterPositionWidget
 
 CONNECTION_STATE = "connection_state"
-MOVEMENT_SPEED = "movement_speed"
-PRINTER_WIDTH_IN_MM = "printer_bed_width"
-PRINTER_LENGTH_IN_MM = "printer_bed_length"
 CURRENT_POSITION_X_IN_MM = "current_extruder_position_x_in_mm"
 CURRENT_POSITION_Y_IN_MM = "current_extruder_position_y_in_mm"
 CURRENT_POSITION_Z_IN_MM = "current_extruder_position_z_in_mm"
@@ -11,17 +11,19 @@ from PyQt6.QtWidgets import (
     QWidget,
 )
 
+from functionalities.config_keys import (
+    ANTENNA_X_OFFSET_IN_MM,
+    ANTENNA_Y_OFFSET_IN_MM,
+    MEASUREMENT_RADIUS_IN_MM,
+    SAMPLE_LENGTH_IN_MM,
+    SAMPLE_WIDTH_IN_MM,
+    SAMPLE_X_POSITION_IN_MM,
+    SAMPLE_Y_POSITION_IN_MM,
+    SCAN_HEIGHT_IN_MM,
+)
 from gui_controls.custom_input_fiedls.PositionLineEdit import PositionLineEdit
 
 SCAN_MODE = "scan_mode"
-SAMPLE_X_POSITION_IN_MM = "sample_x_position_in_mm"
-SAMPLE_Y_POSITION_IN_MM = "sample_y_position_in_mm"
-ANTENNA_X_OFFSET_IN_MM = "antenna_x_offset_in_mm"
-ANTENNA_Y_OFFSET_IN_MM = "antenna_y_offset_in_mm"
-SAMPLE_LENGTH_IN_MM = "sample_length_in_mm"
-SAMPLE_WIDTH_IN_MM = "sample_width_in_mm"
-SCAN_HEIGHT_IN_MM = "scan_height_in_mm"
-MEASUREMENT_RADIUS_IN_MM = "measurement_radius_in_mm"
 
 SCAN_PATH_STATE_PARAMS = [
     SCAN_MODE,
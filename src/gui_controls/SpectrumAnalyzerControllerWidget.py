@@ -12,6 +12,13 @@ from PyQt6.QtWidgets import (
     QWidget,
 )
 
+from functionalities.config_keys import (
+    FREQUENCY_IN_HZ,
+    HAMEG_HMS_3010,
+    MEASUREMENT_TIME,
+    POCKET_VNA,
+    SCAN_MODE,
+)
 from gui_controls.custom_input_fiedls.DeviceConnectionStateLabel import (
     CONNECTED,
     CONNECTING,
@@ -24,10 +31,7 @@ from gui_controls.custom_input_fiedls.MeasurementTimeLineEdit import (
 )
 
 CONNECTION_STATE = "connection_state"
-SCAN_MODE = "scan_mode_box"
-FREQUENCY_IN_HZ = "frequency_in_hz"
 LAST_MEASUREMENT_IN_HZ = "last_measurement_in_hz"
-MEASUREMENT_TIME = "measurement_time"
 
 SPECTRUM_ANALYZER_STATE_PARAMS = [
     CONNECTION_STATE,
@@ -36,8 +40,6 @@ SPECTRUM_ANALYZER_STATE_PARAMS = [
     LAST_MEASUREMENT_IN_HZ,
     MEASUREMENT_TIME,
 ]
-HAMEG_HMS_3010 = "HamegHMS3010"
-POCKET_VNA = "Pocket VNA"
 
 
 class SpectrumAnalyzerControllerWidget(QWidget):
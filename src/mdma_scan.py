@@ -0,0 +1,128 @@
+"""
+Runs scan without GUI, from config.json saved by MDMA application, and writes project of the scan.
+
+    python mdma_scan.py config.json path/to/project [--resume] [--csv]
+
+Devices are connected the same way as in the application, mock devices are set in '.env' file.
+Scan stopped with Ctrl+C can be continued with '--resume'.
+"""
+
+import argparse
+import contextlib
+import logging
+import os
+import signal
+import sys
+from typing import List, TextIO
+
+import numpy as np
+from dotenv import load_dotenv
+
+from functionalities.AdaptiveRefinement import planned_no_points
+from functionalities.config_keys import ADAPTIVE_REFINEMENT_SCAN, POCKET_VNA
+from functionalities.ConnectionCache import ConnectionCache
+from functionalities.device_connection import connect_analyzer, connect_printer
+from functionalities.ProjectExport import ProjectSnapshot, write_project
+from functionalities.ScanConfig import ScanConfig
+from functionalities.ScanEngine import ScanEngine
+from plot_widgets.figure_rendering import FigureJob, levels_of, render_heatmap
+
+
+def heatmap_jobs(config: ScanConfig, values: np.ndarray, extent: List[float], directory_path: str) -> List[FigureJob]:
+    """
+    Heatmaps of measured values, the same as plots of the application.
+    """
+    if config.scan_mode == POCKET_VNA:
+        parts = [("Real part", np.real(values)), ("Imaginary part", np.imag(values))]
+    else:
+        parts = [("Signal Amplitude [dB]", values)]
+
+    figure_jobs = []
+    for title, part in parts:
+        part = np.array(part, dtype=float)
+        figure_jobs.append(
+            FigureJob(
+                render_heatmap,
+                os.path.join(directory_path, title + ".png"),
+                title=title,
+                values=part,
+                extent=extent,
+                levels=levels_of(part),
+            )
+        )
+    return figure_jobs
+
+
+def run_scan(args: argparse.Namespace, progress_output: TextIO) -> int:
+    config = ScanConfig.from_file(args.config)
+
+    connection_cache = ConnectionCache()
+    printer = connect_printer(connection_cache)
+    analyzer = connect_analyzer(config.scan_mode, connection_cache, retry_policy=config.create_level_retry_policy())
+
+    engine = ScanEngine(config, printer, analyzer)
+    if config.measurement_mode == ADAPTIVE_REFINEMENT_SCAN:
+        no_points = planned_no_points(engine.measurement_data.printer_path, config.point_budget_in_percentages)
+    else:
+        no_points = engine.measurement_data.printer_path.no_measurements
+
+    engine.on_progress = lambda no_measured_points: print(
+        f"measured {no_measured_points}/{no_points} points", file=progress_output, flush=True
+    )
+    engine.prepare(resume_from_journal=args.resume)
+
+    # Ctrl+C stops scan after current measurement, so journal is left ready for resuming
+    signal.signal(signal.SIGINT, lambda *_: engine.stop())
+    try:
+        is_scan_complete = engine.run()
+    finally:
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        analyzer.close()
+
+    if not is_scan_complete:
+        print("scan was stopped, continue it with '--resume'")
+        return 1
+
+    values = np.array(engine.measurement_data.to_numpy(), copy=True)
+    snapshot = ProjectSnapshot(
+        args.project,
+        values,
+        engine.measurement_data.grid,
+        config.to_config_dict(),
+        heatmap_jobs(config, values, engine.measurement_data.get_extent(), args.project),
+        args.csv,
+    )
+    write_project(
+        snapshot,
+        lambda no_step, no_steps: print(
+            f"written {no_step}/{no_steps} project files", file=progress_output, flush=True
+        ),
+        lambda: False,
+    )
+    print(f"project written to: '{args.project}'", file=progress_output, flush=True)
+    return 0
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(prog="mdma-scan", description="Runs scan configured by config.json, without GUI")
+    parser.add_argument("config", help="config.json saved by MDMA application")
+    parser.add_argument("project", help="directory of the project written after scan, it must not exist")
+    parser.add_argument("--resume", action="store_true", help="continue last unfinished scan from scan journal")
+    parser.add_argument("--csv", action="store_true", help="write measured data also as csv")
+    args = parser.parse_args(argv)
+
+    if os.path.exists(args.project):
+        print(f"project directory already exists: '{args.project}'", file=sys.stderr)
+        return 1
+
+    load_dotenv()
+    # stdout holds only progress of the scan, so it can be read by scripts.
+    # Diagnostics of the scan and messages printed by device drivers go to stderr
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+    progress_output = sys.stdout
+    with contextlib.redirect_stdout(sys.stderr):
+        return run_scan(args, progress_output)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
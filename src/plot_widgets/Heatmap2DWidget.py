@@ -1,163 +1,215 @@
+from typing import List, Optional, Tuple
+
 import numpy as np
 import pyqtgraph as pg
-from mpl_toolkits.axes_grid1 import make_axes_locatable
 from PIL import Image
+from PyQt6.QtCore import QRectF, QTimer
 
 from functionalities.Measurement import Measurement
+from plot_widgets.figure_rendering import (
+    HEATMAP_COLOR_MAP,
+    FigureJob,
+    draw_heatmap,
+    fill_missing,
+    levels_of,
+    render_heatmap,
+)
 from plot_widgets.PlotWidget import PlotType, PlotWidget
 
+# live view is redrawn at most 10 times per second, no matter how often new values arrive
+LIVE_VIEW_REFRESH_INTERVAL_IN_MS = 100
+
 
 class Heatmap2DWidget(PlotWidget):
-    def __init__(self, printer_path=None, title: str = None):
-        super().__init__(plot_type=PlotType.Heatmap2D)
-        self.title = title
-        # create the color bar for the heatmap
-        self.color_bar_widget = pg.GradientWidget(orientation="right")
-        self.cax = None
-        self.default_view()
+    """
+    **Heatmap of measured values.**
 
-    def default_view(self):
-        self.axes.cla()
-        self.add_labels_and_axes_styling()
-        try:
-            self.axes.imshow(
-                np.asarray(Image.open("assets\\3d_fill_color.png")),
-                cmap="Wistia",
-                extent=[0, 512, 0, 512],
-                interpolation="none",
-                origin="upper",
-            )
-
-            self.axes.set_xlim([-10, 522])
-            self.axes.set_ylim([-10, 522])
-        except Exception as ex:
-            print(f"failed to load logo: {str(ex)}")
-            z = np.empty((50, 50), float)
+    Values are displayed by pyqtgraph image item. Axes and color bar are created once,
+    later only image pixels and color levels are updated.
+    Matplotlib figure is not displayed, it's drawn only when heatmap is saved to file.
+    """
 
-            self.axes.imshow(
-                z,
-                cmap="Wistia",
-                extent=[0, 50, 0, 50],
-                interpolation="none",
-                origin="upper",
-            )
+    def __init__(self, printer_path=None, title: str = None):
+        super().__init__(plot_type=PlotType.Heatmap2D, embed_figure=False)
+        self.title = title
 
-            self.axes.set_xlim([0, 50])
-            self.axes.set_ylim([0, 50])
+        self.graphics = pg.GraphicsLayoutWidget()
+        self.graphics.setBackground("w")
+        self.plot_item = self.graphics.addPlot(title=title)
+        self.plot_item.setLabel("bottom", "X [mm]")
+        self.plot_item.setLabel("left", "Y [mm]")
+        self.plot_item.setAspectLocked(True)
 
-    def add_labels_and_axes_styling(self):
-        self.axes_styling("Extruder path")
-        self.axes.set_xlabel("X [mm]")
-        self.axes.set_ylabel("Y [mm]")
-        self.axes.set_title(self.title)
+        # rows of data are rows of image, first row is displayed at the bottom
+        self.image_item = pg.ImageItem(axisOrder="row-major")
+        self.plot_item.addItem(self.image_item)
 
-    def update_from_scan(self, z: Measurement):
-        self.axes.cla()
-        self.add_labels_and_axes_styling()
-        # Compute the mean of the non-None elements
-
-        local_z = np.array(z.data.to_numpy(), copy=True)
-
-        if not np.isnan(local_z).all():
-            z_mean = np.mean(local_z[~np.isnan(local_z)])
-            local_z[np.isnan(local_z)] = z_mean
-
-        self.im = self.axes.imshow(
-            local_z,
-            cmap="Wistia",
-            vmin=np.min(local_z),
-            vmax=np.max(local_z),
-            extent=[z.x_min, z.x_max, z.y_min, z.y_max],
-            interpolation="none",
-            origin="lower",
+        self.color_bar = pg.ColorBarItem(
+            colorMap=pg.colormap.get(HEATMAP_COLOR_MAP, source="matplotlib"), interactive=False
         )
+        self.color_bar.setImageItem(self.image_item, insert_in=self.plot_item)
+        self.main_layout.addWidget(self.graphics)
+
+        # values, extent and color levels currently displayed, drawn again by 'save_fig'
+        self.displayed_values: Optional[np.ndarray] = None
+        self.displayed_extent: List[float] = [0, 1, 0, 1]
+        self.displayed_levels: Tuple[float, float] = (0, 1)
+
+        self.live_buffer: Optional[np.ndarray] = None
+        self.live_footprints: Optional[np.ndarray] = None
+        self.live_part: Optional[str] = None
+        self.live_min = np.inf
+        self.live_max = -np.inf
+        self.is_live_view_outdated = False
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh_live_view)
 
-        if self.cax is not None:
-            self.cax.remove()
+        self.default_view()
 
-        self.divider = make_axes_locatable(self.axes)
-        self.cax = self.divider.append_axes("right", size="5%", pad=0.05)
-        self.color_bar = self.fig.colorbar(self.im, cax=self.cax, orientation="vertical")
+    def _display(self, values: np.ndarray, extent: List[float], levels: Optional[Tuple[float, float]] = None):
+        """
+        Replaces displayed image and fits axes to its extent, **color levels by default span all values**.
+        """
+        if levels is None or not levels[0] < levels[1]:
+            levels = levels_of(values)
 
-        self.axes.set_xlim([z.x_min, z.x_max])
-        self.axes.set_ylim([z.y_min, z.y_max])
+        self.displayed_values = values
+        self.displayed_extent = list(extent)
+        self.displayed_levels = levels
 
-        self.show()
-        # self.axes.legend(loc="upper right", fancybox=True)
+        self.image_item.setImage(values, autoLevels=False)
+        self.color_bar.setLevels(levels)
+        self.image_item.setRect(QRectF(extent[0], extent[2], extent[1] - extent[0], extent[3] - extent[2]))
+        self.plot_item.setRange(xRange=extent[:2], yRange=extent[2:], padding=0)
 
-    def update_from_vna_scan(self, z, part):
-        self.axes.cla()
-        self.add_labels_and_axes_styling()
-        # Compute the mean of the non-None elements
-        if part == "real":
-            local_z = np.array(z.data.to_numpy().real, copy=True)
+    def default_view(self):
+        self.refresh_timer.stop()
+        self.live_buffer = None
+        try:
+            logo = np.asarray(Image.open("assets\\3d_fill_color.png").convert("L"), dtype=float)
+            # rows of logo are stored top to bottom
+            self._display(logo[::-1], [0, 512, 0, 512])
+        except Exception as ex:
+            print(f"failed to load logo: {str(ex)}")
+            self._display(np.zeros((50, 50), float), [0, 50, 0, 50])
+
+    def update_from_scan(self, z: Measurement):
+        self.refresh_timer.stop()
+        self.live_buffer = None
+        self._display(fill_missing(z.to_numpy()), z.get_extent())
+
+    @staticmethod
+    def _select_part(value, part: Optional[str]):
+        if part is None:
+            return value
+        elif part == "real":
+            return np.real(value)
         elif part == "imag":
-            local_z = np.array(z.data.to_numpy().imag, copy=True)
+            return np.imag(value)
+        raise ValueError(f"part should be one of: [None, real, imag], not:'{part}'")
+
+    def start_live_view(self, z: Measurement, part: Optional[str] = None):
+        """
+        Displays measurement, later values are added with 'add_value'
+        and image is redrawn by timer, only if something has changed.
+        """
+        self.live_part = part
+        self.live_buffer = np.array(self._select_part(z.to_numpy(), part), dtype=float, copy=True)
+
+        if np.isnan(self.live_buffer).all():
+            self.live_min, self.live_max = np.inf, -np.inf
         else:
-            raise ValueError(f"part should be one of: [real, imag], not:'{part}'")
-
-        if not np.isnan(local_z).all():
-            z_mean = np.mean(local_z[~np.isnan(local_z)])
-            local_z[np.isnan(local_z)] = z_mean
-
-        self.im = self.axes.imshow(
-            local_z,
-            cmap="Wistia",
-            vmin=np.min(local_z),
-            vmax=np.max(local_z),
-            extent=[z.x_min, z.x_max, z.y_min, z.y_max],
-            interpolation="none",
-            origin="lower",
-        )
-
-        if self.cax is not None:
-            self.cax.remove()
+            self.live_min, self.live_max = np.nanmin(self.live_buffer), np.nanmax(self.live_buffer)
+
+        # width of square that was filled by value currently displayed in every pixel
+        self.live_footprints = np.where(np.isnan(self.live_buffer), np.inf, 1)
+        for index in np.flatnonzero(z.footprints > 1):
+            row, col = z.grid_indices[index]
+            if self.live_footprints[row, col] == 1:
+                self.add_value(row, col, z.to_numpy()[row, col], z.footprints[index])
+
+        # not measured points are transparent
+        self._display(self.live_buffer, z.get_extent(), (self.live_min, self.live_max))
+
+        self.is_live_view_outdated = False
+        self.refresh_timer.start(LIVE_VIEW_REFRESH_INTERVAL_IN_MS)
+
+    def add_value(self, row: int, col: int, value, footprint: int = 1):
+        """
+        Displays value measured in given cell. Value with footprint larger than 1 (point of coarse scan)
+        fills whole square around the cell, except pixels already showing values with smaller footprint.
+        """
+        if self.live_buffer is None:
+            return
+
+        value = float(self._select_part(value, self.live_part))
+
+        if footprint > 1:
+            rows = slice(max(0, row - footprint // 2), row + footprint // 2 + 1)
+            cols = slice(max(0, col - footprint // 2), col + footprint // 2 + 1)
+            is_coarser = self.live_footprints[rows, cols] >= footprint
+            self.live_buffer[rows, cols][is_coarser] = value
+            self.live_footprints[rows, cols][is_coarser] = footprint
+
+        self.live_buffer[row, col] = value
+        self.live_footprints[row, col] = 1
+        self.live_min = min(self.live_min, value)
+        self.live_max = max(self.live_max, value)
+        self.is_live_view_outdated = True
+
+    def refresh_live_view(self):
+        if self.live_buffer is None or not self.is_live_view_outdated:
+            return
+
+        # pixels are updated in place, color levels only when range of values has grown
+        self.image_item.setImage(self.live_buffer, autoLevels=False)
+        if self.live_min < self.live_max and self.displayed_levels != (self.live_min, self.live_max):
+            self.displayed_levels = (self.live_min, self.live_max)
+            self.color_bar.setLevels(self.displayed_levels)
+
+        self.is_live_view_outdated = False
+
+    def stop_live_view(self):
+        self.refresh_timer.stop()
+        self.refresh_live_view()
 
-        self.divider = make_axes_locatable(self.axes)
-        self.cax = self.divider.append_axes("right", size="5%", pad=0.05)
-        self.color_bar = self.fig.colorbar(self.im, cax=self.cax, orientation="vertical")
-
-        self.axes.set_xlim([z.x_min, z.x_max])
-        self.axes.set_ylim([z.y_min, z.y_max])
+    def update_from_vna_scan(self, z, part):
+        if part not in ("real", "imag"):
+            raise ValueError(f"part should be one of: [real, imag], not:'{part}'")
 
-        self.show()
-        # self.axes.legend(loc="upper right", fancybox=True)
+        self.refresh_timer.stop()
+        self.live_buffer = None
+        self._display(fill_missing(self._select_part(z.to_numpy(), part)), z.get_extent())
 
     def update_from_numpy_array(self, z):
-        self.axes.cla()
-        self.add_labels_and_axes_styling()
-        # Compute the mean of the non-None elements
-
-        local_z = np.array(z, copy=True)
-
-        if not np.isnan(local_z).all():
-            z_mean = np.mean(local_z[~np.isnan(local_z)])
-            local_z[np.isnan(local_z)] = z_mean
-
-        x_min = 0
-        y_min = 0
-        x_max = 50
-        y_max = 50
-
-        self.im = self.axes.imshow(
-            local_z.T,
-            cmap="Wistia",
-            vmin=np.min(local_z),
-            vmax=np.max(local_z),
-            extent=[z.x_min, z.x_max, z.y_min, z.y_max],
-            interpolation="none",
-            origin="lower",
+        self.refresh_timer.stop()
+        self.live_buffer = None
+        self._display(fill_missing(np.asarray(z).T), [0, 50, 0, 50])
+
+    def show(self):
+        self.image_item.update()
+
+    def get_title(self):
+        return self.title if self.title is not None else "Untitled"
+
+    def save_fig(self, path):
+        """
+        Draws displayed values with matplotlib, then saves the figure.
+        """
+        self.axes = draw_heatmap(
+            self.fig, self.title, self.displayed_values, self.displayed_extent, self.displayed_levels
+        )
+        super().save_fig(path)
+
+    def figure_job(self, path: str) -> FigureJob:
+        """
+        Saving of displayed values, that can be run in other process.
+        """
+        return FigureJob(
+            render_heatmap,
+            path,
+            title=self.title,
+            values=np.array(self.displayed_values, copy=True),
+            extent=list(self.displayed_extent),
+            levels=tuple(self.displayed_levels),
         )
-
-        if self.cax is not None:
-            self.cax.remove()
-
-        self.divider = make_axes_locatable(self.axes)
-        self.cax = self.divider.append_axes("right", size="5%", pad=0.05)
-        self.color_bar = self.fig.colorbar(self.im, cax=self.cax, orientation="vertical")
-
-        self.axes.set_xlim([x_min, x_max])
-        self.axes.set_ylim([y_min, y_max])
-
-        self.show()
-        # self.axes.legend(loc="upper right", fancybox=True)
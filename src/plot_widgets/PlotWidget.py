@@ -16,7 +16,10 @@ class PlotType(enum.Enum):
 
 
 class PlotWidget(QWidget):
-    def __init__(self, plot_type: PlotType):
+    def __init__(self, plot_type: PlotType, embed_figure: bool = True):
+        """
+        Figure that is not embedded is not displayed, it's drawn only to be saved with 'save_fig'.
+        """
         super().__init__()
 
         self.fig = Figure(figsize=(6, 6), dpi=90)
@@ -44,6 +47,9 @@ class PlotWidget(QWidget):
         self.setLayout(self.main_layout)
 
         self.figure_canvas = FigureCanvas(self.fig)
+        if not embed_figure:
+            return
+
         try:
             self.main_layout.addWidget(NavigationToolbar2QT(self.figure_canvas, self))
             self.main_layout.addWidget(self.figure_canvas)
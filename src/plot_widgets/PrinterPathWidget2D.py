@@ -1,17 +1,79 @@
+from typing import Optional
+
+import numpy as np
+from PyQt6.QtCore import QTimer
 from vector3d.vector import Vector
 
+from functionalities.GridDescriptor import GridDescriptor
 from functionalities.PrinterPath import PrinterPath, Square
+from plot_widgets.figure_rendering import FigureJob, render_printer_path
 from plot_widgets.PlotWidget import PlotType, PlotWidget
 
+# at most that many extruder and antenna points are drawn, when more of them are visible,
+# only every n-th row and column of the visible part of the grid is drawn
+MAX_NO_DISPLAYED_POINTS = 4000
+# head marker is redrawn at most 20 times per second, no matter how often position changes
+HEAD_MARKER_REFRESH_INTERVAL_IN_MS = 50
+
+
+def path_turning_points(positions: np.ndarray) -> np.ndarray:
+    """
+    Indices of first and last point of path, and of every point where the path changes direction.
+    Line through these points is the same as line through all points of path.
+    """
+    if len(positions) < 3:
+        return np.arange(len(positions))
+
+    moves = np.diff(positions, axis=0)
+    lengths = np.linalg.norm(moves, axis=1, keepdims=True)
+    directions = moves / np.where(lengths == 0, 1, lengths)
+    turns = np.flatnonzero(np.any(np.abs(np.diff(directions, axis=0)) > 1e-9, axis=1)) + 1
+
+    return np.concatenate([[0], turns, [len(positions) - 1]])
+
+
+def visible_steps(
+    step_indices: np.ndarray, grid: GridDescriptor, offset: Vector, x_range, y_range, max_no_points: int
+) -> np.ndarray:
+    """
+    Path steps of grid points shifted by 'offset' that are within x and y range.
+    Only every n-th row and column of them is returned, so there are no more than 'max_no_points' of them.
+    """
+    first_col, last_col = grid.x.index_range(x_range[0] - offset.x, x_range[1] - offset.x)
+    first_row, last_row = grid.y.index_range(y_range[0] - offset.y, y_range[1] - offset.y)
+
+    no_visible_points = (last_col - first_col) * (last_row - first_row)
+    stride = max(1, int(np.ceil(np.sqrt(no_visible_points / max_no_points))))
+
+    steps = step_indices[first_row:last_row:stride, first_col:last_col:stride].ravel()
+    return steps[steps >= 0]
+
 
 class PrinterPathWidget2D(PlotWidget):
     """
     Widget displaying path that printer takes while scanning the sample
+
+    Redrawing takes the same time no matter how many points the path has. Path line is drawn through
+    its turning points only, measurement points are decimated when zoomed out,
+    and extruder position marker is drawn over cached background.
     """
 
     def __init__(self, printer_path: PrinterPath, **kwargs):
         super().__init__(plot_type=PlotType.Path2D)
         self.printer_path = None
+
+        # path step measured in every cell of the grid, -1 where there is none
+        self.step_indices = np.empty((0, 0), dtype=int)
+        self.extruder_points = None
+        self.antenna_points = None
+
+        # figure without head marker, marker alone is drawn over it
+        self.background = None
+        self.head_marker = None
+        self.head_position: Optional[Vector] = None
+        self.is_head_marker_outdated = False
+        self.figure_canvas.mpl_connect("draw_event", self._on_draw)
+
         self.update_from_printer_path(printer_path)
 
     def add_labels_and_axes_styling(self):
@@ -43,8 +105,8 @@ class PrinterPathWidget2D(PlotWidget):
         self.update_from_printer_path(self.printer_path)
 
     def add_scan_bounding_box(self):
+        # bounding box is already closed loop
         bounding_box_points = self.printer_path.get_extruder_bounding_box()
-        bounding_box_points.append(bounding_box_points[0])
 
         self.axes.plot(
             *zip(*bounding_box_points),
@@ -53,29 +115,61 @@ class PrinterPathWidget2D(PlotWidget):
         )
 
     def add_extruder_path(self):
-        path = [(point.x, point.y) for point in self.printer_path.get_extruder_path()]
+        path = self.printer_path.extruder_positions[:, :2]
 
         self.axes.plot(
-            *zip(*path),
+            *path[path_turning_points(path)].T,
             color="royalblue",
             label="Extruder path",
         )
 
-        self.axes.scatter(
-            *zip(*path),
+        # points in view are set by '_update_displayed_points'
+        self.extruder_points = self.axes.scatter(
+            [],
+            [],
             color="red",
             label="Measurement extruder points",
         )
 
     def add_antenna_path(self):
-        path = [(point.x, point.y) for point in self.printer_path.get_antenna_path()]
         # TODO this should be circles not scatter
-        self.axes.scatter(
-            *zip(*path),
+        self.antenna_points = self.axes.scatter(
+            [],
+            [],
             color="gold",
             label="Measurement points",
         )
 
+    def add_head_marker(self):
+        (self.head_marker,) = self.axes.plot(
+            [],
+            [],
+            marker="X",
+            markersize=10,
+            color="black",
+            linestyle="none",
+            label="Extruder position",
+            animated=True,
+        )
+
+        if self.head_position is not None:
+            self.head_marker.set_data([self.head_position.x], [self.head_position.y])
+
+    def _update_displayed_points(self, *_):
+        if self.printer_path is None or self.printer_path.grid.is_empty:
+            return
+
+        x_range, y_range = sorted(self.axes.get_xlim()), sorted(self.axes.get_ylim())
+
+        for points, positions, offset in (
+            (self.extruder_points, self.printer_path.extruder_positions, self.printer_path.antenna_offset),
+            (self.antenna_points, self.printer_path.antenna_positions, Vector(0, 0, 0)),
+        ):
+            steps = visible_steps(
+                self.step_indices, self.printer_path.grid, offset, x_range, y_range, MAX_NO_DISPLAYED_POINTS
+            )
+            points.set_offsets(positions[steps, :2])
+
     @staticmethod
     def from_settings(
         pass_height: float,
@@ -91,11 +185,70 @@ class PrinterPathWidget2D(PlotWidget):
 
     def update_from_printer_path(self, printer_path: PrinterPath):
         self.printer_path = printer_path
+        self.background = None
         self.axes.cla()
         self.add_labels_and_axes_styling()
 
+        grid_indices = printer_path.get_grid_indices()
+        self.step_indices = np.full(printer_path.grid.shape, -1, dtype=int)
+        self.step_indices[grid_indices[:, 0], grid_indices[:, 1]] = np.arange(len(grid_indices))
+
         self.add_scan_bounding_box()
         self.add_extruder_path()
         self.add_antenna_path()
+        self.add_head_marker()
         self._zoom_to_show_data()
+        self._update_displayed_points()
         self.axes.legend(loc="upper right", fancybox=True)
+
+        # axes callbacks are cleared together with axes, so they are connected again
+        self.axes.callbacks.connect("xlim_changed", self._update_displayed_points)
+        self.axes.callbacks.connect("ylim_changed", self._update_displayed_points)
+
+    def set_head_position(self, position: Vector):
+        """
+        Moves extruder position marker, marker is redrawn by timer.
+        """
+        self.head_position = position
+        if not self.is_head_marker_outdated:
+            self.is_head_marker_outdated = True
+            QTimer.singleShot(HEAD_MARKER_REFRESH_INTERVAL_IN_MS, self.refresh_head_marker)
+
+    def refresh_head_marker(self):
+        self.is_head_marker_outdated = False
+        if self.head_marker is None or self.head_position is None:
+            return
+
+        self.head_marker.set_data([self.head_position.x], [self.head_position.y])
+        if self.background is None:
+            self.figure_canvas.draw_idle()
+            return
+
+        self.figure_canvas.restore_region(self.background)
+        self.axes.draw_artist(self.head_marker)
+        self.figure_canvas.blit(self.fig.bbox)
+
+    def _on_draw(self, event):
+        self.background = self.figure_canvas.copy_from_bbox(self.fig.bbox)
+        if self.head_marker is not None:
+            self.axes.draw_artist(self.head_marker)
+
+    def figure_job(self, path: str) -> FigureJob:
+        """
+        Saving of displayed path, that can be run in other process.
+        """
+        bounding_box = self.printer_path.get_extruder_bounding_box()
+        path_line = self.printer_path.extruder_positions[:, :2]
+
+        return FigureJob(
+            render_printer_path,
+            path,
+            title=self.get_title(),
+            bounding_box=np.array(bounding_box, dtype=float),
+            extruder_path=path_line[path_turning_points(path_line)],
+            extruder_points=np.array(self.extruder_points.get_offsets(), dtype=float),
+            antenna_points=np.array(self.antenna_points.get_offsets(), dtype=float),
+            x_limits=tuple(self.axes.get_xlim()),
+            y_limits=tuple(self.axes.get_ylim()),
+            head_position=None if self.head_position is None else (self.head_position.x, self.head_position.y),
+        )
@@ -0,0 +1,131 @@
+# figures drawn without Qt, from plain arrays. They are saved in background processes,
+# so this module must not import Qt nor plot widgets
+from typing import TYPE_CHECKING, Callable, List, Optional, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    # matplotlib is imported on first drawing, so figure jobs can be created without loading plotting stack
+    from matplotlib.figure import Figure
+
+HEATMAP_COLOR_MAP = "Wistia"
+# size of saved figure, the same as size of figures displayed by plot widgets
+FIGURE_SIZE_IN_INCHES = (6, 6)
+FIGURE_DPI = 90
+
+
+class FigureJob:
+    """
+    Figure to be saved in 'path', by calling 'render(path, **kwargs)'.
+    'render' is module level function and kwargs hold only plain data, so job can be sent to other process.
+    """
+
+    def __init__(self, render: Callable, path: str, **kwargs):
+        self.render = render
+        self.path = path
+        self.kwargs = kwargs
+
+    def run(self) -> str:
+        self.render(self.path, **self.kwargs)
+        return self.path
+
+
+def _new_figure() -> "Figure":
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=FIGURE_SIZE_IN_INCHES, dpi=FIGURE_DPI)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+def fill_missing(values: np.ndarray) -> np.ndarray:
+    """
+    Copy of values with points that were not measured filled with mean of measured values.
+    """
+    values = np.array(values, dtype=float, copy=True)
+    if not np.isnan(values).all():
+        values[np.isnan(values)] = np.mean(values[~np.isnan(values)])
+    return values
+
+
+def levels_of(values: np.ndarray) -> Tuple[float, float]:
+    """
+    Color levels spanning all measured values.
+    """
+    if np.isnan(values).all():
+        return 0, 1
+
+    low, high = float(np.nanmin(values)), float(np.nanmax(values))
+    return (low, high) if low < high else (low - 0.5, high + 0.5)
+
+
+def draw_heatmap(fig: "Figure", title: str, values: np.ndarray, extent: List[float], levels: Tuple[float, float]):
+    from mpl_toolkits.axes_grid1 import make_axes_locatable
+
+    # figure is drawn from scratch, color bar axes of previous drawing are removed with it
+    fig.clear()
+    axes = fig.add_subplot(111)
+    axes.set_title(title)
+    axes.axis("square")
+    axes.set_xlabel("X [mm]")
+    axes.set_ylabel("Y [mm]")
+
+    im = axes.imshow(
+        fill_missing(values),
+        cmap=HEATMAP_COLOR_MAP,
+        vmin=levels[0],
+        vmax=levels[1],
+        extent=extent,
+        interpolation="none",
+        origin="lower",
+    )
+
+    color_bar_axes = make_axes_locatable(axes).append_axes("right", size="5%", pad=0.05)
+    fig.colorbar(im, cax=color_bar_axes, orientation="vertical")
+
+    axes.set_xlim(extent[:2])
+    axes.set_ylim(extent[2:])
+    return axes
+
+
+def render_heatmap(path: str, title: str, values: np.ndarray, extent: List[float], levels: Tuple[float, float]):
+    fig = _new_figure()
+    draw_heatmap(fig, title, values, extent, levels)
+    fig.savefig(path)
+
+
+def render_printer_path(
+    path: str,
+    title: str,
+    bounding_box: np.ndarray,
+    extruder_path: np.ndarray,
+    extruder_points: np.ndarray,
+    antenna_points: np.ndarray,
+    x_limits: Tuple[float, float],
+    y_limits: Tuple[float, float],
+    head_position: Optional[Tuple[float, float]] = None,
+):
+    """
+    Saves path of the printer, drawn the same way as by PrinterPathWidget2D.
+    """
+    fig = _new_figure()
+    axes = fig.add_subplot(111)
+    axes.grid()
+    axes.set_title(title)
+    axes.axis("square")
+    axes.set_xlabel("X [mm]")
+    axes.set_ylabel("Y [mm]")
+
+    axes.plot(*np.asarray(bounding_box).T, color="darkred", label="Printer extruder movement path boundaries")
+    axes.plot(*np.asarray(extruder_path).T, color="royalblue", label="Extruder path")
+    axes.scatter(*np.asarray(extruder_points).reshape(-1, 2).T, color="red", label="Measurement extruder points")
+    axes.scatter(*np.asarray(antenna_points).reshape(-1, 2).T, color="gold", label="Measurement points")
+
+    if head_position is not None:
+        axes.plot(*head_position, marker="X", markersize=10, color="black", linestyle="none", label="Extruder position")
+
+    axes.set_xlim(x_limits)
+    axes.set_ylim(y_limits)
+    axes.legend(loc="upper right", fancybox=True)
+    fig.savefig(path)
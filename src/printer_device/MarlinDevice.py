@@ -1,11 +1,30 @@
 import logging
+import re
 import time
-from typing import Optional, Tuple
+from collections import deque
+from typing import Dict, List, Optional, Tuple
 
 import serial.tools.list_ports
-from serial import Serial, SerialException
-
-from printer_device.PrinterDevice import PrinterDevice, static_vars
+from serial import Serial
+
+from functionalities.ConnectionCache import PRINTER_CONNECTION, ConnectionCache
+from functionalities.serial_port_discovery import (
+    MARLIN_DESCRIPTIONS,
+    MARLIN_USB_IDS,
+    find_serial_device,
+    port_matches,
+)
+from printer_device.PrinterDevice import (
+    MOTION_COMPLETION_TIMEOUT_MARGIN_IN_SECONDS,
+    PrinterDevice,
+)
+
+# number of lines sent ahead of acknowledgements, Marlin default command buffer size (BUFSIZE)
+DEFAULT_WINDOW_SIZE = 4
+# sent lines are stored for resend requests
+MAX_NO_STORED_LINES = 1000
+# boot banner is read until no line arrives for this long, lines left after it are ignored by stream
+BOOT_BANNER_LINE_TIMEOUT_IN_SECONDS = 0.2
 
 
 class MarlinDevice(PrinterDevice):
@@ -22,9 +41,14 @@ class MarlinDevice(PrinterDevice):
 
     _device: Serial  # pyserial connector device
 
-    def __init__(self, device: Serial) -> None:
+    def __init__(self, device: Serial, window_size: int = DEFAULT_WINDOW_SIZE) -> None:
         super().__init__()
         self._device = device
+        self.window_size = window_size
+
+        # number of the last line sent to device, None until line numbers are reset with M110
+        self.line_number: Optional[int] = None
+        self._sent_lines: Dict[int, str] = {}
 
     def __del__(self) -> None:
         self._device.close()
@@ -63,15 +87,23 @@ class MarlinDevice(PrinterDevice):
         return MarlinDevice(device=device)
 
     @staticmethod
-    def connect() -> "MarlinDevice":
+    def connect(connection_cache: Optional[ConnectionCache] = None) -> "MarlinDevice":
         """
         **Search for port on which printed device is connected to pc.**
+        Ports of USB bridges known to run Marlin are probed first, then all remaining ports.
         If none is found, error is raised.
 
         Marlin device runs on: **baudrate set to 250000**
 
+        Parameters
+        ----------
+        **connection_cache : Optional[ConnectionCache], optional**
+            Port of last successful connection is tried first, and is updated on success, **by default None**
+
         Raises
         ------
+        **SerialException**
+            If none of the ports answered with Marlin start message
 
         Returns
         -------
@@ -80,39 +112,44 @@ class MarlinDevice(PrinterDevice):
         """
         baudrate: int = 250000
         timeout: int = 1
-        device: Optional[Serial] = None
-        available_ports = serial.tools.list_ports.comports()
-
-        print("List all available ports:")
-        for port, desc, hwid in sorted(available_ports):
-            print(f"\t port: '{port}', desc: '{desc}', hwid: '{hwid}")
-
-        for port, desc, hwid in sorted(available_ports):
-            print(f"Connected connecting to:\n\t port: '{port}', desc: '{desc}', hwid: '{hwid}")
-            try:
-                device: Serial = Serial(port=str(port), baudrate=baudrate, timeout=timeout)
-                print("Serial port is Open'")
-                resp: bytes = device.readline()
-                print(f"Answer: '{resp}'")
 
-                if resp != MarlinDevice._SUCCESSFUL_CONNECTION_MESSAGE:
-                    raise SerialException()
+        def probe(port: str) -> Optional[Serial]:
+            device = Serial(port=port, baudrate=baudrate, timeout=timeout)
+            resp: bytes = device.readline()
+            print(f"Answer from '{port}': '{resp}'")
 
-                print(f"Connected on port: '{port}', desc: '{desc}', hwid: '{hwid}")
-                logging.info(f"Connected on port: '{port}', desc: '{desc}', hwid: '{hwid}")
-                break
+            if resp != MarlinDevice._SUCCESSFUL_CONNECTION_MESSAGE:
+                device.close()
+                return None
 
-            except SerialException:
-                device = None
-                continue
-
-        if device is None:
-            raise SerialException("Device not found")
+            logging.info(f"Connected on port: '{port}'")
+            return device
 
+        available_ports = serial.tools.list_ports.comports()
+        cached_port = (
+            None if connection_cache is None else connection_cache.find_port(PRINTER_CONNECTION, available_ports)
+        )
+
+        device, port = find_serial_device(
+            probe,
+            lambda port: port_matches(port, MARLIN_USB_IDS, MARLIN_DESCRIPTIONS),
+            available_ports,
+            preferred_ports=[] if cached_port is None else [cached_port],
+            probe_unmatched_ports=True,
+        )
+
+        firmware = None
+        device.timeout = BOOT_BANNER_LINE_TIMEOUT_IN_SECONDS
+        resp = device.readline().decode("utf-8")
         while resp != "":
-            if resp is not None:
-                resp = device.readline().decode("utf-8")
-                print(resp.strip())
+            print(resp.strip())
+            if firmware is None and "Marlin" in resp:
+                firmware = resp.strip()
+            resp = device.readline().decode("utf-8")
+        device.timeout = timeout
+
+        if connection_cache is not None:
+            connection_cache.store(PRINTER_CONNECTION, port, baudrate, firmware)
 
         return MarlinDevice(device=device)
 
@@ -120,41 +157,179 @@ class MarlinDevice(PrinterDevice):
         """
         send command to Anycubic S device, then await response
 
+        Motion commands are followed by 'M400', which is acknowledged only after the planner is empty,
+        so function returns as soon as the move is finished.
+
         Args:
             command (str): g-code command
 
         Returns:
             str: response from device
         """
+        return self.send_batch_and_await([command])[0]
+
+    def send_batch_and_await(self, commands: List[str]) -> List[Tuple[str, str]]:
+        """
+        send all commands to Anycubic S device, then await responses
+
+        Commands are streamed, up to 'window_size' lines are sent ahead of acknowledgements,
+        so the firmware planner is never starved between moves.
+
+        Args:
+            commands (List[str]): g-code commands
+
+        Returns:
+            List[Tuple[str, str]]: response from device for each command
+        """
+
+        prepared_commands = [self._prepare_command(command) for command in commands]
+        if None in prepared_commands:
+            return [("error", "error") for _ in commands]
+
+        time_of_execution = 0
+        for command in prepared_commands:
+            print(f"req:  {command}")
+            time_of_execution += self.predict_time_of_execution(command)
+            self._update_position_from_command(command)
+
+        if any(PrinterDevice.is_motion_command(command) for command in prepared_commands):
+            prepared_commands.append("M400")
+
+        responses = self.stream(prepared_commands, time_of_execution + MOTION_COMPLETION_TIMEOUT_MARGIN_IN_SECONDS)
+
+        return [
+            ("no message received", "no message received") if resp is None else (resp, resp[2:-3])
+            for resp in responses[: len(commands)]
+        ]
+
+    def stream(self, commands: List[str], timeout: float) -> List[Optional[str]]:
+        """
+        **Sends numbered, checksummed lines, keeping up to 'window_size' of them unacknowledged.**
+
+        Every line received by Marlin is answered with 'ok'. Line that is corrupted, or does not follow
+        the last accepted line number, is rejected with 'Resend: N' followed by 'ok',
+        then all lines starting from N are sent again.
+        Line numbers are reset with 'M110' before the first line sent to the device.
+
+        Parameters
+        ----------
+        **commands : List[str]**
+            G-code commands without line numbers, in order of execution
+
+        **timeout : float**
+            Time in seconds after which streaming is abandoned
+
+        Returns
+        -------
+        **List[Optional[str]]**
+            'ok' message for every command, None if command was not acknowledged before timeout
+        """
+        if self.line_number is None:
+            commands = ["M110 N0"] + commands
+            first_line_number = 0
+            no_reset_lines = 1
+        else:
+            first_line_number = self.line_number + 1
+            no_reset_lines = 0
+
+        line_numbers = list(range(first_line_number, first_line_number + len(commands)))
+        for line_number, command in zip(line_numbers, commands):
+            self._sent_lines[line_number] = MarlinDevice.cs_line(f"N{line_number} {command}") + "\n"
+        self.line_number = line_numbers[-1]
+
+        for line_number in [n for n in self._sent_lines if n < self.line_number - MAX_NO_STORED_LINES]:
+            del self._sent_lines[line_number]
+
+        pending = deque(line_numbers)
+        # lines accepted by firmware are acknowledged in order of sending
+        in_flight = deque()
+        responses = {}
+
+        # lines sent after the rejected one are rejected as well, each with another 'Resend: N'
+        no_ignored_resends = 0
+        is_rejection_ok = False
+        last_error = b""
+
+        deadline = time.time() + timeout
+        while (len(pending) > 0 or len(in_flight) > 0) and time.time() < deadline:
+            lines_to_send = []
+            while len(pending) > 0 and len(in_flight) + len(lines_to_send) < self.window_size:
+                lines_to_send.append(pending.popleft())
+
+            if len(lines_to_send) > 0:
+                self._device.write(bytearray("".join(self._sent_lines[n] for n in lines_to_send), "ascii"))
+                in_flight.extend(lines_to_send)
+
+            resp = self._device.readline()
+            if len(resp) == 0:
+                continue
+
+            print(f"resp: {resp}")
+
+            if resp.startswith(b"Error"):
+                last_error = resp
+                continue
+
+            resend_line_number = MarlinDevice.parse_resend_request(resp)
+            if resend_line_number is not None:
+                is_rejection_ok = True
+
+                if no_ignored_resends > 0:
+                    no_ignored_resends -= 1
+                    continue
+
+                rejected = [n for n in in_flight if n >= resend_line_number]
+                in_flight = deque(n for n in in_flight if n < resend_line_number)
+
+                # corrupted line is rejected itself, lost line is reported by the line following it
+                if b"Line Number" in last_error:
+                    no_ignored_resends = max(len(rejected) - 2, 0)
+                else:
+                    no_ignored_resends = max(len(rejected) - 1, 0)
+
+                pending = deque(range(resend_line_number, self.line_number + 1))
+                print(f"resending from line: {resend_line_number}")
+                continue
+
+            if resp.startswith(b"ok"):
+                if is_rejection_ok:
+                    is_rejection_ok = False
+                elif len(in_flight) > 0:
+                    responses[in_flight.popleft()] = str(resp)
+
+        if len(pending) > 0 or len(in_flight) > 0:
+            print(f"streamed lines were not acknowledged in {timeout} s")
+
+        return [responses.get(n) for n in line_numbers[no_reset_lines:]]
 
-        if "F" not in command:
-            command += f" F {self.speed}"
+    @staticmethod
+    def parse_resend_request(resp: bytes) -> Optional[int]:
+        match = re.match(rb"(Resend|rs)\s*:?\s*N?(\d+)", resp)
+        if match is None:
+            return None
+        return int(match.group(2))
 
+    def _prepare_command(self, command: str) -> Optional[str]:
+        """
+        Validates command, adds default feed rate to moves.
+        Returns None if command would move extruder outside of printer bounds.
+        """
         if "G1" in command:
+            if "F" not in command:
+                command += f" F {self.speed}"
+
             new_position = PrinterDevice.parse_move_command_to_position(command)
             if new_position is not None:
                 if new_position[0] < 0 or new_position[0] > self.x_size:
-                    return "error", "error"
+                    return None
                 if new_position[1] < 0 or new_position[1] > self.y_size:
-                    return "error", "error"
+                    return None
                 if new_position[2] < 0 or new_position[2] > self.z_size:
-                    return "error", "error"
+                    return None
 
-        command = MarlinDevice.no_line(command)
-        command = MarlinDevice.cs_line(command)
-
-        if command[-1] != "\n":
-            command += "\n"
-
-        print(f"req:  {command}")
-        print(f"predicted_time_of_execution: {self.predict_time_of_execution(command)}")
-
-        self._device.write(bytearray(command, "ascii"))
-        time.sleep(self.predict_time_of_execution(command))
-
-        resp = str(self._device.readline())
-        print(f"resp: {resp}")
+        return command.strip()
 
+    def _update_position_from_command(self, command: str) -> None:
         if "G1" in command:
             self.set_current_position_from_string(command)
 
@@ -163,8 +338,6 @@ class MarlinDevice(PrinterDevice):
             self.current_position.y = 0
             self.current_position.z = 0
 
-        return (resp, resp[2:-3])
-
     @staticmethod
     def checksum(line: str) -> int:
         cs = 0
@@ -177,13 +350,5 @@ class MarlinDevice(PrinterDevice):
     def cs_line(line: str) -> str:
         return line + "*" + str(MarlinDevice.checksum(line))
 
-    @staticmethod
-    @static_vars(line_counter=1)
-    def no_line(line: str) -> str:
-        line = f"N{MarlinDevice.no_line.line_counter} " + line + f" N{MarlinDevice.no_line.line_counter}"
-        MarlinDevice.no_line.line_counter += 1
-
-        return line
-
     def startup_procedure(self):
         self.send_and_await("G28")
@@ -0,0 +1,181 @@
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# limits of Prusa MK3S, for X, Y and Z axis
+DEFAULT_MAX_FEEDRATE = (200, 200, 12)  # mm/s, M203
+DEFAULT_MAX_ACCELERATION = (1000, 1000, 200)  # mm/s^2, M201
+DEFAULT_ACCELERATION = 1250  # mm/s^2, M204
+DEFAULT_JERK = (8, 8, 0.4)  # mm/s, M205
+
+# time of sending command and receiving response
+DEFAULT_COMMAND_OVERHEAD_IN_SECONDS = 0.2
+DEFAULT_HOMING_TIME_IN_SECONDS = 20
+
+
+def row_feedrate(point_spacing: float, sample_period: float, movement_speed: float) -> float:
+    """
+    Feed rate in mm/min, at which at least one sample is taken per grid point, limited by movement speed.
+    """
+    if point_spacing <= 0 or sample_period <= 0:
+        return movement_speed
+
+    return min(movement_speed, point_spacing / sample_period * 60)
+
+
+class MotionModel:
+    """
+    **Kinematic limits of printer, used to predict time of moves.**
+
+    Every move is a trapezoidal velocity profile along the move direction. Feed rate, acceleration
+    and jerk are limited by the per axis limits, scaled by the share of the axis in the move.
+    Head stops in every measurement point, so moves start and end at the speed allowed by jerk.
+    """
+
+    def __init__(
+        self,
+        max_feedrate: Sequence[float] = DEFAULT_MAX_FEEDRATE,
+        max_acceleration: Sequence[float] = DEFAULT_MAX_ACCELERATION,
+        acceleration: float = DEFAULT_ACCELERATION,
+        jerk: Sequence[float] = DEFAULT_JERK,
+        command_overhead_in_seconds: float = DEFAULT_COMMAND_OVERHEAD_IN_SECONDS,
+        homing_time_in_seconds: float = DEFAULT_HOMING_TIME_IN_SECONDS,
+    ):
+        self.max_feedrate = np.array(max_feedrate, dtype=float)
+        self.max_acceleration = np.array(max_acceleration, dtype=float)
+        self.acceleration = acceleration
+        self.jerk = np.array(jerk, dtype=float)
+        self.command_overhead_in_seconds = command_overhead_in_seconds
+        self.homing_time_in_seconds = homing_time_in_seconds
+
+    def to_gcode(self) -> List[str]:
+        """
+        Commands setting limits of this model in printer firmware.
+        """
+        x, y, z = self.max_acceleration
+        commands = [f"M201 X{x:g} Y{y:g} Z{z:g}"]
+
+        x, y, z = self.max_feedrate
+        commands.append(f"M203 X{x:g} Y{y:g} Z{z:g}")
+
+        commands.append(f"M204 P{self.acceleration:g} R{self.acceleration:g} T{self.acceleration:g}")
+
+        x, y, z = self.jerk
+        commands.append(f"M205 X{x:.2f} Y{y:.2f} Z{z:.2f}")
+        return commands
+
+    def _move_profiles(self, displacements: np.ndarray, feedrate: float) -> Tuple[np.ndarray, ...]:
+        """
+        Returns distance, start (and end) speed, cruise speed and acceleration of every move.
+        """
+        displacements = np.atleast_2d(np.asarray(displacements, dtype=float))
+        no_axes = displacements.shape[1]
+
+        distance = np.linalg.norm(displacements, axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # share of every axis in the move, limits of axes that do not move do not apply
+            direction = np.abs(displacements) / distance[:, np.newaxis]
+
+            def limit(axis_limits: np.ndarray) -> np.ndarray:
+                return np.min(
+                    np.where(direction > 0, axis_limits[:no_axes] / direction, np.inf),
+                    axis=1,
+                )
+
+            speed = np.minimum(feedrate / 60, limit(self.max_feedrate))
+            acceleration = np.minimum(self.acceleration, limit(self.max_acceleration))
+            start_speed = np.minimum(speed, limit(self.jerk))
+
+        # moves too short to reach cruise speed have triangular profile
+        speed = np.minimum(speed, np.sqrt(start_speed**2 + acceleration * distance))
+        return distance, start_speed, speed, acceleration
+
+    def predict_moves_time(self, displacements: np.ndarray, feedrate: float) -> np.ndarray:
+        """
+        **Predicts time of moves.**
+
+        Parameters
+        ----------
+        **displacements : np.ndarray**
+            Move vectors, array of shape (n, 2) or (n, 3), in mm
+
+        **feedrate : float**
+            Requested feed rate in mm/min, as in 'F' parameter of G1 command
+
+        Returns
+        -------
+        **np.ndarray**
+            Time of every move in seconds, including command overhead
+        """
+        distance, start_speed, speed, acceleration = self._move_profiles(displacements, feedrate)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # distance needed to reach speed, and to slow down from it
+            acceleration_distance = (speed**2 - start_speed**2) / acceleration
+            move_time = 2 * (speed - start_speed) / acceleration + (distance - acceleration_distance) / speed
+
+        return np.where(distance > 0, move_time, 0) + self.command_overhead_in_seconds
+
+    def predict_distance_travelled(
+        self, displacement: Sequence[float], feedrate: float, elapsed: np.ndarray
+    ) -> np.ndarray:
+        """
+        **Predicts distance from start of the move, travelled after 'elapsed' seconds since the move started.**
+
+        Parameters
+        ----------
+        **displacement : Sequence[float]**
+            Move vector in mm
+
+        **feedrate : float**
+            Requested feed rate in mm/min
+
+        **elapsed : np.ndarray**
+            Times since start of the move, in seconds
+
+        Returns
+        -------
+        **np.ndarray**
+            Distance in mm, for every elapsed time
+        """
+        distance, start_speed, speed, acceleration = (
+            value[0] for value in self._move_profiles(np.asarray(displacement, dtype=float)[np.newaxis, :], feedrate)
+        )
+        elapsed = np.asarray(elapsed, dtype=float)
+
+        if distance == 0:
+            return np.zeros_like(elapsed)
+
+        acceleration_time = (speed - start_speed) / acceleration
+        acceleration_distance = (speed**2 - start_speed**2) / (2 * acceleration)
+        cruise_time = (distance - 2 * acceleration_distance) / speed
+        move_time = 2 * acceleration_time + cruise_time
+
+        time = np.clip(elapsed, 0, move_time)
+        time_to_end = move_time - time
+
+        return np.where(
+            time < acceleration_time,
+            start_speed * time + acceleration * time**2 / 2,
+            np.where(
+                time < acceleration_time + cruise_time,
+                acceleration_distance + speed * (time - acceleration_time),
+                distance - (start_speed * time_to_end + acceleration * time_to_end**2 / 2),
+            ),
+        )
+
+    def predict_move_time(self, start: Sequence[float], end: Sequence[float], feedrate: float) -> float:
+        displacement = np.asarray(end, dtype=float) - np.asarray(start, dtype=float)
+        return float(self.predict_moves_time(displacement[np.newaxis, :], feedrate)[0])
+
+    def predict_travel_time(self, points: np.ndarray, feedrate: float, start: Optional[np.ndarray] = None) -> float:
+        """
+        Predicts time of visiting 'points' (array of shape (n, 2) or (n, 3)) in given order.
+        """
+        if start is not None:
+            points = np.vstack([start, points])
+
+        if len(points) < 2:
+            return 0.0
+
+        return float(np.sum(self.predict_moves_time(np.diff(points, axis=0), feedrate)))
@@ -1,11 +1,19 @@
 import enum
-import math
+import re
+import time
 from abc import abstractmethod
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 
 import serial.tools.list_ports
+from serial import Serial
 from vector3d.vector import Vector
 
+from printer_device.MotionModel import MotionModel
+
+# motion is awaited until firmware reports it complete,
+# predicted time of execution extended by this margin is used only as a timeout
+MOTION_COMPLETION_TIMEOUT_MARGIN_IN_SECONDS = 10
+
 
 def static_vars(**kwargs) -> callable:
     def decorate(func):
@@ -60,13 +68,14 @@ class PrinterDevice:
         self.y_size: float = 220
         self.z_size: float = 200
         self.speed: float = 900
-        self.printer_home_time: int = 20
+        self.motion_model = MotionModel()
 
     def predict_time_of_execution(self, command):
-        constant_connection_time = 0.2
-
         if "G28" in command:
-            return self.printer_home_time
+            return self.motion_model.homing_time_in_seconds
+
+        if "G4" in command:
+            return self.parse_dwell_command_to_seconds(command) + self.motion_model.command_overhead_in_seconds
 
         if "G1" in command:
             dest = self.parse_move_command_to_position(command)
@@ -74,14 +83,13 @@ class PrinterDevice:
             if self.current_position.x is None or self.current_position.y is None or self.current_position.z is None:
                 return 10
             else:
-                dist_2_dest = math.sqrt(
-                    pow(self.current_position.x - dest[0], 2)
-                    + pow(self.current_position.y - dest[1], 2)
-                    + pow(self.current_position.z - dest[2], 2)
+                feedrate = self.parse_feedrate(command)
+                return self.motion_model.predict_move_time(
+                    (self.current_position.x, self.current_position.y, self.current_position.z),
+                    dest,
+                    self.speed if feedrate is None else feedrate,
                 )
 
-                return (dist_2_dest / self.speed) * 60 + constant_connection_time
-
         return 0
 
     def get_current_position(self) -> Vector:
@@ -148,6 +156,95 @@ class PrinterDevice:
                 f"F{speed}"
             )
 
+    def send_batch_and_await(self, commands: List[str]) -> list:
+        """
+        **Send multiple commands and await until all of them are executed.**
+        Devices that are able to queue commands in firmware planner should override this function,
+        default implementation sends commands one after another.
+
+        Parameters
+        ----------
+        **commands : List[str]**
+            Commands send to device, in order of execution
+
+        Returns
+        -------
+        **list**
+            Responses from device, one for each command
+        """
+        return [self.send_and_await(command) for command in commands]
+
+    @staticmethod
+    def is_motion_command(command: str) -> bool:
+        """
+        Commands that are queued in firmware planner, and acknowledged before they are finished.
+        """
+        return re.search(r"\bG(0|1|4|28)\b", command.upper()) is not None
+
+    @staticmethod
+    def await_ok_responses(device: Serial, no_responses: int, timeout: float) -> List[str]:
+        """
+        **Reads lines from device until 'no_responses' 'ok' messages are received.**
+        Busy and echo messages are skipped, empty readouts (serial timeout) are retried until 'timeout' passes.
+
+        Parameters
+        ----------
+        **device : Serial**
+            Serial connection to the printer
+
+        **no_responses : int**
+            Number of 'ok' messages to await, one for every sent command
+
+        **timeout : float**
+            Time in seconds after which awaiting is abandoned
+
+        Returns
+        -------
+        **List[str]**
+            Received 'ok' messages, fewer than 'no_responses' if timeout has passed
+        """
+        deadline = time.time() + timeout
+        responses = []
+
+        while len(responses) < no_responses and time.time() < deadline:
+            resp = device.readline()
+            if len(resp) == 0:
+                continue
+
+            print(f"resp: {resp}")
+            if resp.startswith(b"ok"):
+                responses.append(str(resp))
+
+        if len(responses) < no_responses:
+            print(f"motion completion was not reported in {timeout} s")
+
+        return responses
+
+    @staticmethod
+    def parse_feedrate(command: str) -> Optional[float]:
+        """
+        Returns 'F' parameter (mm/min) of move command, None if it is not given.
+        """
+        feedrate = re.search(r"\bf\s*(\d+(\.\d+)?)", command.casefold())
+        if feedrate is None:
+            return None
+        return float(feedrate.group(1))
+
+    @staticmethod
+    def parse_dwell_command_to_seconds(command: str) -> float:
+        """
+        Returns dwell time of 'G4' command, 'P' parameter is in milliseconds, 'S' parameter in seconds.
+        """
+        milliseconds = re.search(r"\bp\s*(\d+(\.\d+)?)", command.casefold())
+        if milliseconds is not None:
+            return float(milliseconds.group(1)) / 1000
+
+        seconds = re.search(r"\bs\s*(\d+(\.\d+)?)", command.casefold())
+        if seconds is not None:
+            return float(seconds.group(1))
+
+        return 0
+
     @staticmethod
     def parse_move_command_to_position(
         command: str,
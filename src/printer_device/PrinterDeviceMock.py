@@ -33,6 +33,9 @@ class PrinterDeviceMock(PrinterDevice):
             print("Home all Axis")
             time.sleep(1)
 
+        elif "G4" in command:
+            time.sleep(PrinterDevice.parse_dwell_command_to_seconds(command))
+
         return "this is mock"
 
     @staticmethod
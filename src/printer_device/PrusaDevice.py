@@ -5,9 +5,18 @@ from typing import Optional
 import serial.tools.list_ports
 
 # from PrinterDevice import Device
-from serial import Serial, SerialException
+from serial import Serial
 
-from printer_device.PrinterDevice import PrinterDevice
+from functionalities.ConnectionCache import PRINTER_CONNECTION, ConnectionCache
+from functionalities.serial_port_discovery import (
+    PRUSA_USB_IDS,
+    find_serial_device,
+    port_matches,
+)
+from printer_device.PrinterDevice import (
+    MOTION_COMPLETION_TIMEOUT_MARGIN_IN_SECONDS,
+    PrinterDevice,
+)
 
 
 class PrusaDevice(PrinterDevice):
@@ -62,43 +71,45 @@ class PrusaDevice(PrinterDevice):
         return PrusaDevice(device)
 
     @staticmethod
-    def connect() -> "PrusaDevice":
+    def connect(connection_cache: Optional[ConnectionCache] = None) -> "PrusaDevice":
         baudrate: int = 115200
         timeout: int = 1
-        device: Optional[Serial] = None
-        available_ports = serial.tools.list_ports.comports()
-
-        print("List all available ports:")
-        for port, desc, hwid in sorted(available_ports):
-            print(f"\t port: '{port}', desc: '{desc}', hwid: '{hwid}")
-
-        for port, desc, hwid in sorted(available_ports):
-            print(f"Scanning port: '{port}', desc: '{desc}', hwid: '{hwid}")
-            try:
-                device: Serial = Serial(port=str(port), baudrate=baudrate, timeout=timeout)
-                print("Serial port is Open'")
-
-                resp = device.readline().decode("utf-8")
-                print(f"Answer: '{resp}'")
-
-                if resp != "start":
-                    raise SerialException()
 
-                print(f"Connected on port: '{port}', desc: '{desc}', hwid: '{hwid}")
-
-                break
+        def probe(port: str) -> Optional[Serial]:
+            device = Serial(port=port, baudrate=baudrate, timeout=timeout)
+            resp = device.readline().decode("utf-8")
+            print(f"Answer from '{port}': '{resp}'")
 
-            except SerialException:
-                device = None
-                continue
+            if resp.strip() != "start":
+                device.close()
+                return None
 
-        if not device:
-            raise SerialException("Device not found")
+            return device
 
+        available_ports = serial.tools.list_ports.comports()
+        cached_port = (
+            None if connection_cache is None else connection_cache.find_port(PRINTER_CONNECTION, available_ports)
+        )
+
+        device, port = find_serial_device(
+            probe,
+            lambda port: port_matches(port, PRUSA_USB_IDS, ["Prusa"]),
+            available_ports,
+            preferred_ports=[] if cached_port is None else [cached_port],
+            probe_unmatched_ports=True,
+        )
+
+        firmware = None
+        resp = device.readline().decode("utf-8")
         while resp != "":
             print(resp.strip())
+            if firmware is None and "Marlin" in resp:
+                firmware = resp.strip()
             resp = device.readline().decode("utf-8")
 
+        if connection_cache is not None:
+            connection_cache.store(PRINTER_CONNECTION, port, baudrate, firmware)
+
         return PrusaDevice(device=device)
 
     class PrusaPrinterStatus(enum.Enum):
@@ -109,6 +120,9 @@ class PrusaDevice(PrinterDevice):
         """
         send command to Prusa device, then await response
 
+        Motion commands are followed by 'M400', which is acknowledged only after the planner is empty,
+        so function returns as soon as the move is finished.
+
         Args:
             command (str): g-code command
 
@@ -116,15 +130,13 @@ class PrusaDevice(PrinterDevice):
             str: response from device
         """
 
-        if "F" not in command:
+        if "G1" in command and "F" not in command:
             command += f" F {self.speed}"
 
         if command[-1] != "\n":
             command += "\n"
 
-        print(f"predicted_time_of_execution: {self.predict_time_of_execution(command)}")
-        self._device.write(bytearray(command, "utf-8"))
-        time.sleep(self.predict_time_of_execution(command))
+        timeout = self.predict_time_of_execution(command) + MOTION_COMPLETION_TIMEOUT_MARGIN_IN_SECONDS
 
         if "G1" in command:
             self.set_current_position_from_string(command)
@@ -132,31 +144,25 @@ class PrusaDevice(PrinterDevice):
         elif "G28" in command:
             self.current_position.from_tuple((0, 0, 0))
 
-        resp = ""
-        retries = 5
-        r = 0
+        if PrinterDevice.is_motion_command(command):
+            command += "M400\n"
+
+        self._device.write(bytearray(command, "utf-8"))
+
         # after every successfully completed command, prusa returns 'ok' message
-        while "ok" not in resp:
-            resp = str(self._device.readline().decode("utf-8"))
-            print(resp.strip())
-            if "busy" in resp:
-                print("awaiting 2s")
-                time.sleep(2)
-            else:
-                r += 1
-                if r > retries:
-                    return "none message"
+        responses = PrinterDevice.await_ok_responses(self._device, command.count("\n"), timeout)
+        if len(responses) == 0:
+            return "none message"
+
+        return responses[0]
 
     def startup_procedure(self) -> None:
         """
         send default parameters (motor speed, acceleration, model check, etc...)
         and zero all the axies
         """
-        commands = [
-            "M201 X1000 Y1000 Z200 E5000",
-            "M203 X200 Y200 Z12 E120",
-            "M204 P1250 R1250 T1250",
-            "M205 X8.00 Y8.00 Z0.40 E4.50",
+        # limits of motion model are sent to firmware, so predicted time of moves matches the printer
+        commands = self.motion_model.to_gcode() + [
             "M205 S0 T0",
             "M107",
             'M862.3 P "MK3S"',
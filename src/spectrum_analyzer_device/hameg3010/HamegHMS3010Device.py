@@ -1,18 +1,39 @@
 import logging
-from time import sleep
-from typing import Tuple
+import time
+from typing import Optional, Tuple
 
 import usb.core
 import usb.util
 
+from spectrum_analyzer_device.hameg3010.LevelRetryPolicy import LevelRetryPolicy
+
+# device that does not report operation complete within measurement time and this margin is queried anyway
+OPERATION_COMPLETE_TIMEOUT_MARGIN_IN_SECONDS = 2
+# levels outside this window are measured again, unless other retry policy is passed
+DEFAULT_MIN_LEVEL_IN_DBM = -22
+DEFAULT_MAX_LEVEL_IN_DBM = -16
+# the whole answer to '*opc?', other lines (like level left from previous query) are skipped
+OPERATION_COMPLETE_RESPONSE = b"1"
+
 
 class HamegHMS3010Device:
-    def __init__(self, device_handle: usb.core.Device) -> None:
+    def __init__(self, device_handle: usb.core.Device, retry_policy: Optional[LevelRetryPolicy] = None) -> None:
         self.device_handle: usb.core.Device = device_handle
+        self.retry_policy = (
+            LevelRetryPolicy(DEFAULT_MIN_LEVEL_IN_DBM, DEFAULT_MAX_LEVEL_IN_DBM)
+            if retry_policy is None
+            else retry_policy
+        )
         self.device_handle.set_configuration()
 
+        # receiver mode settings last sent to device, None if unknown
+        self.frequency: Optional[int] = None
+        self.measurement_time: Optional[int] = None
+
     @staticmethod
-    def connect_using_vid_pid(id_vendor: int, id_product: int) -> "HamegHMS3010Device":
+    def connect_using_vid_pid(
+        id_vendor: int, id_product: int, retry_policy: Optional[LevelRetryPolicy] = None
+    ) -> "HamegHMS3010Device":
         print(f"connecting do device with pid: {id_product}, vid: {id_vendor}")
 
         device = usb.core.find(idVendor=id_vendor, idProduct=id_product)
@@ -21,10 +42,10 @@ class HamegHMS3010Device:
             raise ValueError(f"Device is not found vid: {hex(id_vendor)} pid: {hex(id_product)}")
 
         logging.debug(f"connected do device with vid: {hex(id_vendor)} pid: {hex(id_product)}")
-        return HamegHMS3010Device(device)
+        return HamegHMS3010Device(device, retry_policy)
 
     @staticmethod
-    def automatically_connect():
+    def automatically_connect(retry_policy: Optional[LevelRetryPolicy] = None):
         # TODO this does nothing
         dev = usb.core.find(find_all=True)
 
@@ -34,28 +55,106 @@ class HamegHMS3010Device:
             print(f"Hexadecimal VendorID= {hex(cfg.idVendor)} ProductID= {hex(cfg.idProduct)}")
         print(f"no devices found: {no_devices_found}")
 
-        return HamegHMS3010Device.connect_using_vid_pid(id_vendor=0x403, id_product=0xED72)
+        return HamegHMS3010Device.connect_using_vid_pid(id_vendor=0x403, id_product=0xED72, retry_policy=retry_policy)
 
     def get_level(
         self,
         frequency: int,
         measurement_time: int = 1,
     ) -> float:
-        level: float = 0
-
-        while level < -22 or level > -16:
-            self.send_await_resp(f"rmode:mtime {measurement_time}")
-            self.send_await_resp(f"rmode:frequency {frequency}")
-
-            sleep(measurement_time)
+        self.prepare_measurement(frequency, measurement_time)
+        return self.read_level(measurement_time)
+
+    def prepare_measurement(self, frequency: int, measurement_time: int = 1) -> None:
+        """
+        **Sends receiver mode setup, without triggering measurement.**
+        Can be called while printer is still moving to the measurement point.
+        Only settings that differ from the ones already set on device are sent, joined in a single write.
+        """
+        commands = []
+        if measurement_time != self.measurement_time:
+            commands.append(f"rmode:mtime {measurement_time}")
+        if frequency != self.frequency:
+            commands.append(f"rmode:frequency {frequency}")
+
+        if len(commands) == 0:
+            return
+
+        # state is unknown until device accepts the commands
+        self.frequency = self.measurement_time = None
+        self._send_await_resp(";:".join(commands))
+
+        self.frequency = frequency
+        self.measurement_time = measurement_time
+
+    def read_level(self, measurement_time: int = 1) -> float:
+        """
+        **Triggers measurement on previously prepared frequency and returns measured level.**
+        """
+        self.trigger_measurement(measurement_time)
+        return self.fetch_level(measurement_time)
+
+    def trigger_measurement(self, measurement_time: int = 1) -> None:
+        """
+        **Starts measurement on previously prepared frequency, returns as soon as trigger is sent.**
+        Device integrates signal for 'get_measurement_duration' seconds from now.
+        """
+        self._send_str("trigger:software;*opc?")
+
+    def fetch_level(self, measurement_time: int = 1) -> float:
+        """
+        **Returns level of measurement started by 'trigger_measurement'.**
+        Level is queried as soon as device reports that measurement is complete,
+        rejected readouts are triggered and measured again, as retry policy says.
+        """
+        is_triggered = True
+
+        def measure_level() -> Optional[float]:
+            nonlocal is_triggered
+            if not is_triggered:
+                self.trigger_measurement(measurement_time)
+            is_triggered = False
+
+            self._await_operation_complete(measurement_time + OPERATION_COMPLETE_TIMEOUT_MARGIN_IN_SECONDS)
+
+            _, level_raw = self._send_await_resp("rmode:level?")
+            return self._parse_level(level_raw)
+
+        return self.retry_policy.measure(measure_level)
+
+    def get_measurement_duration(self, measurement_time: int = 1) -> Optional[float]:
+        """
+        **Time in seconds during which device integrates signal, after measurement is triggered.**
+        """
+        return measurement_time
+
+    def _await_operation_complete(self, timeout: float) -> bool:
+        # '*opc?' is answered with line '1' only after triggered measurement is finished
+        deadline = time.time() + timeout
+
+        while time.time() < deadline:
+            try:
+                resp = self.device_handle.read(0x81, 1_000_000, 100)
+            except usb.core.USBTimeoutError:
+                continue
+
+            if bytes(resp).strip() == OPERATION_COMPLETE_RESPONSE:
+                return True
+
+        logging.warning(f"operation complete was not reported in {timeout} s")
+        return False
 
-            _, level_raw = self.send_await_resp("rmode:level?")
-
-            level_raw = level_raw[2:-1]  # TODO this line might be unnecessary
+    @staticmethod
+    def _parse_level(level_raw: Optional[str]) -> Optional[float]:
+        if level_raw is None:
+            return None
 
-            level = float(level_raw[level_raw.find(",") + 1 :])
+        level_raw = level_raw[2:-1]  # TODO this line might be unnecessary
 
-        return float(level)
+        try:
+            return float(level_raw[level_raw.find(",") + 1 :])
+        except ValueError:
+            return None
 
     def _send_str(self, command: str):
         if not isinstance(command, str):
@@ -90,6 +189,12 @@ class HamegHMS3010Device:
         return None, None
 
     def send_await_resp(self, cmd: str) -> Tuple[bytearray, str]:
+        if "?" not in cmd:
+            # command might have changed receiver mode settings
+            self.frequency = self.measurement_time = None
+        return self._send_await_resp(cmd)
+
+    def _send_await_resp(self, cmd: str) -> Tuple[bytearray, str]:
         self._send_str(command=cmd)
         return self._await_resp()
 
@@ -1,12 +1,13 @@
 import random
 import time
-from typing import Any
+from typing import Any, Optional
 
 
 class HamegHMS3010DeviceMock:
     def __init__(self) -> None:
         self.current_frequency = 1_000_000
         self.receiver_mode = "RMODE"
+        self.trigger_time = time.monotonic()
 
     @staticmethod
     def connect_using_vid_pid(id_vendor: int, id_product: int):
@@ -22,12 +23,37 @@ class HamegHMS3010DeviceMock:
         frequency: int,
         measurement_time: int = 1,
     ) -> float:
-        time.sleep(0.5)
+        self.prepare_measurement(frequency, measurement_time)
+        return self.read_level(measurement_time)
+
+    def prepare_measurement(self, frequency: int, measurement_time: int = 1) -> None:
+        self.current_frequency = frequency
+
+    def read_level(self, measurement_time: int = 1) -> float:
+        self.trigger_measurement(measurement_time)
+        return self.fetch_level(measurement_time)
+
+    def trigger_measurement(self, measurement_time: int = 1) -> None:
+        self.trigger_time = time.monotonic()
+
+    def fetch_level(self, measurement_time: int = 1) -> float:
+        # measurement lasts 0.5 s from trigger
+        time.sleep(max(0.0, self.trigger_time + 0.5 - time.monotonic()))
         measurement_value = -20 + (2 * ((random.random() * 2) - 1))
         return float(measurement_value)
 
+    def get_measurement_duration(self, measurement_time: int = 1) -> Optional[float]:
+        return 0.5
+
     def send_await_resp(self, cmd: str) -> Any:
         cmd = cmd.casefold()
+        if ";" in cmd:
+            # several commands joined in a single write, response is returned for the last one
+            response = None
+            for command in cmd.split(";"):
+                response = self.send_await_resp(command.lstrip(":"))
+            return response
+
         if cmd == "*idn?":
             return (
                 "1'HAMEG IDN 123324.1231",
@@ -1,64 +1,165 @@
 import logging
-from time import sleep
+import time
 from typing import Optional
 
 import serial.tools.list_ports
-from serial import Serial, SerialException
+from serial import Serial
+
+from functionalities.ConnectionCache import ANALYZER_CONNECTION, ConnectionCache
+from functionalities.serial_port_discovery import (
+    HAMEG_HO720_USB_IDS,
+    find_serial_device,
+    port_matches,
+)
+from spectrum_analyzer_device.hameg3010.LevelRetryPolicy import LevelRetryPolicy
+
+# device that does not report operation complete within measurement time and this margin is queried anyway
+OPERATION_COMPLETE_TIMEOUT_MARGIN_IN_SECONDS = 2
+# the whole answer to '*opc?', other lines (like level left from previous query) are skipped
+OPERATION_COMPLETE_RESPONSE = b"1"
 
 
 class HamegHMS3010DeviceSerial:
-    def __init__(self, device: Serial) -> None:
+    def __init__(self, device: Serial, retry_policy: Optional[LevelRetryPolicy] = None) -> None:
         self.device_handle = device
+        self.retry_policy = LevelRetryPolicy() if retry_policy is None else retry_policy
         # self.device_handle.set_configuration()
 
+        # receiver mode settings last sent to device, None if unknown
+        self.frequency: Optional[int] = None
+        self.measurement_time: Optional[int] = None
+
     @staticmethod
-    def automatically_connect():
+    def automatically_connect(
+        connection_cache: Optional[ConnectionCache] = None, retry_policy: Optional[LevelRetryPolicy] = None
+    ):
+        """
+        Connects to Hameg on serial port, port of last successful connection in 'connection_cache' is tried first.
+        Levels are read with 'retry_policy', by default without level window.
+        """
         baudrate: int = 250000
         timeout: int = 1
-        device: Optional[Serial] = None
-        available_ports = serial.tools.list_ports.comports()
 
-        for port, desc, hwid in sorted(available_ports):
-            print(f"Connected connecting to:\n\t port: '{port}', desc: '{desc}', hwid: '{hwid}")
+        def probe(port: str) -> Serial:
+            device = Serial(port=port, baudrate=baudrate, timeout=timeout)
+            resp: bytes = device.readline()
+            print(f"Answer from '{port}': '{resp}'")
 
-            if "HAMEG HO720 USB Serial Port (VCP)" in desc:
-                try:
-                    device: Serial = Serial(port=str(port), baudrate=baudrate, timeout=timeout)
-                    print("Serial port is Open'")
-                    resp: bytes = device.readline()
-                    print(f"Answer: '{resp}'")
+            logging.info(f"Connected on port: '{port}'")
+            return device
 
-                    print(f"Connected on port: '{port}', desc: '{desc}', hwid: '{hwid}")
-                    logging.info(f"Connected on port: '{port}', desc: '{desc}', hwid: '{hwid}")
-                    break
+        available_ports = serial.tools.list_ports.comports()
+        cached_port = (
+            None if connection_cache is None else connection_cache.find_port(ANALYZER_CONNECTION, available_ports)
+        )
 
-                except SerialException:
-                    device = None
-                    continue
+        device, port = find_serial_device(
+            probe,
+            lambda port: port_matches(port, HAMEG_HO720_USB_IDS, ["HAMEG HO720 USB Serial Port (VCP)"]),
+            available_ports,
+            preferred_ports=[] if cached_port is None else [cached_port],
+        )
 
-        if device is None:
-            raise SerialException("Device not found")
+        if connection_cache is not None:
+            connection_cache.store(ANALYZER_CONNECTION, port, baudrate)
 
-        return HamegHMS3010DeviceSerial(device)
+        return HamegHMS3010DeviceSerial(device, retry_policy)
 
     def get_level(
         self,
         frequency: int,
         measurement_time: int = 1,
     ) -> float:
-        self.send_await_resp(f"rmode:mtime {measurement_time}")
-        self.send_await_resp(f"rmode:frequency {frequency}")
-        self.send_await_resp("trigger:software")
+        self.prepare_measurement(frequency, measurement_time)
+        return self.read_level(measurement_time)
+
+    def prepare_measurement(self, frequency: int, measurement_time: int = 1) -> None:
+        """
+        **Sends receiver mode setup, without triggering measurement.**
+        Can be called while printer is still moving to the measurement point.
+        Only settings that differ from the ones already set on device are sent, joined in a single write.
+        """
+        commands = []
+        if measurement_time != self.measurement_time:
+            commands.append(f"rmode:mtime {measurement_time}")
+        if frequency != self.frequency:
+            commands.append(f"rmode:frequency {frequency}")
+
+        if len(commands) == 0:
+            return
+
+        # state is unknown until device accepts the commands
+        self.frequency = self.measurement_time = None
+        self._send_await_resp(";:".join(commands))
+
+        self.frequency = frequency
+        self.measurement_time = measurement_time
+
+    def read_level(self, measurement_time: int = 1) -> float:
+        """
+        **Triggers measurement on previously prepared frequency and returns measured level.**
+        """
+        self.trigger_measurement(measurement_time)
+        return self.fetch_level(measurement_time)
+
+    def trigger_measurement(self, measurement_time: int = 1) -> None:
+        """
+        **Starts measurement on previously prepared frequency, returns as soon as trigger is sent.**
+        Device integrates signal for 'get_measurement_duration' seconds from now.
+        """
+        self._send_str("trigger:software;*opc?")
+
+    def fetch_level(self, measurement_time: int = 1) -> float:
+        """
+        **Returns level of measurement started by 'trigger_measurement'.**
+        Level is queried as soon as device reports that measurement is complete,
+        rejected readouts are triggered and measured again, as retry policy says.
+        """
+        is_triggered = True
+
+        def measure_level() -> Optional[float]:
+            nonlocal is_triggered
+            if not is_triggered:
+                self.trigger_measurement(measurement_time)
+            is_triggered = False
+
+            self._await_operation_complete(measurement_time + OPERATION_COMPLETE_TIMEOUT_MARGIN_IN_SECONDS)
+
+            _, level_raw = self._send_await_resp("rmode:level?")
+            return self._parse_level(level_raw)
+
+        return self.retry_policy.measure(measure_level)
+
+    def get_measurement_duration(self, measurement_time: int = 1) -> Optional[float]:
+        """
+        **Time in seconds during which device integrates signal, after measurement is triggered.**
+        """
+        return measurement_time
+
+    def _await_operation_complete(self, timeout: float) -> bool:
+        # '*opc?' is answered with line '1' only after triggered measurement is finished,
+        # readline returns empty response every time serial timeout passes
+        deadline = time.time() + timeout
+
+        while time.time() < deadline:
+            resp: bytes = self.device_handle.readline()
+            if resp.strip() == OPERATION_COMPLETE_RESPONSE:
+                return True
 
-        sleep(measurement_time + 0.4)
+        logging.warning(f"operation complete was not reported in {timeout} s")
+        return False
 
-        _, level_raw = self.send_await_resp("rmode:level?")
+    @staticmethod
+    def _parse_level(level_raw: Optional[str]) -> Optional[float]:
+        if level_raw is None:
+            return None
 
         level_raw = level_raw[2:-1]  # TODO this line might be unnecessary
 
-        level = level_raw[level_raw.find(",") + 1 :]
-
-        return float(level)
+        try:
+            return float(level_raw[level_raw.find(",") + 1 :])
+        except ValueError:
+            return None
 
     def _send_str(self, command: str):
         if not isinstance(command, str):
@@ -86,6 +187,12 @@ class HamegHMS3010DeviceSerial:
         return None, None
 
     def send_await_resp(self, cmd: str) -> tuple[bytes, str] | tuple[None, None]:
+        if "?" not in cmd:
+            # command might have changed receiver mode settings
+            self.frequency = self.measurement_time = None
+        return self._send_await_resp(cmd)
+
+    def _send_await_resp(self, cmd: str) -> tuple[bytes, str] | tuple[None, None]:
         self._send_str(command=cmd)
         return self._await_resp()
 
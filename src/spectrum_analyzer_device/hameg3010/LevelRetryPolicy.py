@@ -0,0 +1,59 @@
+import logging
+from typing import Callable, Optional
+
+DEFAULT_MAX_RETRIES = 3
+
+
+class LevelRetryPolicy:
+    """
+    **Bounded retry of level readouts.**
+
+    Measurement is repeated when device returns no level, or level outside [min_level, max_level] range,
+    at most 'max_retries' times. When all retries are used, last out of range level is returned.
+    """
+
+    def __init__(
+        self,
+        min_level: Optional[float] = None,
+        max_level: Optional[float] = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+    ):
+        self.min_level = min_level
+        self.max_level = max_level
+        self.max_retries = max_retries
+
+    def is_level_valid(self, level: float) -> bool:
+        if self.min_level is not None and level < self.min_level:
+            return False
+        if self.max_level is not None and level > self.max_level:
+            return False
+        return True
+
+    def measure(self, measure_level: Callable[[], Optional[float]]) -> float:
+        """
+        **Calls 'measure_level' until it returns valid level, or retries run out.**
+
+        Parameters
+        ----------
+        **measure_level : Callable[[], Optional[float]]**
+            Performs single measurement, returns None if device did not respond with level
+
+        Returns
+        -------
+        **float**
+            Measured level
+        """
+        level = None
+
+        for no_attempt in range(self.max_retries + 1):
+            level = measure_level()
+
+            if level is not None and self.is_level_valid(level):
+                return level
+
+            logging.warning(f"level readout rejected: {level}, attempt: {no_attempt + 1}/{self.max_retries + 1}")
+
+        if level is None:
+            raise ValueError("Device did not respond with measured level")
+
+        return level
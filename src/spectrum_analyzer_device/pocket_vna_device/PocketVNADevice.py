@@ -1,3 +1,5 @@
+from typing import Optional
+
 from spectrum_analyzer_device.pocket_vna_device.pocketvnaAPI.pocketvna import (
     ConnectionInterfaceCode,
     Driver,
@@ -10,6 +12,7 @@ class PocketVnaDevice:
     def __init__(self):
         print(f"pocketvnaAPI Version: {driver_version()}")
         self.driver = Driver()
+        self.frequency = int(1.32 * 10**9)
         self.driver.connect_to_first(ConnectionInterfaceCode.CIface_HID)
 
         if not self.driver.valid():
@@ -24,9 +27,20 @@ class PocketVnaDevice:
         aggregate_samples=200,
         params=NetworkParams.S11,
     ):
-        frequency = int(frequency)
+        self.prepare_measurement(frequency, aggregate_samples)
+        return self.read_level(aggregate_samples, params)
+
+    def prepare_measurement(self, frequency=int(1.32 * 10**9), aggregate_samples=200):
+        # pocket vna receives frequency together with scan request, so it's only stored for later
+        self.frequency = int(frequency)
+
+    def read_level(self, aggregate_samples=200, params=NetworkParams.S11):
         aggregate_samples = int(aggregate_samples)
-        return self.driver.single_scan(frequency, aggregate_samples, params)[0]
+        return self.driver.single_scan(self.frequency, aggregate_samples, params)[0]
+
+    def get_measurement_duration(self, aggregate_samples=200) -> Optional[float]:
+        # scan duration depends on frequency and number of samples, it is not known upfront
+        return None
 
     @staticmethod
     def automatically_connect():
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from spectrum_analyzer_device.pocket_vna_device.pocketvnaAPI.pocketvna import (
     NetworkParams,
 )
@@ -18,6 +20,13 @@ class PocketVnaDeviceMock:
         aggregate_samples=100,
         params: NetworkParams = NetworkParams.ALL,
     ):
+        self.prepare_measurement(frequency, aggregate_samples)
+        return self.read_level(aggregate_samples, params)
+
+    def prepare_measurement(self, frequency=2_280_000_000, aggregate_samples=100):
+        pass
+
+    def read_level(self, aggregate_samples=100, params: NetworkParams = NetworkParams.ALL):
         import random
 
         # randomly generate the real part
@@ -27,6 +36,9 @@ class PocketVnaDeviceMock:
         # resulting complex number
         return complex(x, y)
 
+    def get_measurement_duration(self, aggregate_samples=100) -> Optional[float]:
+        return None
+
     def close(self):
         # this is mock device, it doesn't need to be deleted
         pass
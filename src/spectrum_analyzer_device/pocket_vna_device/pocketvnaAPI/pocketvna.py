@@ -69,11 +69,9 @@ def priv_compound(bn, architect=""):
 
 
 def priv_load_library_(orig_fn):
-    global PVNA
     pocketvna_path = os.path.dirname(os.path.abspath(__file__))
     try:
-        PVNA = CDLL(orig_fn)
-        return PVNA
+        return CDLL(orig_fn)
     except OSError:
         another_try = priv_find_file_(priv_compound(BaseName, ARCH), pocketvna_path)
         if another_try is None:
@@ -91,8 +89,7 @@ def priv_load_library_(orig_fn):
             + '"'
         )
 
-        PVNA = CDLL(another_try)
-        return PVNA
+        return CDLL(another_try)
 
 
 def priv_get_lib_name_():
@@ -110,7 +107,63 @@ def priv_get_lib_name_():
         return priv_compound(BaseName, ARCH)
 
 
-pocketvna = priv_load_library_(priv_get_lib_name_())
+class priv_LazyFunction_:
+    """
+    Function of native library. Its argtypes and restype are kept until library is loaded, on first call.
+    """
+
+    def __init__(self, library, name):
+        self.__dict__["_library"] = library
+        self.__dict__["_name"] = name
+        self.__dict__["_attributes"] = {}
+        self.__dict__["_function"] = None
+
+    def __setattr__(self, attribute, value):
+        self._attributes[attribute] = value
+        if self._function is not None:
+            setattr(self._function, attribute, value)
+
+    def __getattr__(self, attribute):
+        if attribute in self._attributes:
+            return self._attributes[attribute]
+        return getattr(self._resolve(), attribute)
+
+    def _resolve(self):
+        if self._function is None:
+            function = getattr(self._library.load(), self._name)
+            for attribute, value in self._attributes.items():
+                setattr(function, attribute, value)
+            self.__dict__["_function"] = function
+        return self._function
+
+    def __call__(self, *args):
+        return self._resolve()(*args)
+
+
+class priv_LazyLibrary_:
+    """
+    Native library loaded on first call of any of its functions, so importing this module does not require it.
+    """
+
+    def __init__(self):
+        self._library = None
+        self._functions = {}
+
+    def load(self):
+        if self._library is None:
+            self._library = priv_load_library_(priv_get_lib_name_())
+        return self._library
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        if name not in self._functions:
+            self._functions[name] = priv_LazyFunction_(self, name)
+        return self._functions[name]
+
+
+pocketvna = priv_LazyLibrary_()
 
 PVNA = pocketvna
 
@@ -0,0 +1,40 @@
+"""
+Builders of objects used by tests of more modules, each fixture returns function creating the object.
+"""
+
+import pytest
+from serial.tools.list_ports_common import ListPortInfo
+from vector3d.vector import Vector
+
+from functionalities.GridDescriptor import GridAxis, GridDescriptor
+from functionalities.PrinterPath import PrinterPath, Square
+
+
+@pytest.fixture
+def create_grid():
+    def create(no_rows: int, no_cols: int) -> GridDescriptor:
+        return GridDescriptor(GridAxis(10, 0.5, no_cols), GridAxis(-3, 0.5, no_rows))
+
+    return create
+
+
+@pytest.fixture
+def create_port():
+    def create(device: str, vid=None, pid=None, serial_number=None, description="n/a") -> ListPortInfo:
+        port = ListPortInfo(device, skip_link_detection=True)
+        port.vid, port.pid, port.serial_number, port.description = vid, pid, serial_number, description
+        return port
+
+    return create
+
+
+@pytest.fixture
+def create_printer_path():
+    def create(
+        width: float = 6, length: float = 6, bed_size: float = 210, measurement_radius: float = 3
+    ) -> PrinterPath:
+        return PrinterPath(
+            4, Vector(0, 0, 0), Square(10, 10, width, length), measurement_radius, Vector(bed_size, bed_size, 210)
+        )
+
+    return create
@@ -0,0 +1,66 @@
+from vector3d.vector import Vector
+
+from functionalities.AdaptiveRefinement import (
+    coarse_pass_steps,
+    planned_no_points,
+    refinement_pass_steps,
+)
+from functionalities.Measurement import Measurement
+from functionalities.PrinterPath import Square
+
+
+def create_measurement() -> Measurement:
+    # 10 x 10 grid
+    return Measurement(
+        pass_height=4,
+        antenna_offset=Vector(0, 0, 0),
+        scanned_area=Square(10, 10, 9, 9),
+        measurement_radius=1,
+        printer_bed_size=Vector(210, 210, 210),
+    )
+
+
+def measure_coarse_pass(measurement: Measurement):
+    for index in coarse_pass_steps(measurement, coarse_step=3):
+        row, col = measurement.grid_indices[index]
+        # defect close to the last row and column
+        measurement.add_measurement_by_index(index, -10 if (row, col) == (9, 9) else -20)
+
+
+class TestAdaptiveRefinement:
+    def test_coarse_pass_covers_grid_corners(self):
+        measurement = create_measurement()
+        steps = coarse_pass_steps(measurement, coarse_step=3)
+
+        assert steps == sorted(steps)
+        assert {tuple(measurement.grid_indices[index]) for index in steps} == {
+            (row, col) for row in (0, 3, 6, 9) for col in (0, 3, 6, 9)
+        }
+
+    def test_cells_around_defect_are_refined_first(self):
+        measurement = create_measurement()
+        measure_coarse_pass(measurement)
+
+        steps = refinement_pass_steps(measurement, point_budget=12, coarse_step=3)
+        refined_cells = {tuple(measurement.grid_indices[index]) for index in steps}
+
+        assert len(steps) == 12
+        assert refined_cells == {(row, col) for row in range(6, 10) for col in range(6, 10)} - {
+            (6, 6),
+            (6, 9),
+            (9, 6),
+            (9, 9),
+        }
+
+    def test_homogeneous_sample_is_not_refined(self):
+        measurement = create_measurement()
+        for index in coarse_pass_steps(measurement, coarse_step=3):
+            measurement.add_measurement_by_index(index, -20)
+
+        assert refinement_pass_steps(measurement, point_budget=100, coarse_step=3) == []
+
+    def test_planned_no_points_is_not_smaller_than_coarse_pass(self):
+        printer_path = create_measurement().printer_path
+
+        assert planned_no_points(printer_path, 50, coarse_step=3) == 50
+        assert planned_no_points(printer_path, 1, coarse_step=3) == 16
@@ -0,0 +1,46 @@
+from functionalities.ConnectionCache import (
+    ANALYZER_CONNECTION,
+    PRINTER_CONNECTION,
+    ConnectionCache,
+)
+
+
+class TestConnectionCache:
+    def test_connection_is_stored_for_every_kind_of_device(self, create_port, tmp_path):
+        cache = ConnectionCache(str(tmp_path / "mdma" / "connections.json"))
+        cache.store(PRINTER_CONNECTION, create_port("/dev/ttyACM0", 0x2341, 0x0042, "A1"), 250000, "Marlin 2.0")
+        cache.store(ANALYZER_CONNECTION, create_port("/dev/ttyUSB0", 0x0403, 0xED72), 250000)
+
+        cache = ConnectionCache(str(tmp_path / "mdma" / "connections.json"))
+        assert cache.get(PRINTER_CONNECTION) == {
+            "port": "/dev/ttyACM0",
+            "vid": 0x2341,
+            "pid": 0x0042,
+            "serial_number": "A1",
+            "baudrate": 250000,
+            "firmware": "Marlin 2.0",
+        }
+        assert cache.get(ANALYZER_CONNECTION)["port"] == "/dev/ttyUSB0"
+
+        cache.forget(PRINTER_CONNECTION)
+        assert cache.get(PRINTER_CONNECTION) is None
+
+    def test_missing_cache_is_empty(self, create_port, tmp_path):
+        cache = ConnectionCache(str(tmp_path / "connections.json"))
+
+        assert cache.get(PRINTER_CONNECTION) is None
+        assert cache.find_port(PRINTER_CONNECTION, [create_port("/dev/ttyACM0")]) is None
+
+    def test_replugged_device_is_found_by_serial_number(self, create_port, tmp_path):
+        cache = ConnectionCache(str(tmp_path / "connections.json"))
+        cache.store(PRINTER_CONNECTION, create_port("/dev/ttyACM0", 0x2341, 0x0042, "A1"), 250000)
+
+        ports = [create_port("/dev/ttyACM0", 0x1A86, 0x7523), create_port("/dev/ttyACM1", 0x2341, 0x0042, "A1")]
+        assert cache.find_port(PRINTER_CONNECTION, ports).device == "/dev/ttyACM1"
+
+    def test_device_without_serial_number_is_found_on_the_same_port(self, create_port, tmp_path):
+        cache = ConnectionCache(str(tmp_path / "connections.json"))
+        cache.store(ANALYZER_CONNECTION, create_port("/dev/ttyUSB1", 0x0403, 0xED72), 250000)
+
+        assert cache.find_port(ANALYZER_CONNECTION, [create_port("/dev/ttyUSB1", 0x0403, 0xED72)]) is not None
+        assert cache.find_port(ANALYZER_CONNECTION, [create_port("/dev/ttyUSB1", 0x1A86, 0x7523)]) is None
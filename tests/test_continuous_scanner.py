@@ -0,0 +1,96 @@
+import time
+from typing import List
+
+import numpy as np
+from vector3d.vector import Vector
+
+from functionalities.ContinuousScanner import ContinuousScanner
+from printer_device.MotionModel import MotionModel
+
+
+class FakePrinter:
+    """
+    Moves along X axis as predicted by motion model, send_and_await returns when the move is done.
+    """
+
+    def __init__(self, motion_model: MotionModel):
+        self.motion_model = motion_model
+        self.commands: List[str] = []
+        self.position = 0.0
+        # start time, start position, target and feed rate of every move
+        self.moves = []
+
+    def send_and_await(self, command: str):
+        self.commands.append(command)
+        params = {param[0]: float(param[1:]) for param in command.split()[1:]}
+
+        self.moves.append((time.monotonic(), self.position, params["X"], params["F"]))
+        time.sleep(self.motion_model.predict_move_time((self.position,), (params["X"],), params["F"]))
+
+        self.position = params["X"]
+        return "ok"
+
+    def get_x(self, at_time: float) -> float:
+        started_moves = [move for move in self.moves if move[0] <= at_time]
+        if len(started_moves) == 0:
+            return 0.0
+
+        move_start, start, target, feedrate = started_moves[-1]
+        travelled = self.motion_model.predict_distance_travelled((target - start,), feedrate, at_time - move_start)
+        return start + float(np.sign(target - start) * travelled)
+
+
+class FakeAnalyzer:
+    """
+    Measured level is equal to X position of the head in the middle of the reading,
+    no matter how long the reading thread was suspended.
+    """
+
+    def __init__(self, printer: FakePrinter, sample_period: float):
+        self.printer = printer
+        self.sample_period = sample_period
+
+    def prepare_measurement(self, frequency, measurement_time):
+        pass
+
+    def read_level(self, measurement_time):
+        begin = time.monotonic()
+        time.sleep(self.sample_period)
+        return self.printer.get_x((begin + time.monotonic()) / 2)
+
+    def get_measurement_duration(self, measurement_time):
+        return self.sample_period
+
+
+def create_scanner(sample_period: float) -> ContinuousScanner:
+    motion_model = MotionModel(command_overhead_in_seconds=0)
+    printer = FakePrinter(motion_model)
+    analyzer = FakeAnalyzer(printer, sample_period)
+    return ContinuousScanner(printer, analyzer, 1e9, 1, motion_model, pass_height=5, movement_speed=3000)
+
+
+class TestContinuousScanner:
+    def test_samples_are_averaged_in_nearest_point(self):
+        binned = ContinuousScanner.bin_samples(
+            np.array([0, 0.4, 1.1, 2.6, 3]), np.array([1, 3, 5, 7, 9]), np.array([0, 1, 2, 3])
+        )
+        assert np.allclose(binned, [2, 5, 6.5, 8])
+
+    def test_points_without_samples_are_interpolated(self):
+        binned = ContinuousScanner.bin_samples(np.array([0, 3]), np.array([1 + 1j, 4 - 2j]), np.array([0, 1, 2, 3]))
+        assert np.allclose(binned, [1 + 1j, 2, 3 - 1j, 4 - 2j])
+
+    def test_samples_are_matched_to_head_position(self):
+        scanner = create_scanner(sample_period=0.01)
+        point_distances = np.arange(0, 11, 1.0)
+
+        rows = [
+            (Vector(10, 0, 0), Vector(20, 0, 0), point_distances),
+            (Vector(20, 1, 0), Vector(10, 1, 0), point_distances),
+        ]
+        measured_rows = {}
+        assert scanner.run(rows, lambda index, values: measured_rows.update({index: values}), lambda: False)
+
+        assert scanner.printer_handle.commands[:2] == ["G1 X10 Y0 Z5 F3000", "G1 X20 Y0 Z5 F3000"]
+        assert np.allclose(measured_rows[0], 10 + point_distances, atol=0.5)
+        assert np.allclose(measured_rows[1], 20 - point_distances, atol=0.5)
@@ -0,0 +1,60 @@
+import numpy as np
+from vector3d.vector import Vector
+
+from functionalities.GridDescriptor import GridAxis, GridDescriptor
+from functionalities.Measurement import Measurement
+from functionalities.PrinterPath import Square, f_range
+
+
+class TestGridDescriptor:
+    def test_coordinates_do_not_drift(self):
+        axis = GridAxis.covering(0.1, 299.9, 0.3)
+
+        assert axis.count == len(f_range(0.1, 300, 0.3, True, True))
+        assert axis.coordinates()[:8].tolist() == [0.1, 0.4, 0.7, 1.0, 1.3, 1.6, 1.9, 2.2]
+        assert axis.last == 300.1
+        # the same coordinate, whether whole axis or single point is computed
+        assert axis.coordinates(np.arange(axis.count)).tolist() == [axis.coordinates(i) for i in range(axis.count)]
+
+    def test_index_of_coordinate(self):
+        axis = GridAxis(-5, 2.5, 9)
+
+        assert axis.index_of(axis.coordinates()).tolist() == list(range(9))
+        assert axis.index_of(0.1) == 2
+
+    def test_subset_keeps_coordinates(self):
+        axis = GridAxis(10.3, 0.7, 20)
+
+        assert axis.subset(3, 8).coordinates().tolist() == axis.coordinates()[3:8].tolist()
+        assert axis.subset(25, 30).count == 0
+
+    def test_extent_covers_cells_around_points(self):
+        grid = GridDescriptor(GridAxis(10, 2, 6), GridAxis(0, 4, 3))
+
+        assert grid.shape == (3, 6)
+        assert grid.extent() == [9, 21, -2, 10]
+        assert GridDescriptor.from_dict(grid.to_dict()) == grid
+
+    def test_measurement_axes_come_from_path_grid(self):
+        measurement = Measurement(4, Vector(0, 0, 0), Square(10, 10, 13, 7), 0.1, Vector(200, 200, 200))
+        grid = measurement.printer_path.grid
+
+        assert measurement.grid == grid
+        assert measurement.to_numpy().shape == grid.shape
+        assert measurement.x_axis.tolist() == grid.x.coordinates().tolist()
+        assert measurement.x_axis[-1] == 23.0 and measurement.y_axis[-1] == 17.0
+
+        measurement.add_measurement(12.3, 16.9, 1)
+        assert measurement.to_numpy()[69, 23] == 1
+
+        loaded = Measurement.from_pd_dataframe(measurement.to_pd_dataframe())
+        assert loaded.grid.x.count == grid.x.count and np.isclose(loaded.grid.x.step, grid.x.step)
+        assert loaded.get_extent() == measurement.get_extent()
+
+    def test_index_range_of_coordinates(self):
+        axis = GridAxis(10, 2, 6)
+
+        assert axis.index_range(11, 17) == (1, 4)
+        assert axis.index_range(10, 20) == (0, 6)
+        assert axis.index_range(-100, 5) == (0, 0)
+        assert axis.index_range(0, 100) == (0, 6)
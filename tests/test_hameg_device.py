@@ -0,0 +1,97 @@
+import pytest
+
+from spectrum_analyzer_device.hameg3010.HamegHMS3010DeviceMock import (
+    HamegHMS3010DeviceMock,
+)
+from spectrum_analyzer_device.hameg3010.HamegHMS3010SerialDevice import (
+    HamegHMS3010DeviceSerial,
+)
+from spectrum_analyzer_device.hameg3010.LevelRetryPolicy import LevelRetryPolicy
+
+
+class FakeSerial:
+    def __init__(self):
+        self.written = []
+        # lines waiting to be read, readline of empty queue returns nothing, like after serial timeout
+        self.responses = []
+
+    def write(self, data: bytearray):
+        command = data.decode("ascii")
+        self.written.append(command)
+        if "*opc?" in command:
+            self.responses.append(b"1\r\n")
+        if "rmode:level?" in command:
+            self.responses.append(b"1'100000000,-20.5\r\n")
+
+    def readline(self) -> bytes:
+        return self.responses.pop(0) if len(self.responses) > 0 else b""
+
+
+class TestHamegDevice:
+    def test_unchanged_settings_are_not_sent_again(self):
+        handle = FakeSerial()
+        device = HamegHMS3010DeviceSerial(handle)
+
+        device.prepare_measurement(100_000_000, 1)
+        device.prepare_measurement(100_000_000, 1)
+        assert handle.written == ["rmode:mtime 1;:rmode:frequency 100000000\n"]
+
+        device.prepare_measurement(200_000_000, 1)
+        assert handle.written[-1] == "rmode:frequency 200000000\n"
+
+    def test_settings_are_sent_again_after_direct_command(self):
+        handle = FakeSerial()
+        device = HamegHMS3010DeviceSerial(handle)
+
+        device.prepare_measurement(100_000_000, 1)
+        device.send_await_resp("*rst")
+        device.prepare_measurement(100_000_000, 1)
+
+        assert handle.written[-1] == "rmode:mtime 1;:rmode:frequency 100000000\n"
+
+    def test_mock_accepts_joined_commands(self):
+        device = HamegHMS3010DeviceMock()
+        device.send_await_resp("rmode:mtime 1;:rmode:frequency 2000")
+
+        assert device.current_frequency == 2000
+
+    def test_level_is_read_after_operation_complete(self):
+        handle = FakeSerial()
+        device = HamegHMS3010DeviceSerial(handle)
+
+        assert device.read_level(measurement_time=10) == -20.5
+        assert handle.written == ["trigger:software;*opc?\n", "rmode:level?\n"]
+
+    def test_stale_level_is_not_taken_for_operation_complete(self):
+        handle = FakeSerial()
+        handle.responses.append(b"1'100000000,-30.5\r\n")
+        device = HamegHMS3010DeviceSerial(handle)
+
+        assert device.read_level(measurement_time=10) == -20.5
+        assert handle.responses == []
+
+    def test_rejected_level_is_triggered_again(self):
+        handle = FakeSerial()
+        device = HamegHMS3010DeviceSerial(handle, LevelRetryPolicy(min_level=-18, max_retries=1))
+
+        device.trigger_measurement(measurement_time=10)
+        assert handle.written == ["trigger:software;*opc?\n"]
+
+        assert device.fetch_level(measurement_time=10) == -20.5
+        assert handle.written == ["trigger:software;*opc?\n", "rmode:level?\n"] * 2
+
+    def test_out_of_range_level_is_measured_again_limited_number_of_times(self):
+        levels = []
+
+        def measure_level():
+            levels.append(-20.5)
+            return -20.5
+
+        policy = LevelRetryPolicy(min_level=-18, max_retries=2)
+
+        assert policy.measure(measure_level) == -20.5
+        assert len(levels) == 3
+
+    def test_missing_level_raises_after_retries(self):
+        with pytest.raises(ValueError):
+            LevelRetryPolicy(max_retries=1).measure(lambda: None)
@@ -0,0 +1,110 @@
+import os
+import subprocess
+import sys
+import threading
+
+import numpy as np
+
+from functionalities.LiveResultFile import LiveResultReader, LiveResultWriter
+
+
+class TestLiveResultFile:
+    def test_reader_sees_values_as_they_are_written(self, create_grid, tmp_path):
+        path = str(tmp_path / "live.mdmalive")
+        writer = LiveResultWriter(create_grid(4, 5), complex, {"config": {"scan_height_in_mm": 4}}, path)
+
+        with LiveResultReader(path) as reader:
+            assert reader.grid == create_grid(4, 5)
+            assert reader.metadata == {"config": {"scan_height_in_mm": 4}}
+            assert np.isnan(reader.values).all()
+
+            writer.set_value(1, 2, complex(0.5, -1))
+            writer.set_value(1, 2, complex(0.25, -1))
+            writer.set_value(3, 4, complex(2, 2))
+
+            assert reader.values[1, 2] == complex(0.25, -1)
+            assert reader.no_filled == 2
+            assert reader.sequence == 6
+            assert not reader.is_finished
+
+            writer.finish()
+            assert reader.is_finished
+            assert reader.snapshot().values[3, 4] == complex(2, 2)
+
+    def test_snapshot_is_consistent_with_fill_counter(self, create_grid, tmp_path):
+        path = str(tmp_path / "live.mdmalive")
+        writer = LiveResultWriter(create_grid(100, 100), float, path=path)
+
+        def write_values():
+            for index in range(10000):
+                writer.set_value(*divmod(index, 100), float(index))
+
+        thread = threading.Thread(target=write_values)
+        with LiveResultReader(path) as reader:
+            thread.start()
+            while thread.is_alive():
+                snapshot = reader.snapshot()
+                assert np.count_nonzero(~np.isnan(snapshot.values)) == snapshot.no_filled
+            thread.join()
+
+        writer.close()
+
+    def test_file_is_read_by_other_process(self, create_grid, tmp_path):
+        path = str(tmp_path / "live.mdmalive")
+        writer = LiveResultWriter(create_grid(3, 3), float, path=path)
+        writer.set_value(2, 1, -42.5)
+
+        script = (
+            "from functionalities.LiveResultFile import LiveResultReader\n"
+            f"reader = LiveResultReader({path!r})\n"
+            "print(reader.values[2, 1], reader.no_filled)\n"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", script],
+            capture_output=True,
+            text=True,
+            check=True,
+            env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+        ).stdout
+
+        assert output.split() == ["-42.5", "1"]
+        writer.close()
+
+    def test_new_scan_does_not_change_file_of_previous_one(self, create_grid, tmp_path):
+        path = str(tmp_path / "live.mdmalive")
+        writer = LiveResultWriter(create_grid(2, 2), float, path=path)
+        writer.set_value(0, 0, 1.0)
+        writer.finish()
+
+        with LiveResultReader(path) as reader:
+            LiveResultWriter(create_grid(3, 3), float, path=path).close()
+
+            assert reader.values.shape == (2, 2)
+            assert reader.values[0, 0] == 1.0
+
+        with LiveResultReader(path) as reader:
+            assert reader.values.shape == (3, 3)
+
+    def test_file_held_by_reader_is_not_replaced(self, create_grid, tmp_path, monkeypatch):
+        path = str(tmp_path / "live.mdmalive")
+        LiveResultWriter(create_grid(2, 2), float, path=path).finish()
+
+        # on Windows file mapped by reader can't be replaced
+        replace = os.replace
+
+        def replace_unless_held(source, destination):
+            if destination == path:
+                raise PermissionError("file is used by another process")
+            replace(source, destination)
+
+        monkeypatch.setattr(os, "replace", replace_unless_held)
+        writer = LiveResultWriter(create_grid(3, 3), float, path=path)
+        writer.set_value(2, 2, 5.0)
+        writer.close()
+
+        assert writer.path == str(tmp_path / "live_1.mdmalive")
+        with LiveResultReader(path) as reader:
+            assert reader.values.shape == (2, 2)
+        with LiveResultReader(writer.path) as reader:
+            assert reader.values[2, 2] == 5.0
+            assert np.isnan(reader.values[0, 0])
@@ -0,0 +1,162 @@
+import re
+import time
+
+import serial.tools.list_ports
+
+import printer_device.MarlinDevice
+from printer_device.MarlinDevice import MarlinDevice
+
+
+class FakeMarlinSerial:
+    """
+    Validates line numbers and checksums the way Marlin does, every line is acknowledged right away,
+    as by printer with empty planner. Lines listed in 'corrupted' or 'lost' are damaged on first transmission.
+    """
+
+    def __init__(self, corrupted=(), lost=()):
+        self.corrupted = set(corrupted)
+        self.lost = set(lost)
+
+        self.last_line_number = None
+        self.executed = []
+        self.responses = []
+
+        self.no_received_lines = 0
+        self.no_read_oks = 0
+        self.max_no_unacknowledged_lines = 0
+
+    def write(self, data: bytearray):
+        for line in data.decode("ascii").splitlines():
+            self.no_received_lines += 1
+            self.max_no_unacknowledged_lines = max(
+                self.max_no_unacknowledged_lines, self.no_received_lines - self.no_read_oks
+            )
+            self._receive(line)
+
+    def _receive(self, line: str):
+        line_number, command, checksum = re.match(r"N(-?\d+) (.*)\*(\d+)$", line).groups()
+        line_number = int(line_number)
+
+        if line_number in self.lost:
+            self.lost.remove(line_number)
+            self.no_received_lines -= 1
+            return
+
+        if line_number in self.corrupted:
+            self.corrupted.remove(line_number)
+            checksum = -1
+
+        if command.startswith("M110"):
+            self.last_line_number = int(command.split("N")[1])
+            self.responses.append(b"ok\n")
+            return
+
+        if line_number != self.last_line_number + 1:
+            self._request_resend(b"Error:Line Number is not Last Line Number+1")
+        elif int(checksum) != MarlinDevice.checksum(line[: line.index("*")]):
+            self._request_resend(b"Error:checksum mismatch")
+        else:
+            self.last_line_number = line_number
+            self.executed.append(command)
+            self.responses.append(b"ok\n")
+
+    def _request_resend(self, error: bytes):
+        self.responses.append(error + b", Last Line: " + bytes(str(self.last_line_number), "ascii") + b"\n")
+        self.responses.append(b"Resend: " + bytes(str(self.last_line_number + 1), "ascii") + b"\n")
+        self.responses.append(b"ok\n")
+
+    def readline(self) -> bytes:
+        if len(self.responses) == 0:
+            return b""
+
+        resp = self.responses.pop(0)
+        if resp.startswith(b"ok"):
+            self.no_read_oks += 1
+        return resp
+
+    def close(self):
+        pass
+
+
+class FakeBootingSerial:
+    """
+    Serial port with printer sending boot banner on 'printer_port', other ports stay silent.
+    """
+
+    printer_port = None
+
+    def __init__(self, port: str, baudrate: int, timeout: float):
+        self.port = port
+        self.timeout = timeout
+        self.responses = [b"start\n", b"echo:Marlin 2.1.2\n"] if port == self.printer_port else []
+
+    def readline(self) -> bytes:
+        return self.responses.pop(0) if len(self.responses) > 0 else b""
+
+    def close(self):
+        pass
+
+
+def commands(no_commands: int):
+    return [f"G1 X{no} Y{no} Z10 F900" for no in range(no_commands)]
+
+
+class TestMarlinDevice:
+    def test_move_is_followed_by_motion_completion_request(self):
+        handle = FakeMarlinSerial()
+        device = MarlinDevice(handle)
+        device.set_current_position(0, 0, 0)
+
+        begin = time.time()
+        assert device.send_and_await("G1 X200 Y200 Z10 F900") == ("b'ok\\n'", "ok")
+
+        # predicted time of this move is about 19 s, device reported completion right away
+        assert time.time() - begin < 1
+        assert handle.executed == ["G1 X200 Y200 Z10 F900", "M400"]
+
+    def test_other_commands_are_not_awaited(self):
+        handle = FakeMarlinSerial()
+        device = MarlinDevice(handle)
+
+        device.send_and_await("M114")
+        assert handle.executed == ["M114"]
+
+    def test_lines_are_streamed_within_window(self):
+        handle = FakeMarlinSerial()
+        device = MarlinDevice(handle, window_size=3)
+
+        responses = device.stream(commands(10), timeout=5)
+        responses += device.stream(commands(2), timeout=5)
+
+        assert responses == ["b'ok\\n'"] * 12
+        assert handle.executed == commands(10) + commands(2)
+        assert handle.max_no_unacknowledged_lines == 3
+
+    def test_corrupted_line_is_resent(self):
+        handle = FakeMarlinSerial(corrupted=[3])
+        device = MarlinDevice(handle, window_size=4)
+
+        assert None not in device.stream(commands(10), timeout=5)
+        assert handle.executed == commands(10)
+
+    def test_lost_line_is_resent(self):
+        handle = FakeMarlinSerial(lost=[2, 7])
+        device = MarlinDevice(handle, window_size=4)
+
+        assert None not in device.stream(commands(10), timeout=5)
+        assert handle.executed == commands(10)
+
+    def test_resend_request_parsing(self):
+        assert MarlinDevice.parse_resend_request(b"Resend: 12\n") == 12
+        assert MarlinDevice.parse_resend_request(b"rs N12\n") == 12
+        assert MarlinDevice.parse_resend_request(b"ok\n") is None
+
+    def test_printer_on_unlisted_usb_bridge_is_found(self, create_port, monkeypatch):
+        ports = [create_port("/dev/ttyACM0", 0x2341, 0x0042), create_port("/dev/ttyACM1", 0x1234, 0x5678)]
+        monkeypatch.setattr(serial.tools.list_ports, "comports", lambda: ports)
+        monkeypatch.setattr(FakeBootingSerial, "printer_port", "/dev/ttyACM1")
+        monkeypatch.setattr(printer_device.MarlinDevice, "Serial", FakeBootingSerial)
+
+        device = MarlinDevice.connect()
+
+        assert device._device.port == "/dev/ttyACM1"
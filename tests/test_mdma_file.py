@@ -0,0 +1,134 @@
+import numpy as np
+import pytest
+from vector3d.vector import Vector
+
+from functionalities.export_import_functions import read_project_data
+from functionalities.GridDescriptor import GridAxis, GridDescriptor
+from functionalities.MdmaFile import (
+    MdmaReader,
+    compact_dtype,
+    is_mdma_file,
+    read_mdma_file,
+    write_mdma_file,
+)
+from functionalities.Measurement import Measurement
+from functionalities.PrinterPath import Square
+
+
+class TestMdmaFile:
+    def test_values_grid_and_metadata_survive_round_trip(self, create_grid, tmp_path):
+        values = np.random.default_rng(0).normal(-60, 10, (70, 130)).round(3)
+        values[5:40, 100:] = np.nan
+        grid = create_grid(70, 130)
+        path = str(tmp_path / "data.mdma")
+
+        write_mdma_file(path, values, grid, {"config": {"scan_path_settings": {"scan_height_in_mm": 4}}})
+        content = read_mdma_file(path)
+
+        assert is_mdma_file(path)
+        assert content.grid == grid
+        assert content.metadata["config"]["scan_path_settings"]["scan_height_in_mm"] == 4
+        # measured values are stored in single precision
+        assert content.values.dtype == np.float32
+        assert np.allclose(content.values, values, rtol=1e-6, equal_nan=True)
+
+    def test_complex_values_of_many_frequencies(self, create_grid, tmp_path):
+        rng = np.random.default_rng(1)
+        values = rng.normal(size=(20, 30, 5)) + 1j * rng.normal(size=(20, 30, 5))
+        path = str(tmp_path / "data.mdma")
+
+        write_mdma_file(path, values, create_grid(20, 30), chunk_shape=(8, 8))
+        content = read_mdma_file(path)
+
+        assert content.values.dtype == np.complex64
+        assert content.values.shape == (20, 30, 5)
+        assert np.allclose(content.values, values, rtol=1e-6)
+
+    def test_values_out_of_single_precision_range_are_kept(self):
+        assert compact_dtype(np.array([1e300, 2.0])) == np.float64
+        assert compact_dtype(np.array([1e-42, 2.0])) == np.float64
+        assert compact_dtype(np.array([1e-20 + 1e300j])) == np.complex128
+        assert compact_dtype(np.array([-75.123, np.nan])) == np.float32
+
+    def test_values_must_match_grid(self, create_grid, tmp_path):
+        with pytest.raises(ValueError):
+            write_mdma_file(str(tmp_path / "data.mdma"), np.zeros((3, 4)), create_grid(4, 3))
+
+    def test_csv_data_file_is_recognized(self, tmp_path):
+        measurement = Measurement(4, Vector(0, 0, 0), Square(10, 10, 9, 9), 3, Vector(100, 100, 100))
+        path = str(tmp_path / "data.mdma")
+        measurement.add_measurement_by_index(0, -42.5)
+        measurement.to_pd_dataframe().to_csv(path)
+
+        assert not is_mdma_file(path)
+        loaded = read_project_data(path)
+        assert loaded.grid == measurement.grid
+        assert np.array_equal(loaded.to_numpy(), measurement.to_numpy(), equal_nan=True)
+
+    def test_project_data_is_read_from_binary_file(self, create_grid, tmp_path):
+        path = str(tmp_path / "data.mdma")
+        write_mdma_file(path, np.arange(12.0).reshape(3, 4), create_grid(3, 4))
+
+        loaded = read_project_data(path)
+        assert loaded.grid == create_grid(3, 4)
+        assert loaded.to_numpy()[2, 3] == 11
+
+    def test_large_scan_is_loaded_without_scan_path(self, create_grid, tmp_path):
+        # timing of loading is measured by benchmarks/mdma_load.py
+        values = np.random.default_rng(2).normal(-60, 10, (1000, 1000)).round(2)
+        path = str(tmp_path / "data.mdma")
+        write_mdma_file(path, values, create_grid(1000, 1000))
+
+        loaded = Measurement.from_numpy(read_mdma_file(path).values, create_grid(1000, 1000))
+
+        # values are kept in single array, path of the scan is not rebuilt
+        assert loaded.printer_path is None
+        assert loaded.to_numpy().shape == (1000, 1000)
+        assert loaded.to_numpy().dtype == np.float32
+        assert np.allclose(loaded.to_numpy(), values, rtol=1e-6)
+        assert loaded.get_extent() == create_grid(1000, 1000).extent()
+
+
+class TestMdmaReader:
+    @pytest.fixture
+    def scan(self, create_grid, tmp_path):
+        rng = np.random.default_rng(3)
+        values = rng.normal(size=(50, 70, 6)) + 1j * rng.normal(size=(50, 70, 6))
+        path = str(tmp_path / "data.mdma")
+        write_mdma_file(path, values, create_grid(50, 70), chunk_shape=(16, 16))
+        return path, values.astype(np.complex64)
+
+    def test_values_are_indexed_like_numpy_array(self, scan):
+        path, values = scan
+        with MdmaReader(path) as reader:
+            assert reader.shape == values.shape
+            for key in [
+                np.s_[:],
+                np.s_[:, :, 2],
+                np.s_[10:37, 5:60:3, 1:4],
+                np.s_[-1, ::-2],
+                np.s_[49, 69, 5],
+                np.s_[20:10],
+            ]:
+                assert np.array_equal(reader[key], values[key])
+
+            with pytest.raises(IndexError):
+                reader[50]
+
+    def test_only_chunks_of_requested_part_are_decompressed(self, scan):
+        path, values = scan
+        with MdmaReader(path) as reader:
+            window, grid = reader.window((12, 17), (-3, 2), 4)
+
+            # 11 columns and rows within first chunk along both axes, of single frequency
+            assert reader._read_chunk.cache_info().misses == 1
+            assert grid == GridDescriptor(GridAxis(12, 0.5, 11), GridAxis(-3, 0.5, 11))
+            assert np.array_equal(window, values[:11, 4:15, 4])
+
+    def test_file_with_all_frequencies_in_chunk_is_read(self, create_grid, tmp_path):
+        values = np.arange(8 * 9 * 5, dtype=float).reshape(8, 9, 5)
+        path = str(tmp_path / "data.mdma")
+        write_mdma_file(path, values, create_grid(8, 9), chunk_shape=(4, 4, 5))
+
+        with MdmaReader(path) as reader:
+            assert np.array_equal(reader[:, 3:7, 2], values[:, 3:7, 2])
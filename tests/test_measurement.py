@@ -0,0 +1,71 @@
+import io
+
+import numpy as np
+import pandas as pd
+from vector3d.vector import Vector
+
+from functionalities.Measurement import Measurement
+from functionalities.PrinterPath import Square
+
+
+def create_measurement(dtype=float) -> Measurement:
+    return Measurement(
+        pass_height=4,
+        antenna_offset=Vector(0, 0, 0),
+        scanned_area=Square(10, 20, 6, 3),
+        measurement_radius=3,
+        printer_bed_size=Vector(210, 210, 210),
+        dtype=dtype,
+    )
+
+
+class TestMeasurement:
+    def test_axes(self):
+        measurement = create_measurement()
+
+        assert list(measurement.x_axis) == [10, 13, 16]
+        assert list(measurement.y_axis) == [20, 23]
+        assert measurement.to_numpy().shape == (2, 3)
+        assert np.isnan(measurement.to_numpy()).all()
+
+    def test_every_path_step_is_stored_at_its_position(self):
+        measurement = create_measurement()
+
+        for no_step, (_, antenna_position, add_measurement) in enumerate(measurement):
+            add_measurement(no_step)
+
+        for no_step, antenna_position in enumerate(measurement.printer_path.get_antenna_path()):
+            row = list(measurement.y_axis).index(antenna_position.y)
+            col = list(measurement.x_axis).index(antenna_position.x)
+            assert measurement.to_numpy()[row, col] == no_step
+
+    def test_add_measurement_by_coordinates(self):
+        measurement = create_measurement()
+        measurement.add_measurement(13, 23, -20.5)
+
+        assert measurement.to_pd_dataframe()[13][23] == -20.5
+
+    def test_complex_values_survive_csv_round_trip(self):
+        measurement = create_measurement(dtype=complex)
+        measurement.add_measurement_by_index(0, complex(0.5, -0.25))
+        assert measurement.to_numpy().dtype == complex
+
+        csv_file = io.StringIO()
+        measurement.to_pd_dataframe().to_csv(csv_file)
+        csv_file.seek(0)
+
+        loaded = Measurement.from_pd_dataframe(pd.read_csv(csv_file, index_col=0))
+        row, col = measurement.grid_indices[0]
+
+        assert loaded.to_numpy()[row, col] == complex(0.5, -0.25)
+        assert list(loaded.x_axis) == list(measurement.x_axis)
+        assert loaded.x_min == 10 and loaded.y_max == 23
+
+    def test_iteration_can_be_restarted(self):
+        measurement = create_measurement()
+
+        assert len(list(measurement)) == len(list(measurement)) == 6
+        assert [step[1] for step in measurement.iter_steps(4)] == measurement.printer_path.get_antenna_path()[4:]
+
+        measurement.add_measurement_by_index(2, -20)
+        assert [measurement.is_measured(index) for index in range(3)] == [False, False, True]
@@ -0,0 +1,101 @@
+from typing import List, Optional
+
+from functionalities.MeasurementScheduler import MeasurementScheduler
+
+
+class FakePrinter:
+    def __init__(self, events: Optional[List[str]] = None):
+        self.commands: List[str] = []
+        # commands and analyzer triggers, in order in which devices got them
+        self.events = [] if events is None else events
+
+    def send_and_await(self, command: str):
+        self.commands.append(command)
+        self.events.append(command)
+        return "ok"
+
+    def send_batch_and_await(self, commands: List[str]):
+        return [self.send_and_await(command) for command in commands]
+
+
+class FakeAnalyzer:
+    def __init__(self, measurement_duration: Optional[float], events: Optional[List[str]] = None):
+        self.measurement_duration = measurement_duration
+        self.events = [] if events is None else events
+        self.no_setups = 0
+        self.no_measurements = 0
+
+    def prepare_measurement(self, frequency, measurement_time):
+        self.no_setups += 1
+
+    def read_level(self, measurement_time):
+        self.trigger_measurement(measurement_time)
+        return self.fetch_level(measurement_time)
+
+    def trigger_measurement(self, measurement_time):
+        self.events.append("trigger")
+
+    def fetch_level(self, measurement_time):
+        self.no_measurements += 1
+        return float(-self.no_measurements)
+
+    def get_measurement_duration(self, measurement_time):
+        return self.measurement_duration
+
+
+class TestMeasurementScheduler:
+    def test_moves_are_preceded_by_dwell_when_measurement_duration_is_known(self):
+        printer = FakePrinter()
+        analyzer = FakeAnalyzer(measurement_duration=1)
+        scheduler = MeasurementScheduler(printer, analyzer, 1e9, 1, dwell_margin=0.1)
+
+        measurements = []
+        moves = [f"G1 X{i} Y0 Z0" for i in range(3)]
+        assert scheduler.run(moves, lambda index, value: measurements.append((index, value)), lambda: False)
+
+        assert measurements == [(0, -1.0), (1, -2.0), (2, -3.0)]
+        assert printer.commands == [moves[0], "G4 P1100", moves[1], "G4 P1100", moves[2]]
+        assert analyzer.no_setups == 3
+
+    def test_dwell_is_sent_after_measurement_is_triggered(self):
+        events = []
+        printer = FakePrinter(events)
+        scheduler = MeasurementScheduler(printer, FakeAnalyzer(measurement_duration=1, events=events), 1e9, 1)
+
+        moves = [f"G1 X{i} Y0 Z0" for i in range(3)]
+        assert scheduler.run(moves, lambda index, value: None, lambda: False)
+
+        assert events == [
+            moves[0],
+            "trigger",
+            "G4 P1100",
+            moves[1],
+            "trigger",
+            "G4 P1100",
+            moves[2],
+            "trigger",
+        ]
+
+    def test_moves_wait_for_measurement_when_duration_is_unknown(self):
+        printer = FakePrinter()
+        analyzer = FakeAnalyzer(measurement_duration=None)
+        scheduler = MeasurementScheduler(printer, analyzer, 1e9, "100")
+
+        moves = [f"G1 X{i} Y0 Z0" for i in range(3)]
+        assert scheduler.run(moves, lambda index, value: None, lambda: False)
+
+        assert printer.commands == moves
+
+    def test_stop(self):
+        printer = FakePrinter()
+        analyzer = FakeAnalyzer(measurement_duration=None)
+        scheduler = MeasurementScheduler(printer, analyzer, 1e9, 1)
+
+        measurements = []
+        moves = [f"G1 X{i} Y0 Z0" for i in range(5)]
+        completed = scheduler.run(
+            moves, lambda index, value: measurements.append(index), lambda: len(measurements) == 2
+        )
+
+        assert not completed
+        assert measurements == [0, 1]
@@ -0,0 +1,71 @@
+import numpy as np
+
+from printer_device.MotionModel import MotionModel, row_feedrate
+from printer_device.PrinterDevice import PrinterDevice
+
+
+def create_motion_model() -> MotionModel:
+    return MotionModel(
+        max_feedrate=(200, 100, 12),
+        max_acceleration=(1000, 500, 200),
+        acceleration=1000,
+        jerk=(0, 0, 0),
+        command_overhead_in_seconds=0,
+    )
+
+
+class TestMotionModel:
+    def test_long_move_reaches_feedrate(self):
+        # 100 mm/s, accelerates over 5 mm and slows down over 5 mm
+        move_time = create_motion_model().predict_move_time((0, 0, 0), (100, 0, 0), feedrate=6000)
+        assert np.isclose(move_time, 0.1 + 0.9 + 0.1)
+
+    def test_short_move_does_not_reach_feedrate(self):
+        move_time = create_motion_model().predict_move_time((0, 0, 0), (1, 0, 0), feedrate=6000)
+        assert np.isclose(move_time, 2 * np.sqrt(1 / 1000))
+
+    def test_axis_limits_are_applied(self):
+        motion_model = create_motion_model()
+
+        # Y axis is limited to 100 mm/s and 500 mm/s^2
+        move_time = motion_model.predict_move_time((0, 0, 0), (0, 100, 0), feedrate=12000)
+        assert np.isclose(move_time, 0.2 + 0.8 + 0.2)
+
+        x_move, y_move = motion_model.predict_moves_time(np.array([[50, 0], [0, 50]]), feedrate=12000)
+        assert x_move < y_move
+
+    def test_jerk_allows_starting_at_speed(self):
+        motion_model = create_motion_model()
+        motion_model.jerk = np.array([100, 100, 100])
+
+        assert np.isclose(motion_model.predict_move_time((0, 0, 0), (100, 0, 0), feedrate=6000), 1)
+
+    def test_limits_are_sent_as_gcode(self):
+        assert MotionModel().to_gcode() == [
+            "M201 X1000 Y1000 Z200",
+            "M203 X200 Y200 Z12",
+            "M204 P1250 R1250 T1250",
+            "M205 X8.00 Y8.00 Z0.40",
+        ]
+
+    def test_printer_device_predicts_with_motion_model(self):
+        printer = PrinterDevice()
+        printer.motion_model = create_motion_model()
+        printer.set_current_position(0, 0, 0)
+
+        assert np.isclose(printer.predict_time_of_execution("G1 X100 Y0 Z0 F6000"), 1.1)
+        assert PrinterDevice.parse_feedrate("G1 X10 Y10") is None
+
+    def test_distance_travelled_follows_velocity_profile(self):
+        motion_model = create_motion_model()
+        elapsed = np.array([-1, 0, 0.1, 0.55, 1.0, 1.1, 2])
+
+        distances = motion_model.predict_distance_travelled((100, 0), feedrate=6000, elapsed=elapsed)
+
+        # 5 mm of acceleration, 90 mm of cruise at 100 mm/s, 5 mm of deceleration
+        assert np.allclose(distances, [0, 0, 5, 50, 95, 100, 100])
+
+    def test_row_feedrate_gives_sample_in_every_point(self):
+        # 2 mm between points, one sample every 0.1 s
+        assert row_feedrate(2, 0.1, movement_speed=3000) == 1200
+        assert row_feedrate(20, 0.1, movement_speed=3000) == 3000
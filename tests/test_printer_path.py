@@ -1,4 +1,17 @@
-from functionalities.PrinterPath import f_range
+import random
+
+import numpy as np
+from vector3d.vector import Vector
+
+from functionalities.PrinterPath import (
+    NEAREST_NEIGHBOUR_2_OPT,
+    X_MAJOR_SERPENTINE,
+    Y_MAJOR_SERPENTINE,
+    PrinterPath,
+    Square,
+    f_range,
+    grid_orderings,
+)
 
 
 class TestFRange:
@@ -23,3 +36,101 @@ class TestFRange:
         range = f_range(0.1, 2.2, 0.3, True, True)
         rounder_range = [round(val, 4) for val in range]
         assert rounder_range == [0.1, 0.4, 0.7, 1.0, 1.3, 1.6, 1.9, 2.2]
+
+
+class TestPathPlanner:
+    def test_every_grid_ordering_visits_every_point_once(self):
+        for name, x_ids, y_ids in grid_orderings(5, 4):
+            assert sorted(zip(x_ids, y_ids)) == [(x, y) for x in range(5) for y in range(4)], name
+
+    def test_serpentine_with_fewer_turnarounds_is_picked(self, create_printer_path):
+        assert create_printer_path(30, 60).ordering == Y_MAJOR_SERPENTINE
+        assert create_printer_path(60, 30).ordering == X_MAJOR_SERPENTINE
+
+    def test_path_consists_of_single_steps(self, create_printer_path):
+        printer_path = create_printer_path(60, 30)
+        points = np.array([(point.x, point.y) for point in printer_path.get_extruder_path()])
+
+        assert np.allclose(np.linalg.norm(np.diff(points, axis=0), axis=1), 3)
+        assert printer_path.get_extruder_bounding_box()[0] == (points[0][0], points[0][1])
+
+    def test_path_is_trimmed_to_printer_bed(self, create_printer_path):
+        printer_path = create_printer_path(30, 30, bed_size=25)
+
+        assert printer_path.x_axis == printer_path.y_axis == [10, 13, 16, 19, 22, 25]
+        assert printer_path.get_no_scan_points() == 36
+
+    def test_irregular_steps_are_reordered(self, create_printer_path):
+        printer_path = create_printer_path(60, 60)
+        steps = random.Random(0).sample(range(printer_path.get_no_scan_points()), 100)
+        start_position = Vector(0, 0, 0)
+
+        ordered_steps, ordering = printer_path.order_steps(steps, start_position)
+
+        def travel_time(ordered: list) -> float:
+            path = printer_path.get_extruder_path()
+            points = np.array([(0, 0)] + [(path[i].x, path[i].y) for i in ordered])
+            return printer_path.motion_model.predict_travel_time(points, printer_path.movement_speed)
+
+        assert sorted(ordered_steps) == sorted(steps)
+        assert ordering == NEAREST_NEIGHBOUR_2_OPT
+        assert travel_time(ordered_steps) < travel_time(sorted(steps))
+
+    def test_time_left_decreases_with_measured_points(self, create_printer_path):
+        printer_path = create_printer_path(30, 30)
+        no_points = printer_path.get_no_scan_points()
+
+        total = printer_path.predict_scan_time(1)
+        breakdown = printer_path.get_scan_time_breakdown(1)
+
+        assert np.isclose(total, breakdown["total"])
+        assert breakdown["measurement"] == no_points
+        assert printer_path.predict_scan_time(1, no_points // 2) < total - breakdown["homing"]
+        assert np.isclose(printer_path.predict_scan_time(1, no_points), printer_path.return_time_in_seconds)
+
+    def test_continuous_scan_is_faster_than_point_by_point_scan(self):
+        printer_path = PrinterPath(
+            pass_height=4,
+            antenna_offset=Vector(0, 0, 0),
+            scanned_area=Square(10, 10, 99, 9),
+            measurement_radius=1,
+            printer_bed_size=Vector(210, 210, 210),
+            movement_speed=3000,
+        )
+
+        # 100 points in every row, one sample every 0.02 s lets the head sweep them at 50 mm/s
+        continuous_scan_time = printer_path.predict_continuous_scan_time(0.02)
+        point_by_point_scan_time = printer_path.predict_scan_time(0.02)
+
+        assert continuous_scan_time < point_by_point_scan_time / 5
+
+    def test_path_arrays_match_vector_path(self):
+        printer_path = PrinterPath(4, Vector(-5, 2, 1), Square(10, 10, 40, 20), 3, Vector(210, 210, 210))
+        antenna_path = printer_path.get_antenna_path()
+
+        assert len(antenna_path) == printer_path.get_no_scan_points() == len(printer_path.antenna_positions)
+        assert [[point.x, point.y, point.z] for point in antenna_path] == printer_path.antenna_positions.tolist()
+        assert antenna_path[-1] == Vector(*printer_path.antenna_positions[-1])
+        assert np.allclose(printer_path.extruder_positions - printer_path.antenna_positions, [-5, 2, 0])
+
+        rows, cols = printer_path.get_grid_indices().T
+        assert np.array_equal(np.array(printer_path.x_axis)[cols], printer_path.antenna_positions[:, 0])
+        assert np.array_equal(np.array(printer_path.y_axis)[rows], printer_path.antenna_positions[:, 1])
+
+    def test_million_point_path_is_stored_in_arrays(self):
+        # timing of path generation is measured by benchmarks/path_generation.py
+        printer_path = PrinterPath(4, Vector(0, 0, 0), Square(0, 0, 999, 999), 1, Vector(1000, 1000, 210))
+        no_points = 1000 * 1000
+
+        assert printer_path.get_no_scan_points() == no_points
+        for positions in (printer_path.antenna_positions, printer_path.extruder_positions):
+            assert positions.shape == (no_points, 3)
+            assert positions.dtype == np.float64
+        assert printer_path.grid_indices.shape == (no_points, 2)
+        assert np.issubdtype(printer_path.grid_indices.dtype, np.integer)
+        assert printer_path.step_move_times.shape == (no_points,)
+        assert printer_path.step_move_times.dtype == np.float64
+
+        # paths are views of the arrays, Vectors are created only on access
+        assert printer_path.antenna_path.to_numpy() is printer_path.antenna_positions
+        assert printer_path.extruder_path.to_numpy() is printer_path.extruder_positions
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+from PyQt6.QtWidgets import QApplication
+from vector3d.vector import Vector
+
+from functionalities.PrinterPath import PrinterPath, Square
+from plot_widgets.PrinterPathWidget2D import (
+    PrinterPathWidget2D,
+    path_turning_points,
+    visible_steps,
+)
+
+
+def create_step_indices(printer_path: PrinterPath) -> np.ndarray:
+    step_indices = np.full(printer_path.grid.shape, -1, dtype=int)
+    grid_indices = printer_path.get_grid_indices()
+    step_indices[grid_indices[:, 0], grid_indices[:, 1]] = np.arange(len(grid_indices))
+    return step_indices
+
+
+class TestPrinterPathWidget2D:
+    @pytest.fixture
+    def qt_app(self):
+        return QApplication.instance() or QApplication([])
+
+    def test_path_line_is_drawn_through_turning_points(self):
+        printer_path = PrinterPath(4, Vector(0, 0, 0), Square(0, 0, 99, 49), 1, Vector(210, 210, 210))
+        path = printer_path.extruder_positions[:, :2]
+        turning_points = path_turning_points(path)
+
+        # serpentine over 100 x 50 grid turns twice at the end of every line
+        assert len(turning_points) == 2 * min(len(printer_path.x_axis), len(printer_path.y_axis))
+        assert turning_points[0] == 0 and turning_points[-1] == len(path) - 1
+
+        # every skipped point lies between its neighbouring turning points
+        for start, end in zip(turning_points[:-1], turning_points[1:]):
+            moves, line = path[start : end + 1] - path[start], path[end] - path[start]
+            assert np.allclose(moves[:, 0] * line[1] - moves[:, 1] * line[0], 0)
+
+    def test_number_of_displayed_points_is_limited(self):
+        printer_path = PrinterPath(4, Vector(-10, 0, 0), Square(20, 0, 199.5, 199.5), 0.5, Vector(300, 300, 210))
+        step_indices = create_step_indices(printer_path)
+        grid = printer_path.grid
+
+        zoomed_out = visible_steps(step_indices, grid, Vector(0, 0, 0), (0, 300), (0, 300), 1000)
+        assert 500 < len(zoomed_out) <= 1000
+
+        zoomed_in = visible_steps(step_indices, grid, Vector(0, 0, 0), (30, 35), (10, 15), 1000)
+        assert len(zoomed_in) == 11 * 11
+        assert np.all(
+            (printer_path.antenna_positions[zoomed_in, :2] >= [30, 10])
+            & (printer_path.antenna_positions[zoomed_in, :2] <= [35, 15])
+        )
+
+        # extruder points are shifted by antenna offset
+        extruder_steps = visible_steps(step_indices, grid, printer_path.antenna_offset, (20, 25), (10, 15), 1000)
+        assert np.array_equal(np.sort(extruder_steps), np.sort(zoomed_in))
+
+    def test_bounding_box_is_drawn_without_duplicate_corner(self, qt_app):
+        printer_path = PrinterPath(4, Vector(0, 0, 0), Square(10, 10, 30, 20), 3, Vector(210, 210, 210))
+        widget = PrinterPathWidget2D(printer_path)
+
+        bounding_box = widget.axes.get_lines()[0].get_xydata()
+        assert np.array_equal(bounding_box, printer_path.get_extruder_bounding_box())
+        assert len(bounding_box) == 5
@@ -0,0 +1,80 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from functionalities.GridDescriptor import GridAxis, GridDescriptor
+from functionalities.MdmaFile import read_mdma_file
+from functionalities.ProjectExport import ProjectSnapshot, write_project
+from plot_widgets.figure_rendering import FigureJob, render_heatmap, render_printer_path
+
+
+def create_snapshot(directory_path: str, with_csv: bool = False) -> ProjectSnapshot:
+    grid = GridDescriptor(GridAxis(10, 1, 20), GridAxis(5, 1, 15))
+    values = np.random.default_rng(0).normal(-60, 10, grid.shape)
+    values[::3] = np.nan
+
+    figure_jobs = [
+        FigureJob(
+            render_printer_path,
+            os.path.join(directory_path, "Extruder path.png"),
+            title="Extruder path",
+            bounding_box=np.array([[10, 5], [29, 5], [29, 19], [10, 19], [10, 5]], dtype=float),
+            extruder_path=np.array([[10, 5], [29, 5], [29, 6], [10, 6]], dtype=float),
+            extruder_points=np.array([[10, 5], [11, 5]], dtype=float),
+            antenna_points=np.empty((0, 2)),
+            x_limits=(5, 35),
+            y_limits=(0, 25),
+            head_position=(11, 5),
+        ),
+        FigureJob(
+            render_heatmap,
+            os.path.join(directory_path, "Signal Amplitude [dB].png"),
+            title="Signal Amplitude [dB]",
+            values=values,
+            extent=grid.extent(),
+            levels=(-80, -40),
+        ),
+    ]
+
+    return ProjectSnapshot(directory_path, values, grid, {"general_settings": {}}, figure_jobs, with_csv)
+
+
+class TestProjectExport:
+    def test_project_is_written_from_snapshot(self, tmp_path):
+        directory_path = str(tmp_path / "project")
+        snapshot = create_snapshot(directory_path, with_csv=True)
+        progress = []
+
+        assert write_project(snapshot, lambda *step: progress.append(step), lambda: False)
+
+        assert sorted(os.listdir(directory_path)) == [
+            "Extruder path.png",
+            "Signal Amplitude [dB].png",
+            "config.json",
+            "data.csv",
+            "data.mdma",
+        ]
+        assert progress == [(1, 4), (2, 4), (3, 4), (4, 4)]
+        assert np.allclose(
+            read_mdma_file(os.path.join(directory_path, "data.mdma")).values, snapshot.values, equal_nan=True
+        )
+        with open(os.path.join(directory_path, "config.json")) as config_file:
+            assert json.load(config_file) == {"general_settings": {}}
+
+    def test_cancelled_export_leaves_no_project(self, tmp_path):
+        directory_path = str(tmp_path / "project")
+        progress = []
+
+        assert not write_project(create_snapshot(directory_path), lambda *step: progress.append(step), lambda: True)
+        assert progress == [(1, 4)]
+        assert not os.path.exists(directory_path)
+
+    def test_existing_directory_is_not_overwritten(self, tmp_path):
+        directory_path = str(tmp_path / "project")
+        os.mkdir(directory_path)
+
+        with pytest.raises(FileExistsError):
+            write_project(create_snapshot(directory_path), lambda *step: None, lambda: False)
+        assert os.path.isdir(directory_path)
@@ -0,0 +1,236 @@
+import json
+import os
+import subprocess
+import sys
+from typing import List
+
+import numpy as np
+import pytest
+
+from functionalities.AdaptiveRefinement import coarse_pass_steps
+from functionalities.LiveResultFile import LiveResultReader
+from functionalities.ScanConfig import ScanConfig
+from functionalities.ScanEngine import ScanEngine
+from functionalities.ScanJournal import ScanJournal
+from printer_device.PrinterDevice import PrinterDevice
+
+SRC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+
+def create_config_dict() -> dict:
+    return {
+        "spectrum_analyzer_controller": {
+            "scan_mode_box": "HamegHMS3010",
+            "frequency_in_hz": 2_000_000_000,
+            "measurement_time": 0.1,
+            "connection_label": "Connected",
+        },
+        "printer_controller": {"movement_speed": 1000, "printer_bed_width": 210, "printer_bed_length": 210},
+        "scan_path_settings": {
+            "sample_x_position_in_mm": 10,
+            "sample_y_position_in_mm": 10,
+            "sample_width_in_mm": 6,
+            "sample_length_in_mm": 6,
+            "antenna_x_offset_in_mm": 0,
+            "antenna_y_offset_in_mm": 0,
+            "scan_height_in_mm": 4,
+            "measurement_radius_in_mm": 3,
+        },
+        "configuration_information": {},
+        "general_settings": {
+            "measurement_mode": "Single Pass Scan",
+            "point_budget_in_percentages": 100,
+            "refinement_threshold": 0,
+        },
+    }
+
+
+class FakePrinter(PrinterDevice):
+    def __init__(self):
+        super().__init__()
+        self.commands: List[str] = []
+
+    def send_and_await(self, command: str) -> str:
+        self.commands.append(command)
+        if "G28" in command:
+            self.set_current_position(0, 0, 0)
+        elif "G1" in command:
+            self.set_current_position(*PrinterDevice.parse_move_command_to_position(command))
+        return "ok"
+
+    def send_batch_and_await(self, commands: List[str]) -> list:
+        return [self.send_and_await(command) for command in commands]
+
+
+class FakeAnalyzer:
+    def __init__(self):
+        self.no_measurements = 0
+
+    def prepare_measurement(self, frequency, measurement_time):
+        pass
+
+    def read_level(self, measurement_time):
+        self.no_measurements += 1
+        return float(-self.no_measurements)
+
+    def get_measurement_duration(self, measurement_time):
+        return None
+
+
+def create_engine(tmp_path, printer: PrinterDevice, config_dict: dict = None, **kwargs) -> ScanEngine:
+    return ScanEngine(
+        ScanConfig.from_config_dict(create_config_dict() if config_dict is None else config_dict),
+        printer,
+        FakeAnalyzer(),
+        journal=ScanJournal(os.path.join(tmp_path, "scan_journal.jsonl")),
+        live_result_path=os.path.join(tmp_path, "live_result.mdmalive"),
+        **kwargs,
+    )
+
+
+class TestScanConfig:
+    def test_config_dict_is_written_back_unchanged(self):
+        config_dict = create_config_dict()
+        config_dict["spectrum_analyzer_controller"].update(
+            {"min_level_in_dbm": -22, "max_level_in_dbm": -16, "max_level_retries": 5}
+        )
+        config = ScanConfig.from_config_dict(config_dict)
+
+        assert config.frequency_in_hz == 2_000_000_000
+        assert config.sample_width_in_mm == 6
+        assert config.to_config_dict() == config_dict
+
+    def test_level_window_is_optional(self):
+        policy = ScanConfig.from_config_dict(create_config_dict()).create_level_retry_policy()
+        assert (policy.min_level, policy.max_level, policy.max_retries) == (None, None, 3)
+
+        config_dict = create_config_dict()
+        config_dict["spectrum_analyzer_controller"].update({"min_level_in_dbm": -22, "max_level_in_dbm": -16})
+        policy = ScanConfig.from_config_dict(config_dict).create_level_retry_policy()
+        assert not policy.is_level_valid(-30)
+        assert policy.is_level_valid(-20)
+
+    def test_missing_setting(self):
+        config_dict = create_config_dict()
+        del config_dict["scan_path_settings"]["scan_height_in_mm"]
+
+        with pytest.raises(ValueError):
+            ScanConfig.from_config_dict(config_dict)
+
+
+class TestScanEngine:
+    def test_every_point_is_measured(self, tmp_path):
+        progress, measurements = [], []
+        engine = create_engine(
+            tmp_path,
+            FakePrinter(),
+            on_progress=progress.append,
+            on_measurement=lambda index, value: measurements.append(index),
+        )
+        engine.prepare()
+
+        assert engine.run()
+
+        no_points = engine.measurement_data.printer_path.no_measurements
+        assert sorted(measurements) == list(range(no_points))
+        assert progress[-1] == no_points
+        assert ScanJournal.read(engine.journal.path).is_finished
+        with LiveResultReader(os.path.join(tmp_path, "live_result.mdmalive")) as reader:
+            assert reader.is_finished
+            assert np.array_equal(reader.values, engine.measurement_data.to_numpy())
+
+    def test_stopped_scan_is_resumed_without_homing(self, tmp_path):
+        printer = FakePrinter()
+        engine = create_engine(tmp_path, printer)
+        engine.on_measurement = lambda index, value: engine.stop() if index == 2 else None
+        engine.prepare()
+
+        assert not engine.run()
+        assert not ScanJournal.read(engine.journal.path).is_finished
+
+        resumed = create_engine(tmp_path, printer)
+        resumed.prepare(resume_from_journal=True)
+        assert np.count_nonzero(~np.isnan(resumed.measurement_data.to_numpy())) == 3
+
+        assert resumed.run()
+        assert np.count_nonzero(np.isnan(resumed.measurement_data.to_numpy())) == 0
+        assert printer.commands.count("G28") == 1
+
+    def test_rows_alternate_direction_after_measured_row_is_skipped(self, tmp_path):
+        printer = FakePrinter()
+        engine = create_engine(tmp_path, printer)
+        engine.prepare()
+        first_row = engine.measurement_data.step_indices[0]
+        for index in first_row[first_row >= 0]:
+            engine.post_measurement(int(index), -20.0)
+        engine.journal.close()
+
+        resumed = create_engine(tmp_path, printer)
+        resumed.prepare(resume_from_journal=True)
+        rows = resumed.row_steps()
+        extruder_positions = resumed.measurement_data.printer_path.extruder_positions
+
+        assert len(rows) == resumed.measurement_data.step_indices.shape[0] - 1
+        directions = [np.sign(extruder_positions[steps[-1], 0] - extruder_positions[steps[0], 0]) for steps in rows]
+        assert directions == [1, -1] * (len(rows) // 2) + [1] * (len(rows) % 2)
+
+    def test_refinement_stops_at_threshold(self, tmp_path):
+        no_measured_points = {}
+        for threshold in (0, 100):
+            config_dict = create_config_dict()
+            config_dict["general_settings"].update(
+                {"measurement_mode": "Adaptive Refinement Scan", "refinement_threshold": threshold}
+            )
+            engine = create_engine(tmp_path / str(threshold), FakePrinter(), config_dict)
+            engine.prepare()
+
+            assert engine.run()
+            no_measured_points[threshold] = np.count_nonzero(~np.isnan(engine.measurement_data.to_numpy()))
+
+        # measured levels differ by few dB, so no cell is refined above the threshold of 100
+        assert no_measured_points[100] == len(coarse_pass_steps(engine.measurement_data))
+        assert no_measured_points[0] > no_measured_points[100]
+
+    def test_engine_runs_without_qt(self):
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys, functionalities.ScanEngine, mdma_scan; "
+                "sys.exit(any(module.startswith('PyQt6') for module in sys.modules))",
+            ],
+            cwd=SRC_PATH,
+            env={**os.environ, "PYTHONPATH": SRC_PATH},
+        )
+        assert result.returncode == 0
+
+
+class TestScanCommand:
+    def test_stdout_holds_only_progress(self, tmp_path):
+        config_dict = create_config_dict()
+        config_dict["scan_path_settings"].update({"sample_width_in_mm": 3, "sample_length_in_mm": 3})
+        with open(os.path.join(tmp_path, "config.json"), "w") as config_file:
+            json.dump(config_dict, config_file)
+
+        result = subprocess.run(
+            [sys.executable, "mdma_scan.py", os.path.join(tmp_path, "config.json"), os.path.join(tmp_path, "project")],
+            cwd=SRC_PATH,
+            env={
+                **os.environ,
+                "PYTHONPATH": SRC_PATH,
+                "HOME": str(tmp_path),
+                "USERPROFILE": str(tmp_path),
+                "PRINTED_MODE": "mock_printer",
+                "ANALYZER_MODE": "mock_hameg",
+            },
+            capture_output=True,
+            text=True,
+        )
+
+        assert result.returncode == 0, result.stderr
+        lines = result.stdout.splitlines()
+        assert lines[:5] == [f"measured {no_points}/4 points" for no_points in range(5)]
+        assert lines[5:] == [f"written {no_step}/3 project files" for no_step in range(1, 4)] + [
+            f"project written to: '{os.path.join(tmp_path, 'project')}'"
+        ]
+        assert "data.mdma" in os.listdir(os.path.join(tmp_path, "project"))
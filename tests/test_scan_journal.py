@@ -0,0 +1,52 @@
+import os
+
+from functionalities.ScanJournal import ScanJournal, compute_path_hash
+
+
+class TestScanJournal:
+    def test_points_are_read_back(self, tmp_path):
+        journal_path = os.path.join(tmp_path, "journal", "scan_journal.jsonl")
+        journal = ScanJournal(journal_path)
+
+        journal.start({"scan_path_settings": {"measurement_radius_in_mm": 3}}, "hash")
+        journal.add_point(0, -20.5)
+        journal.add_point(1, complex(0.25, -0.5))
+        journal.close()
+
+        content = ScanJournal.read(journal_path)
+
+        assert content.config == {"scan_path_settings": {"measurement_radius_in_mm": 3}}
+        assert content.path_hash == "hash"
+        assert content.points == {0: -20.5, 1: complex(0.25, -0.5)}
+        assert not content.is_finished
+
+    def test_resumed_journal_is_appended(self, tmp_path):
+        journal_path = os.path.join(tmp_path, "scan_journal.jsonl")
+        journal = ScanJournal(journal_path)
+        journal.start({}, "hash")
+        journal.add_point(0, 1.0)
+        journal.close()
+
+        journal.reopen()
+        journal.add_point(1, 2.0)
+        journal.finish()
+
+        content = ScanJournal.read(journal_path)
+        assert content.points == {0: 1.0, 1: 2.0}
+        assert content.is_finished
+
+    def test_partially_written_line_is_skipped(self, tmp_path):
+        journal_path = os.path.join(tmp_path, "scan_journal.jsonl")
+        journal = ScanJournal(journal_path)
+        journal.start({}, "hash")
+        journal.add_point(0, 1.0)
+        journal.close()
+
+        with open(journal_path, "a") as journal_file:
+            journal_file.write('{"type": "point", "index": 1, "va')
+
+        assert ScanJournal.read(journal_path).points == {0: 1.0}
+
+    def test_path_hash(self, create_printer_path):
+        assert compute_path_hash(create_printer_path()) == compute_path_hash(create_printer_path())
+        assert compute_path_hash(create_printer_path()) != compute_path_hash(create_printer_path(measurement_radius=2))
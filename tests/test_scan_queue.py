@@ -0,0 +1,49 @@
+import os
+
+from functionalities.ScanQueue import FINISHED, PENDING, RUNNING, ScanQueue
+
+
+class TestScanQueue:
+    def test_jobs_are_ordered_by_priority_then_by_adding(self, tmp_path):
+        queue = ScanQueue(os.path.join(tmp_path, "scan_queue.json"))
+        first = queue.add({"name": "first"}, "/scans/first", priority=0)
+        urgent = queue.add({"name": "urgent"}, "/scans/urgent", priority=5)
+        second = queue.add({"name": "second"}, "/scans/second", priority=0)
+
+        assert queue.pending_jobs() == [urgent, first, second]
+
+        queue.set_state(urgent, RUNNING)
+        queue.set_state(urgent, FINISHED)
+        assert queue.next_job() is first
+
+    def test_queue_survives_restart(self, tmp_path):
+        queue_path = os.path.join(tmp_path, "mdma", "scan_queue.json")
+        queue = ScanQueue(queue_path)
+        done = queue.add({"scan_path_settings": {"scan_height_in_mm": 4}}, "/scans/done")
+        running = queue.add({}, "/scans/running", priority=1)
+        queue.add({}, "/scans/waiting", priority=1)
+        queue.set_state(done, FINISHED)
+        queue.set_state(running, RUNNING)
+
+        restored = ScanQueue(queue_path)
+
+        assert [(job.job_id, job.state) for job in restored.jobs] == [(0, FINISHED), (1, PENDING), (2, PENDING)]
+        assert restored.jobs[0].config == {"scan_path_settings": {"scan_height_in_mm": 4}}
+        # scan that was running when application was closed goes first, to be resumed from journal
+        assert restored.next_job().output_directory == "/scans/running"
+        assert restored.next_job().was_interrupted
+
+        restored.clear_done_jobs()
+        assert len(ScanQueue(queue_path).jobs) == 2
+        assert restored.add({}, "/scans/next").job_id == 3
+
+    def test_stopped_job_is_resumed_first(self, tmp_path):
+        queue = ScanQueue(os.path.join(tmp_path, "scan_queue.json"))
+        queue.add({}, "/scans/first")
+        stopped = queue.add({}, "/scans/stopped")
+        queue.set_state(stopped, RUNNING)
+
+        queue.interrupt(stopped)
+
+        assert queue.next_job() is stopped
+        assert stopped.state == PENDING
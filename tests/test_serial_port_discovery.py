@@ -0,0 +1,125 @@
+import threading
+
+import pytest
+from serial import SerialException
+
+from functionalities.serial_port_discovery import (
+    HAMEG_HO720_USB_IDS,
+    MARLIN_DESCRIPTIONS,
+    MARLIN_USB_IDS,
+    find_serial_device,
+    port_matches,
+)
+
+
+class FakeDevice:
+    def __init__(self, port: str):
+        self.port = port
+        self.is_open = True
+        self.closed = threading.Event()
+
+    def close(self):
+        self.is_open = False
+        self.closed.set()
+
+
+class TestSerialPortDiscovery:
+    def test_port_is_matched_by_usb_ids_or_description(self, create_port):
+        assert port_matches(create_port("/dev/ttyUSB0", 0x0403, 0xED72), HAMEG_HO720_USB_IDS)
+        assert port_matches(create_port("COM3", description="HAMEG HO720 USB Serial Port (VCP)"), (), ["HAMEG HO720"])
+        assert not port_matches(create_port("/dev/ttyS0"), HAMEG_HO720_USB_IDS, ["HAMEG HO720"])
+
+    def test_prusa_printer_is_matched_by_marlin_filter(self, create_port):
+        assert port_matches(create_port("/dev/ttyACM0", 0x2C99, 0x0002), MARLIN_USB_IDS, MARLIN_DESCRIPTIONS)
+        assert port_matches(
+            create_port("COM4", description="Original Prusa i3 MK3"), MARLIN_USB_IDS, MARLIN_DESCRIPTIONS
+        )
+
+    def test_fastest_answering_port_is_returned(self, create_port):
+        # probes of slow ports answer only when test releases them, '/dev/ttyS0' does not answer at all
+        release = {"/dev/ttyACM0": threading.Event(), "/dev/ttyUSB0": threading.Event()}
+        late_devices = {port: FakeDevice(port) for port in release}
+        finished_probes = []
+
+        def probe(port: str):
+            if port == "/dev/ttyS0":
+                raise SerialException("no answer")
+
+            if port in release:
+                release[port].wait(timeout=5)
+            finished_probes.append(port)
+            return late_devices.get(port, FakeDevice(port))
+
+        ports = [create_port(port) for port in ["/dev/ttyS0", "/dev/ttyACM0", "/dev/ttyACM1", "/dev/ttyUSB0"]]
+        device, port = find_serial_device(probe, available_ports=ports)
+
+        assert device.port == port.device == "/dev/ttyACM1"
+        # slower probes are not awaited
+        assert finished_probes == ["/dev/ttyACM1"]
+
+        # devices opened by probes that finish after discovery are closed
+        for event in release.values():
+            event.set()
+        for late_device in late_devices.values():
+            assert late_device.closed.wait(timeout=5)
+        assert device.is_open
+
+    def test_filtered_out_ports_are_not_opened(self, create_port):
+        probed_ports = []
+
+        def probe(port: str):
+            probed_ports.append(port)
+            return FakeDevice(port)
+
+        ports = [create_port("/dev/ttyS0"), create_port("/dev/ttyUSB0", 0x0403, 0xED72)]
+        device, _ = find_serial_device(
+            probe, lambda port: port_matches(port, HAMEG_HO720_USB_IDS), available_ports=ports
+        )
+
+        assert device.port == "/dev/ttyUSB0"
+        assert probed_ports == ["/dev/ttyUSB0"]
+
+    def test_error_is_raised_when_no_device_answers(self, create_port):
+        with pytest.raises(SerialException):
+            find_serial_device(lambda port: None, available_ports=[create_port("/dev/ttyS0")])
+
+        with pytest.raises(SerialException):
+            find_serial_device(lambda port: FakeDevice(port), lambda port: False, available_ports=[create_port("COM1")])
+
+    def test_preferred_port_is_probed_first(self, create_port):
+        probed_ports = []
+
+        def probe(port: str):
+            probed_ports.append(port)
+            return FakeDevice(port) if port != "/dev/ttyACM0" else None
+
+        ports = [create_port("/dev/ttyACM0"), create_port("/dev/ttyACM1"), create_port("/dev/ttyACM2")]
+
+        device, _ = find_serial_device(probe, available_ports=ports, preferred_ports=[ports[2]])
+        assert device.port == "/dev/ttyACM2"
+        assert probed_ports == ["/dev/ttyACM2"]
+
+        # when preferred port does not answer, all other ports are probed
+        probed_ports.clear()
+        device, _ = find_serial_device(probe, available_ports=ports, preferred_ports=[ports[0]])
+        assert probed_ports[0] == "/dev/ttyACM0"
+        assert device.port in ("/dev/ttyACM1", "/dev/ttyACM2")
+
+    def test_unmatched_ports_are_probed_when_no_matching_port_answers(self, create_port):
+        probed_ports = []
+
+        def probe(port: str):
+            probed_ports.append(port)
+            return FakeDevice(port) if port == "/dev/ttyACM3" else None
+
+        ports = [create_port("/dev/ttyACM3", 0x1234, 0x5678), create_port("/dev/ttyUSB0", 0x0403, 0xED72)]
+        hameg_filter = lambda port: port_matches(port, HAMEG_HO720_USB_IDS)  # noqa: E731
+
+        with pytest.raises(SerialException):
+            find_serial_device(probe, hameg_filter, available_ports=ports)
+
+        probed_ports.clear()
+        device, port = find_serial_device(probe, hameg_filter, available_ports=ports, probe_unmatched_ports=True)
+        assert device.port == port.device == "/dev/ttyACM3"
+        # matching ports are probed first
+        assert probed_ports == ["/dev/ttyUSB0", "/dev/ttyACM3"]